@@ -13,6 +13,8 @@ from langgraph.graph import StateGraph, END
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from common.streaming import stream_workflow, stream_chain_text, DeltaTracker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -125,19 +127,30 @@ class AnimationGenerationSystem:
                 """
             )
             
+            # Stream tokens to the client as they arrive when a consumer is attached
+            code_tracker = DeltaTracker(state, "code", "code_streaming")
+            explanation_tracker = DeltaTracker(state, "explanation", "code_streaming")
+            
+            def on_text(text: str) -> None:
+                partial_code, partial_explanation = self._split_partial_response(text)
+                code_tracker.update(partial_code)
+                explanation_tracker.update(partial_explanation)
+            
             chain = code_generation_prompt | self.llm
-            response = chain.invoke({
+            response_text = stream_chain_text(chain, {
                 "prompt": prompt,
                 "analysis": json.dumps(analysis, indent=2),
                 "duration": analysis.get("suggested_duration", "5-10 seconds"),
                 "manim_objects": ", ".join(analysis.get("manim_objects", [])),
                 "animation_techniques": ", ".join(analysis.get("animation_techniques", [])),
                 "key_concepts": ", ".join(analysis.get("key_concepts", []))
-            })
+            }, state, on_text=on_text)
             
             # Extract code and explanation
-            code = self._extract_python_code(response.content)
-            explanation = self._extract_explanation(response.content)
+            code = self._extract_python_code(response_text)
+            explanation = self._extract_explanation(response_text)
+            code_tracker.finish(code)
+            explanation_tracker.finish(explanation)
             
             return {
                 **state,
@@ -338,6 +351,23 @@ class AnimationGenerationSystem:
             return parts[-1].strip()
         return "No explanation provided."
     
+    def _split_partial_response(self, text: str) -> Tuple[str, str]:
+        """Split a partially streamed response into the code seen so far and the
+        explanation that follows the closing fence"""
+        start = text.find("```")
+        if start == -1:
+            return "", ""
+        # Skip the language tag on the opening fence line
+        newline = text.find("\n", start)
+        if newline == -1:
+            return "", ""
+        body = text[newline + 1:]
+        end = body.find("```")
+        if end == -1:
+            # Hold back backticks that may turn out to be the closing fence
+            return body.rstrip("`"), ""
+        return body[:end], body[end + 3:].lstrip()
+    
     def _find_generated_video(self, filename: str) -> Optional[str]:
         """Find the generated video file in the media directory"""
         logger.info(f"Searching for video file with base name: {filename}")
@@ -429,10 +459,18 @@ class AnimationGenerationSystem:
         
         try:
             # Stream the execution
-            for state_update in workflow.stream(initial_state, {"recursion_limit": 20}):
-                # Get the actual state dictionary
-                last_node = list(state_update.keys())[-1]
-                current_state = state_update[last_node]
+            for item in stream_workflow(workflow, initial_state, name="animation"):
+                if "event" in item:
+                    # Token-level "delta" events and the consolidated "final" event per field
+                    yield {
+                        "status": "in_progress",
+                        "progress": 25,
+                        "stage_description": self._get_stage_description(item["event"]["stage"]),
+                        **item["event"]
+                    }
+                    continue
+                
+                current_state = item["node"]
                 
                 # Determine progress based on stage
                 stage = current_state.get("stage", "starting")
@@ -497,6 +535,7 @@ class AnimationGenerationSystem:
         descriptions = {
             "starting": "Initializing animation generation...",
             "analysis_complete": "Analyzing your request and planning the animation...",
+            "code_streaming": "Writing Manim code...",
             "code_generated": "Generating optimized Manim code...",
             "code_sanitized": "Validating and securing the code...",
             "render_complete": "Animation rendered successfully!",
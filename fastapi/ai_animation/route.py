@@ -1,19 +1,38 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
 from pathlib import Path
 from typing import Optional
-import json
-import asyncio
-from .agent import AnimationGenerationSystem, AnimationAgent
+from common.stream_runs import StreamRunRegistry, run_event_response, parse_last_event_id
+from common.services import services, FAILED
 
 # Create router
 router = APIRouter(prefix="/ai-animation", tags=["AI Animation"])
 
-# Initialize the animation system
+# The animation system is built on first use (or during startup warmup)
 MEDIA_DIR = Path("media")
-animation_system = AnimationGenerationSystem(MEDIA_DIR)
-animation_agent = AnimationAgent(MEDIA_DIR)  # Legacy support
+
+
+def _create_animation_system():
+    from .agent import AnimationGenerationSystem
+    return AnimationGenerationSystem(MEDIA_DIR)
+
+
+def _create_animation_agent():
+    from .agent import AnimationAgent
+    return AnimationAgent(MEDIA_DIR)
+
+
+services.register("ai_animation", _create_animation_system)
+services.register("ai_animation_legacy", _create_animation_agent)  # Legacy support
+animation_runs = StreamRunRegistry("ai-animation")
+
+
+async def _get_animation_system():
+    """The animation system, waiting for its initialization if needed"""
+    try:
+        return await services.aget("ai_animation")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Animation service unavailable: {str(e)}")
 
 class AnimationRequest(BaseModel):
     prompt: str
@@ -25,6 +44,8 @@ class AnimationResponse(BaseModel):
 
 class StreamingAnimationRequest(BaseModel):
     prompt: str
+    # Send only the fields that changed since the previous event
+    delta_events: bool = False
 
 @router.post("/generate", response_model=AnimationResponse)
 async def generate_animation(request: AnimationRequest):
@@ -40,6 +61,7 @@ async def generate_animation(request: AnimationRequest):
     if not request.prompt or not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required and cannot be empty")
     
+    animation_system = await _get_animation_system()
     try:
         result = animation_system.create_animation(request.prompt.strip())
         
@@ -67,34 +89,39 @@ async def generate_animation_stream(request: StreamingAnimationRequest):
     if not request.prompt or not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required and cannot be empty")
     
-    async def event_stream():
-        try:
-            for update in animation_system.create_animation_stream(request.prompt.strip()):
-                # Format as Server-Sent Events
-                event_data = json.dumps(update)
-                yield f"data: {event_data}\n\n"
-                
-                # Small delay to prevent overwhelming the client
-                await asyncio.sleep(0.1)
-                
-        except Exception as e:
-            error_data = json.dumps({
-                "status": "error",
-                "error": f"Error generating animation: {str(e)}",
-                "progress": -1
-            })
-            yield f"data: {error_data}\n\n"
+    animation_system = await _get_animation_system()
     
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
+    # The pipeline runs independently of this connection; clients that drop can
+    # re-attach with Last-Event-ID without re-triggering it
+    run = animation_runs.start(
+        lambda: animation_system.create_animation_stream(request.prompt.strip()),
+        delta_events=request.delta_events,
+        error_update=lambda e: {
+            "status": "error",
+            "error": f"Error generating animation: {str(e)}",
+            "progress": -1
         }
     )
+    return run_event_response(run)
+
+@router.get("/generate-stream/{run_id}")
+async def resume_animation_stream(
+    run_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Re-attach to a running or recently finished generation stream
+    
+    Replays the events after Last-Event-ID (header, or last_event_id query parameter
+    for clients that cannot set headers) and then continues live. Never restarts
+    the pipeline.
+    """
+    run = animation_runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Stream not found or expired")
+    
+    return run_event_response(run, parse_last_event_id(last_event_id_header, last_event_id))
 
 @router.get("/media-info")
 async def get_media_info():
@@ -104,6 +131,7 @@ async def get_media_info():
     Returns:
         Dictionary with media directory contents
     """
+    animation_system = await _get_animation_system()
     try:
         return animation_system.get_media_info()
     except Exception as e:
@@ -118,8 +146,9 @@ async def health_check():
         Status information
     """
     return {
-        "status": "healthy",
+        "status": "healthy" if services.state("ai_animation") != FAILED else "unhealthy",
         "service": "AI Animation Generator (LangGraph)",
+        "state": services.state("ai_animation"),
         "media_directory": str(MEDIA_DIR.absolute()),
         "features": [
             "LangGraph workflow",
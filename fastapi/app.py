@@ -1,14 +1,21 @@
+# Imported first so the startup timings cover everything below
+from common.services import services
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import Optional
 
-# Import the AI animation router
-from ai_animation.route import router as ai_animation_router
-from system_design.route import router as system_design_router
+# Import the routers; their services are built later by the registry
+with services.timed("import ai_animation.route"):
+    from ai_animation.route import router as ai_animation_router
+with services.timed("import system_design.route"):
+    from system_design.route import router as system_design_router
+with services.timed("import leetcode_qna.route"):
+    from leetcode_qna.route import router as leetcode_qna_router
 
 # Load environment variables
 load_dotenv()
@@ -39,6 +46,13 @@ app.mount("/media", StaticFiles(directory=str(MEDIA_DIR.absolute())), name="medi
 # Include routers
 app.include_router(ai_animation_router)
 app.include_router(system_design_router)
+app.include_router(leetcode_qna_router)
+
+
+@app.on_event("startup")
+async def start_service_warmup():
+    """Build the services in the background so the first requests do not pay for it"""
+    services.start_warmup()
 
 @app.get("/")
 def read_root():
@@ -47,7 +61,8 @@ def read_root():
         "message": "AI Content Generation Platform",
         "services": [
             "AI Animation Generator",
-            "System Design Generator"
+            "System Design Generator",
+            "LeetCode Voice Interview"
         ],
         "features": [
             "LangGraph workflows",
@@ -59,15 +74,31 @@ def read_root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
+    startup = services.snapshot()
     return {
         "status": "healthy",
-         "services": {
-            "ai_animation": "active",
-            "system_design": "active"
-        },
+        "ready": startup["ready"],
+        "services": {name: service["state"] for name, service in startup["services"].items()},
         "media_directory": str(MEDIA_DIR.absolute())
     }
 
+@app.get("/startup")
+async def startup_profile():
+    """Import and service initialization timings"""
+    return services.snapshot()
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until every service has been built"""
+    startup = services.snapshot()
+    return JSONResponse(
+        status_code=200 if startup["ready"] else 503,
+        content={
+            "ready": startup["ready"],
+            "services": {name: service["state"] for name, service in startup["services"].items()}
+        }
+    )
+
 @app.get("/test-media")
 async def test_media():
     """Test endpoint to verify media serving"""
@@ -115,8 +146,7 @@ async def test_media():
 async def media_info_legacy():
     """Legacy media info endpoint for backward compatibility"""
     try:
-        from ai_animation.agent import AnimationAgent
-        animation_agent = AnimationAgent(MEDIA_DIR)
+        animation_agent = await services.aget("ai_animation_legacy")
         return animation_agent.get_media_info()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting media info: {str(e)}")
@@ -0,0 +1,147 @@
+"""Compare worker memory of `uvicorn --workers` and the pre-fork server
+
+Starts the app in each mode, waits until it reports ready and reads every
+process's memory from /proc (Linux only):
+
+    python benchmarks/prefork_memory_benchmark.py
+    python benchmarks/prefork_memory_benchmark.py --workers 4 --modes prefork
+
+RSS counts shared pages in full for every process; PSS divides them between
+the processes sharing them, so the PSS total is what the node actually pays.
+The Shared_* columns are the part of RSS also mapped by another process (for
+pre-fork workers, mostly the preloaded modules and model weights).
+
+Several workers need a shared session store, so both modes run against a
+throwaway SQLite file.
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"]
+
+
+def commands(workers: int, port: int) -> Dict[str, List[str]]:
+    return {
+        "uvicorn": [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--workers", str(workers)],
+        "prefork": [sys.executable, "prefork.py", "--port", str(port), "--workers", str(workers)],
+    }
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def descendants(root: int) -> List[int]:
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as stat:
+                    # The command name may contain spaces; fields after it are fixed
+                    parents[int(entry)] = int(stat.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                pass
+    found, frontier = [], [root]
+    while frontier:
+        parent = frontier.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent]
+        found += children
+        frontier += children
+    return sorted(found)
+
+
+def is_worker(pid: int) -> bool:
+    """Skip multiprocessing helpers such as the resource tracker"""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+            return b"resource_tracker" not in cmdline.read()
+    except OSError:
+        return False
+
+
+def wait_ready(port: int, workers: int, timeout: float) -> float:
+    """Seconds until /ready answered 200 often enough to have reached every worker"""
+    started = time.monotonic()
+    streak = 0
+    while time.monotonic() - started < timeout:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=5) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except Exception:
+            streak = 0
+        if streak >= 4 * workers:
+            return time.monotonic() - started
+        time.sleep(0.25)
+    raise TimeoutError(f"Server on port {port} not ready after {timeout:.0f}s")
+
+
+def measure(mode: str, command: List[str], port: int, workers: int, timeout: float, settle: float) -> List[dict]:
+    session_dir = tempfile.TemporaryDirectory()
+    env = {**os.environ, "LEETCODE_SESSION_DB": os.path.join(session_dir.name, "sessions.db"),
+           "LEETCODE_SESSION_READ_THROUGH": "1"}
+    process = subprocess.Popen(command, cwd=APP_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready_seconds = wait_ready(port, workers, timeout)
+        time.sleep(settle)
+        rows = [{"mode": mode, "process": "master", "pid": process.pid, **memory_kb(process.pid)}]
+        for pid in filter(is_worker, descendants(process.pid)):
+            rows.append({"mode": mode, "process": "worker", "pid": pid, **memory_kb(pid)})
+        total = {"mode": mode, "process": "total", "pid": "", "ready_s": round(ready_seconds, 1)}
+        for field in FIELDS:
+            total[field] = sum(row.get(field, 0) for row in rows)
+        return rows + [total]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        session_dir.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", default=["uvicorn", "prefork"], choices=["uvicorn", "prefork"])
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for readiness")
+    parser.add_argument("--settle", type=float, default=2, help="Seconds to wait after readiness before measuring")
+    args = parser.parse_args()
+
+    rows = []
+    for mode in args.modes:
+        rows += measure(mode, commands(args.workers, args.port)[mode], args.port, args.workers,
+                        args.timeout, args.settle)
+
+    columns = ["mode", "process", "pid", "ready_s"] + [f"{field}_mb" for field in FIELDS]
+    print(" | ".join(columns))
+    for row in rows:
+        values = [row["mode"], row["process"], row["pid"], row.get("ready_s", "")]
+        values += [round(row.get(field, 0) / 1024, 1) for field in FIELDS]
+        print(" | ".join(str(value) for value in values))
+
+    totals = {row["mode"]: row for row in rows if row["process"] == "total"}
+    if len(totals) == 2:
+        saved = totals["uvicorn"]["Pss"] - totals["prefork"]["Pss"]
+        print(f"\nPre-fork saves {saved / 1024:.1f} MB PSS ({saved / 1024 / args.workers:.1f} MB per worker)")
+
+
+if __name__ == "__main__":
+    main()
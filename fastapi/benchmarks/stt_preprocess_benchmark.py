@@ -0,0 +1,141 @@
+"""Compare speech-to-text input preparation with and without the preprocessing stage
+
+Runs over synthetic browser-style uploads (or your own recordings):
+
+    python benchmarks/stt_preprocess_benchmark.py
+    python benchmarks/stt_preprocess_benchmark.py answer1.wav answer2.webm --runs 20
+    LEETCODE_STT_BACKEND=vosk python benchmarks/stt_preprocess_benchmark.py --transcribe
+
+"baseline" is the previous path (speech_recognition's AudioFile, converted to
+16 kHz PCM16 as-is); "preprocessed" is leetcode_qna.audio_preprocess. Reports
+preparation time, audio duration and payload handed to the recognizer, and
+with --transcribe the recognition time of the configured STT backend.
+"""
+import io
+import sys
+import time
+import wave
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+STT_SAMPLE_RATE = 16000
+
+
+def _speech_like(sample_rate: int, seconds: float, rng: np.random.Generator) -> np.ndarray:
+    """Syllable-rate modulated harmonics, close enough to speech for level and silence detection"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(phase * harmonic) / harmonic for harmonic in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    return 0.15 * voice * envelope + rng.normal(0, 0.002, t.size)
+
+
+def synthetic_upload(sample_rate: int, channels: int, width: int, lead: float, speech: float,
+                     tail: float, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    signal = np.concatenate([
+        rng.normal(0, 0.002, int(sample_rate * lead)),
+        _speech_like(sample_rate, speech, rng),
+        rng.normal(0, 0.002, int(sample_rate * tail)),
+    ])
+    frames = np.repeat(signal[:, None], channels, axis=1)
+    scale = 2 ** (8 * width - 1) - 1
+    integers = np.round(np.clip(frames, -1, 1) * scale).astype("<i4")
+    if width == 2:
+        raw = integers.astype("<i2").tobytes()
+    else:
+        # Keep the low three bytes of each 32-bit sample
+        raw = integers.view(np.uint8).reshape(-1, 4)[:, :width].tobytes()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(raw)
+    return buffer.getvalue()
+
+
+SAMPLES = {
+    "48k-stereo-16bit": dict(sample_rate=48000, channels=2, width=2, lead=1.5, speech=6.0, tail=2.0),
+    "44k-mono-24bit": dict(sample_rate=44100, channels=1, width=3, lead=1.0, speech=8.0, tail=1.5),
+    "16k-mono-16bit": dict(sample_rate=16000, channels=1, width=2, lead=0.3, speech=5.0, tail=0.3),
+}
+
+
+def baseline(data: bytes) -> bytes:
+    import speech_recognition as sr
+
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(io.BytesIO(data)) as source:
+        audio = recognizer.record(source)
+    return audio.get_raw_data(convert_rate=STT_SAMPLE_RATE, convert_width=2)
+
+
+def preprocessed(data: bytes) -> bytes:
+    from leetcode_qna.audio_preprocess import preprocess_audio
+
+    return preprocess_audio(data, STT_SAMPLE_RATE).pcm
+
+
+def measure(prepare, data: bytes, runs: int, transcribe) -> dict:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        pcm = prepare(data)
+        timings.append(time.perf_counter() - started)
+    result = {
+        "prepare_ms": round(1000 * sorted(timings)[len(timings) // 2], 2),
+        "stt_seconds": round(len(pcm) / 2 / STT_SAMPLE_RATE, 2),
+        "stt_kb": round(len(pcm) / 1024, 1),
+    }
+    if transcribe:
+        started = time.perf_counter()
+        text = transcribe(pcm, STT_SAMPLE_RATE) if pcm else ""
+        result["recognize_ms"] = round(1000 * (time.perf_counter() - started), 1)
+        result["words"] = len(text.split())
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Recorded uploads to include")
+    parser.add_argument("--runs", type=int, default=10, help="Preparation runs per upload (median reported)")
+    parser.add_argument("--transcribe", action="store_true", help="Also time recognition with LEETCODE_STT_BACKEND")
+    args = parser.parse_args()
+
+    uploads = {name: synthetic_upload(**spec) for name, spec in SAMPLES.items()}
+    for path in args.files:
+        uploads[Path(path).name] = Path(path).read_bytes()
+
+    transcribe = None
+    if args.transcribe:
+        import speech_recognition as sr
+        from leetcode_qna.stt import create_stt_backend
+
+        transcribe = create_stt_backend(sr.Recognizer()).transcribe
+
+    rows = []
+    for name, data in uploads.items():
+        for method, prepare in (("baseline", baseline), ("preprocessed", preprocessed)):
+            try:
+                result = measure(prepare, data, args.runs, transcribe)
+            except Exception as e:
+                result = {"error": str(e)}
+            rows.append({"upload": name, "upload_kb": round(len(data) / 1024, 1), "method": method, **result})
+
+    columns = []
+    for row in rows:
+        columns += [column for column in row if column not in columns]
+    print(" | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(row.get(column, "")) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare ChatterboxTTS CPU inference with and without the CPU profile
+
+Each configuration runs in its own subprocess so memory numbers are not mixed:
+
+    python benchmarks/tts_cpu_benchmark.py
+    python benchmarks/tts_cpu_benchmark.py --threads 4 --runs 5
+
+Reports load time, warmup time, mean real-time factor (synthesis time divided
+by audio duration; below 1.0 is faster than real time) and resident memory.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SENTENCES = [
+    "Can you explain your understanding of this problem in your own words?",
+    "Good, a hash map gives constant time lookups, so the overall time complexity is linear.",
+    "What would happen if the input array contained duplicate values or negative numbers?",
+]
+
+CONFIGURATIONS = {
+    "baseline": {"inference_mode": False, "quantize": False, "warmup": False, "tune_threads": False},
+    "profile": {"inference_mode": True, "quantize": False, "warmup": True, "tune_threads": True},
+    "profile-int8": {"inference_mode": True, "quantize": True, "warmup": True, "tune_threads": True},
+}
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_configuration(name: str, threads: int, runs: int) -> dict:
+    import contextlib
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+    from leetcode_qna.tts_runtime import configure_torch_threads, quantize_linear_layers, warmup
+
+    config = CONFIGURATIONS[name]
+    if config["tune_threads"]:
+        configure_torch_threads({"threads": threads, "interop_threads": 1})
+
+    started = time.monotonic()
+    model = ChatterboxTTS.from_pretrained(device="cpu")
+    load_seconds = time.monotonic() - started
+    rss_loaded = _rss_mb()
+
+    if config["quantize"]:
+        quantize_linear_layers(model)
+    warmup_seconds = warmup(model) if config["warmup"] else 0.0
+
+    factors = []
+    first_seconds = None
+    for _ in range(runs):
+        for sentence in SENTENCES:
+            context = torch.inference_mode() if config["inference_mode"] else contextlib.nullcontext()
+            started = time.monotonic()
+            with context:
+                wav = model.generate(sentence, exaggeration=0.4, cfg_weight=0.5)
+            elapsed = time.monotonic() - started
+            if first_seconds is None:
+                first_seconds = elapsed
+            factors.append(elapsed / (wav.shape[-1] / model.sr))
+
+    return {
+        "configuration": name,
+        "threads": torch.get_num_threads(),
+        "load_seconds": round(load_seconds, 2),
+        "warmup_seconds": round(warmup_seconds, 2),
+        "first_request_seconds": round(first_seconds, 2),
+        "mean_rtf": round(sum(factors) / len(factors), 3),
+        "rss_after_load_mb": round(rss_loaded, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configurations", nargs="+", default=list(CONFIGURATIONS), choices=list(CONFIGURATIONS))
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the test sentences")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_configuration(args.single, args.threads, args.runs)))
+        return
+
+    results = []
+    for name in args.configurations:
+        output = subprocess.run(
+            [sys.executable, __file__, "--single", name, "--threads", str(args.threads), "--runs", str(args.runs)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = list(results[0])
+    print(" | ".join(columns))
+    for result in results:
+        print(" | ".join(str(result[column]) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
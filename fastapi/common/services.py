@@ -0,0 +1,146 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Callable, Iterator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# "background" builds every service in worker threads right after startup;
+# "lazy" builds each one on its first request
+SERVICE_WARMUP = os.getenv("SERVICE_WARMUP", "background").lower()
+
+# Service states
+REGISTERED = "registered"
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+
+# Reference point for startup timings; app.py imports this module first
+_STARTED = time.perf_counter()
+
+
+class _Service:
+    __slots__ = ("name", "factory", "state", "instance", "error", "future", "build_seconds", "ready_after")
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self.state = REGISTERED
+        self.instance: Any = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        self.build_seconds: Optional[float] = None
+        self.ready_after: Optional[float] = None
+
+
+class ServiceRegistry:
+    """Builds application services on demand or in a background warmup
+
+    Route modules register a factory instead of constructing their service at
+    import time. ``aget`` returns the instance, waiting for (or starting) its
+    build on a worker thread, so the event loop is never blocked by model
+    loading. A failed build stays failed and its error is reported by
+    ``snapshot``. Import and build timings are kept for the startup endpoint.
+    """
+
+    def __init__(self):
+        self._services: Dict[str, _Service] = {}
+        self._lock = threading.Lock()
+        self.timings: List[Dict[str, Any]] = []
+        self.startup_seconds: Optional[float] = None
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register ``factory`` (blocking, no arguments) as the builder of ``name``"""
+        with self._lock:
+            self._services[name] = _Service(name, factory)
+
+    @contextmanager
+    def timed(self, label: str) -> Iterator[None]:
+        """Record how long the enclosed block (usually an import) takes"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append({"step": label, "ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    def _build(self, service: _Service) -> None:
+        started = time.perf_counter()
+        try:
+            instance = service.factory()
+        except BaseException as e:
+            service.state = FAILED
+            service.error = str(e)
+            service.build_seconds = time.perf_counter() - started
+            logger.error(f"Failed to initialize service {service.name}: {str(e)}")
+            service.future.set_exception(e)
+            return
+        service.instance = instance
+        service.state = READY
+        service.build_seconds = time.perf_counter() - started
+        service.ready_after = time.perf_counter() - _STARTED
+        logger.info(f"Service {service.name} ready in {service.build_seconds:.2f}s")
+        service.future.set_result(instance)
+
+    def _start(self, name: str) -> Future:
+        with self._lock:
+            service = self._services[name]
+            if service.future is None:
+                service.future = Future()
+                service.state = STARTING
+                threading.Thread(target=self._build, args=(service,), name=f"init-{name}", daemon=True).start()
+            return service.future
+
+    def get(self, name: str) -> Any:
+        """The service instance, waiting for its build (blocking)"""
+        return self._start(name).result()
+
+    async def aget(self, name: str) -> Any:
+        """The service instance; raises the build error if it failed"""
+        return await asyncio.wrap_future(self._start(name))
+
+    def peek(self, name: str) -> Any:
+        """The instance if it is ready, without starting a build"""
+        service = self._services.get(name)
+        return service.instance if service and service.state == READY else None
+
+    def state(self, name: str) -> str:
+        return self._services[name].state
+
+    def start_warmup(self) -> None:
+        """Start building every registered service in the background"""
+        if self.startup_seconds is None:
+            self.startup_seconds = time.perf_counter() - _STARTED
+        if SERVICE_WARMUP == "lazy":
+            return
+        for name in list(self._services):
+            self._start(name)
+
+    def is_ready(self) -> bool:
+        return all(service.state == READY for service in self._services.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-service readiness and the import/startup timing breakdown"""
+        return {
+            "warmup": SERVICE_WARMUP,
+            "ready": self.is_ready(),
+            "startup_ms": round(self.startup_seconds * 1000, 1) if self.startup_seconds is not None else None,
+            "imports": self.timings,
+            "services": {
+                name: {
+                    "state": service.state,
+                    "build_ms": round(service.build_seconds * 1000, 1) if service.build_seconds is not None else None,
+                    "ready_after_ms": round(service.ready_after * 1000, 1) if service.ready_after is not None else None,
+                    "error": service.error
+                }
+                for name, service in self._services.items()
+            }
+        }
+
+
+# Shared by all route modules
+services = ServiceRegistry()
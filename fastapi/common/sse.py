@@ -0,0 +1,93 @@
+import json
+import logging
+from typing import Dict, Any, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Streaming events that describe a change rather than a piece of state. They are
+# forwarded as-is (with a sequence number) instead of being diffed.
+TRANSIENT_EVENT_TYPES = {"delta", "final", "section", "view"}
+
+
+def dumps(payload: Any) -> str:
+    """Serialize an event body to compact JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def format_sse(payload: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format an event body as a Server-Sent Events frame"""
+    if event_id is None:
+        return f"data: {dumps(payload)}\n\n"
+    return f"id: {event_id}\ndata: {dumps(payload)}\n\n"
+
+
+class DeltaEncoder:
+    """Encodes a sequence of full-state progress updates as field-level patches
+
+    Each streaming update from the agents repeats the whole accumulated state
+    (analysis, generated code, explanation, ...). The encoder remembers what the
+    client has already received and only emits the fields that changed, tagged
+    with a monotonically increasing ``seq``:
+
+        {"seq": 3, "type": "patch", "changed": {...}, "removed": [...]}
+
+    Transient events (token deltas, explanation sections) pass through with a
+    sequence number. A ``final`` event carries the consolidated value of a field,
+    so that field is recorded as already sent and is not repeated by the next
+    patch. ``snapshot()`` returns the full accumulated state for clients that
+    (re)attach mid-stream, including the text streamed so far for fields that
+    are still being generated.
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.state: Dict[str, Any] = {}
+        self.partial: Dict[str, List[str]] = {}
+
+    def encode(self, update: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode one update from the agent stream"""
+        self.seq += 1
+        event_type = update.get("type")
+
+        if event_type in TRANSIENT_EVENT_TYPES:
+            if event_type == "delta":
+                self.partial.setdefault(update["field"], []).append(update["delta"])
+            elif event_type == "final":
+                self.partial.pop(update["field"], None)
+                self.state[update["field"]] = update["content"]
+            return {"seq": self.seq, **update}
+
+        changed: Dict[str, Any] = {}
+        removed: List[str] = []
+        for key, value in update.items():
+            if value is None:
+                if self.state.get(key) is not None:
+                    removed.append(key)
+                    self.state.pop(key, None)
+                continue
+            previous = self.state.get(key)
+            if previous is value or previous == value:
+                continue
+            changed[key] = value
+            self.state[key] = value
+
+        event: Dict[str, Any] = {"seq": self.seq, "type": "patch", "changed": changed}
+        if removed:
+            event["removed"] = removed
+        return event
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full accumulated state as of the last encoded event"""
+        snapshot = {"seq": self.seq, "type": "snapshot", "state": dict(self.state)}
+        if self.partial:
+            snapshot["partial"] = {field: "".join(chunks) for field, chunks in self.partial.items()}
+        return snapshot
+
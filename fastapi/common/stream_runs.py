@@ -0,0 +1,178 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Iterator, AsyncGenerator, Callable, Deque, Tuple
+
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from .sse import DeltaEncoder, format_sse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of frames kept per run for Last-Event-ID replay. Clients that fall
+# further behind receive a snapshot of the accumulated state instead.
+RUN_BUFFER_EVENTS = int(os.getenv("STREAM_RUN_BUFFER_EVENTS", "2048"))
+# How long a finished run stays attachable, and how long a running one may go
+# without publishing anything before it is abandoned (seconds)
+RUN_RETENTION_SECONDS = float(os.getenv("STREAM_RUN_RETENTION_SECONDS", "600"))
+
+
+class StreamRun:
+    """A single pipeline execution whose events outlive any one HTTP connection
+
+    The pipeline publishes into a bounded buffer of pre-formatted SSE frames with
+    increasing ``id:`` fields. Any number of clients can attach, detach and
+    re-attach with ``Last-Event-ID``; none of that affects the pipeline itself.
+    """
+
+    def __init__(self, run_id: str, delta_events: bool = False, max_events: int = RUN_BUFFER_EVENTS):
+        self.run_id = run_id
+        self.delta_events = delta_events
+        self.frames: Deque[Tuple[int, str]] = deque(maxlen=max_events)
+        self.last_event_id = 0
+        # Always track the accumulated state so late clients can get a snapshot
+        self.encoder = DeltaEncoder()
+        self.condition = asyncio.Condition()
+        self.finished = False
+        self.finished_at: Optional[float] = None
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+        self.task: Optional[asyncio.Task] = None
+
+    async def publish(self, update: Dict[str, Any]) -> None:
+        """Append an update from the pipeline and wake up attached clients"""
+        encoded = self.encoder.encode(update)
+        self.last_activity = time.time()
+        async with self.condition:
+            self.last_event_id += 1
+            payload = encoded if self.delta_events else update
+            self.frames.append((self.last_event_id, format_sse(payload, self.last_event_id)))
+            self.condition.notify_all()
+
+    async def finish(self) -> None:
+        """Mark the run as complete; attached clients drain and disconnect"""
+        async with self.condition:
+            self.finished = True
+            self.finished_at = time.time()
+            self.condition.notify_all()
+
+    def _snapshot_frame(self) -> str:
+        return format_sse(self.encoder.snapshot(), self.last_event_id)
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncGenerator[str, None]:
+        """Yield frames after ``last_event_id``, then follow the run live"""
+        cursor = last_event_id or 0
+        while True:
+            async with self.condition:
+                oldest = self.frames[0][0] if self.frames else self.last_event_id + 1
+                if cursor > self.last_event_id or cursor < oldest - 1:
+                    # Unknown id, or the missed frames were already evicted
+                    frames = [self._snapshot_frame()]
+                    cursor = self.last_event_id
+                else:
+                    frames = [frame for event_id, frame in self.frames if event_id > cursor]
+                    if frames:
+                        cursor = self.last_event_id
+                    elif self.finished:
+                        return
+                    else:
+                        await self.condition.wait()
+                        continue
+            for frame in frames:
+                yield frame
+
+
+class StreamRunRegistry:
+    """Keeps the recent runs of one service so clients can re-attach to them"""
+
+    def __init__(self, name: str, retention_seconds: float = RUN_RETENTION_SECONDS):
+        self.name = name
+        self.retention_seconds = retention_seconds
+        self.runs: Dict[str, StreamRun] = {}
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            run_id for run_id, run in self.runs.items()
+            if run.finished and now - run.finished_at > self.retention_seconds
+        ]
+        # A pipeline that hangs would otherwise keep its run and buffer forever
+        stalled = [
+            run_id for run_id, run in self.runs.items()
+            if not run.finished and now - run.last_activity > self.retention_seconds
+        ]
+        for run_id in stalled:
+            logger.warning(f"{self.name} run {run_id} made no progress for {self.retention_seconds:.0f}s; abandoning it")
+            task = self.runs[run_id].task
+            if task and not task.done():
+                task.cancel()
+        for run_id in expired + stalled:
+            del self.runs[run_id]
+
+    def start(self, updates: Callable[[], Iterator[Dict[str, Any]]], delta_events: bool = False,
+              error_update: Optional[Callable[[Exception], Dict[str, Any]]] = None) -> StreamRun:
+        """Start a pipeline in the background and register its run
+
+        ``updates`` is called once to create the (blocking) update iterator; it is
+        consumed on a worker thread so the event loop stays free.
+        """
+        self._purge_expired()
+        run = StreamRun(uuid.uuid4().hex, delta_events=delta_events)
+        self.runs[run.run_id] = run
+
+        async def pump():
+            try:
+                async for update in iterate_in_threadpool(updates()):
+                    await run.publish(update)
+            except asyncio.CancelledError:
+                # Abandoned as stalled; tell attached clients why the stream ends
+                if error_update:
+                    await run.publish(error_update(TimeoutError("The run stopped making progress")))
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} run {run.run_id} failed: {str(e)}")
+                if error_update:
+                    await run.publish(error_update(e))
+            finally:
+                await run.finish()
+
+        run.task = asyncio.create_task(pump())
+        logger.info(f"Started {self.name} run {run.run_id}")
+        return run
+
+    def get(self, run_id: str) -> Optional[StreamRun]:
+        """Look up a run that is still attachable"""
+        self._purge_expired()
+        return self.runs.get(run_id)
+
+
+def parse_last_event_id(header_value: Optional[str], query_value: Optional[int] = None) -> Optional[int]:
+    """Read the resume position from the Last-Event-ID header or a query parameter"""
+    if header_value:
+        try:
+            return int(header_value.strip())
+        except ValueError:
+            return None
+    return query_value
+
+
+def run_event_response(run: StreamRun, last_event_id: Optional[int] = None) -> StreamingResponse:
+    """Stream a run's frames as text/event-stream"""
+    return StreamingResponse(
+        run.subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+            "X-Stream-Run-ID": run.run_id,
+            "Access-Control-Expose-Headers": "X-Stream-Run-ID",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "*",
+        }
+    )
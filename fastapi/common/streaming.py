@@ -0,0 +1,142 @@
+import os
+import queue
+import logging
+import threading
+from typing import Dict, Any, Generator, Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Maximum number of intermediate events (token deltas, sections) buffered between
+# the workflow thread and the HTTP response. When a client reads slowly the
+# workflow blocks on this queue instead of accumulating text in memory.
+MAX_PENDING_EVENTS = int(os.getenv("STREAM_MAX_PENDING_EVENTS", "256"))
+
+
+class StreamCancelled(BaseException):
+    """Raised inside a workflow node when the stream consumer has gone away
+    
+    Derives from BaseException so the nodes' generic error handling does not
+    turn an abandoned stream into an "error" stage.
+    """
+
+
+def stream_workflow(workflow, initial_state: Dict[str, Any], name: str = "workflow",
+                    max_pending: int = MAX_PENDING_EVENTS) -> Generator[Dict[str, Any], None, None]:
+    """Run a compiled LangGraph workflow on a background thread, interleaving node
+    updates with intermediate events emitted by the nodes.
+
+    Nodes receive an ``event_sink`` callable in their state. Yields
+    ``{"node": state}`` for finished nodes and ``{"event": payload}`` for
+    intermediate events, in the order they were produced. The hand-off queue is
+    bounded, so a slow consumer applies back-pressure to the nodes; closing the
+    generator makes any further ``event_sink`` call raise ``StreamCancelled``.
+    """
+    events: "queue.Queue" = queue.Queue(maxsize=max_pending)
+    cancelled = threading.Event()
+    done = object()
+
+    def put(item) -> None:
+        while not cancelled.is_set():
+            try:
+                events.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise StreamCancelled()
+
+    def sink(event: Dict[str, Any]) -> None:
+        put({"event": event})
+
+    def run():
+        try:
+            state = {**initial_state, "event_sink": sink}
+            for state_update in workflow.stream(state, {"recursion_limit": 20}):
+                # Get the actual state dictionary
+                last_node = list(state_update.keys())[-1]
+                put({"node": state_update[last_node]})
+        except StreamCancelled:
+            logger.info(f"{name} stream cancelled by consumer")
+            return
+        except Exception as e:
+            try:
+                put({"exception": e})
+            except StreamCancelled:
+                return
+        try:
+            put(done)
+        except StreamCancelled:
+            pass
+
+    threading.Thread(target=run, name=f"{name}-stream", daemon=True).start()
+
+    try:
+        while True:
+            item = events.get()
+            if item is done:
+                return
+            if "exception" in item:
+                raise item["exception"]
+            yield item
+    finally:
+        cancelled.set()
+
+
+def emit(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Send an intermediate event to the stream consumer, if one is attached"""
+    sink = state.get("event_sink")
+    if sink:
+        sink(event)
+
+
+def stream_chain_text(chain, inputs: Dict[str, Any], state: Dict[str, Any],
+                      on_text: Optional[Callable[[str], None]] = None) -> str:
+    """Invoke a LangChain runnable, streaming tokens when a consumer is attached
+
+    Without an event sink this is a plain ``invoke``. Otherwise the response is
+    consumed token by token and ``on_text`` is called with the accumulated text
+    after every chunk, so the caller can emit whatever deltas it needs.
+    """
+    if not state.get("event_sink"):
+        return chain.invoke(inputs).content
+
+    text = ""
+    for chunk in chain.stream(inputs):
+        if not chunk.content:
+            continue
+        text += chunk.content
+        if on_text:
+            on_text(text)
+    return text
+
+
+class DeltaTracker:
+    """Turns successive snapshots of a growing text field into delta events"""
+
+    def __init__(self, state: Dict[str, Any], field: str, stage: str):
+        self.state = state
+        self.field = field
+        self.stage = stage
+        self.sent = ""
+
+    def update(self, text: str) -> None:
+        """Emit whatever was appended since the last update"""
+        if len(text) <= len(self.sent) or not text.startswith(self.sent):
+            return
+        delta = text[len(self.sent):]
+        self.sent = text
+        emit(self.state, {
+            "type": "delta",
+            "stage": self.stage,
+            "field": self.field,
+            "delta": delta
+        })
+
+    def finish(self, content: str) -> None:
+        """Emit the consolidated value of the field once generation is done"""
+        emit(self.state, {
+            "type": "final",
+            "stage": self.stage,
+            "field": self.field,
+            "content": content
+        })
@@ -1,12 +1,14 @@
 import os
+import time
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, AsyncGenerator, Callable, Awaitable
 from datetime import datetime
+from contextlib import AsyncExitStack
 import json
 import random
+import uuid
 
-import torchaudio as ta
 from chatterbox.tts import ChatterboxTTS
 import speech_recognition as sr
 import tempfile
@@ -16,13 +18,81 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 
+from .sessions import create_session_manager
+from .tts_worker import create_tts_worker
+from .tts_cache import create_tts_cache, link_or_copy
+from .audio_preprocess import preprocess_audio
+from .tts_stream import split_sentences, streaming_wav_header, to_pcm16, write_pcm16_wav
+from .audio_delivery import AUDIO_FORMATS, audio_url, create_audio_encoder
+from .artifacts import ArtifactRegistry
+from .stt import create_stt_backend
+from .question_bank import create_question_bank
+from .pregenerate import load_question_bundle
+from .reports import ReportJobManager, JSONSectionScanner
+from .tts_runtime import (
+    create_cpu_profile, configure_torch_threads, apply_worker_threads, optimize_for_cpu,
+    quantize_linear_layers, freeze_for_sharing, warmup
+)
+from .tts_worker import PRIORITY_LIVE
+from .prefetch import QuestionPrefetcher
+from .latency import create_latency_tracer, trace_stage
+from .speculation import create_feedback_speculator
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Synthesis settings for the interviewer voice
+TTS_EXAGGERATION = 0.4  # Slightly less dramatic for professional context
+TTS_CFG_WEIGHT = 0.5    # Balanced pacing
+
+# Audio is converted to this rate before speech-to-text
+STT_SAMPLE_RATE = 16000
+
+# Size of the chunks a cached utterance is streamed in
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Rough size of the feedback prompt without the answer, for token accounting
+FEEDBACK_PROMPT_TOKENS = 250
+
+FINAL_MESSAGE = "Thank you for completing the interview! You did well discussing the problem and your approach. I'll now generate a detailed report of your performance."
+
+# Model loaded by a pre-fork master (see prefork.py) and shared with its workers
+_preloaded_tts_model = None
+
+
+def preload_tts_model():
+    """Load the CPU TTS model once, before worker processes are forked
+    
+    Agents created afterwards use this model instead of loading their own, so
+    forked workers share its weights copy-on-write. Quantization happens here,
+    warmup in each worker. Returns None on CUDA machines, where the model is
+    left to the workers: a CUDA context does not survive fork.
+    """
+    global _preloaded_tts_model
+    if _preloaded_tts_model is None:
+        import torch
+        if torch.cuda.is_available():
+            logger.info("CUDA available; each worker loads its own TTS model")
+            return None
+        cpu_profile = create_cpu_profile()
+        configure_torch_threads(cpu_profile)
+        logger.info("Preloading ChatterboxTTS on cpu")
+        model = ChatterboxTTS.from_pretrained(device="cpu")
+        if cpu_profile["quantize"]:
+            quantize_linear_layers(model)
+        freeze_for_sharing(model)
+        _preloaded_tts_model = model
+    return _preloaded_tts_model
+
+
 class LeetCodeVoiceAgent:
-    def __init__(self):
-        """Initialize the LeetCode Voice Interview Agent"""
+    def __init__(self, load_tts: bool = True):
+        """Initialize the LeetCode Voice Interview Agent
+        
+        With ``load_tts=False`` no TTS model is loaded and nothing can be
+        synthesized; used by tools that only need question generation.
+        """
         
         # Set up API keys
         self.google_api_key = os.getenv("GOOGLE_GENERATIVE_AI_API_KEY")
@@ -36,27 +106,87 @@ class LeetCodeVoiceAgent:
             temperature=0.7
         )
         
-        # Initialize TTS model
-        try:
-            device = "cuda" if self._is_cuda_available() else "cpu"
-            logger.info(f"Initializing ChatterboxTTS on {device}")
-            self.tts_model = ChatterboxTTS.from_pretrained(device=device)
-            logger.info("ChatterboxTTS initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize ChatterboxTTS: {str(e)}")
-            raise
+        # Initialize TTS model; tools that only generate text skip it
+        self.tts_model = None
+        self.tts_worker = None
+        if load_tts:
+            try:
+                device = "cuda" if self._is_cuda_available() else "cpu"
+                thread_init = None
+                if device == "cpu":
+                    cpu_profile = create_cpu_profile()
+                    configure_torch_threads(cpu_profile)
+                    thread_init = lambda: apply_worker_threads(cpu_profile)
+                if device == "cpu" and _preloaded_tts_model is not None:
+                    logger.info("Using the preloaded ChatterboxTTS model")
+                    self.tts_model = _preloaded_tts_model
+                    if cpu_profile["warmup"]:
+                        warmup(self.tts_model, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+                else:
+                    logger.info(f"Initializing ChatterboxTTS on {device}")
+                    self.tts_model = ChatterboxTTS.from_pretrained(device=device)
+                    if device == "cpu":
+                        optimize_for_cpu(self.tts_model, cpu_profile, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+                logger.info("ChatterboxTTS initialized successfully")
+                # Inference runs on a dedicated worker thread that owns the model
+                self.tts_worker = create_tts_worker(self.tts_model, thread_init=thread_init)
+            except Exception as e:
+                logger.error(f"Failed to initialize ChatterboxTTS: {str(e)}")
+                raise
         
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # Opened on first use: servers usually have no audio input device
+        self.microphone: Optional[sr.Microphone] = None
+        self.stt = create_stt_backend(self.recognizer)
+        logger.info(f"Using {self.stt.name} speech-to-text backend")
         
         # Audio settings
         self.audio_dir = Path("media/leetcode_audio")
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         
-        # Interview state
-        self.current_interview = None
-        self.conversation_history = []
+        # Synthesized audio for repeated prompts is reused from disk
+        self.tts_cache = create_tts_cache(self.audio_dir)
+        
+        # Generated WAVs are re-encoded to compressed formats for delivery
+        self.audio_encoder = create_audio_encoder()
+        
+        # Generated question sets are shared across interviews on the same problem
+        self.question_bank = create_question_bank(self.request_question_set)
+        
+        # Pre-generated questions and audio (see leetcode_qna/pregenerate.py)
+        bundle_dir = os.getenv("LEETCODE_QUESTION_BUNDLE")
+        if bundle_dir:
+            try:
+                load_question_bundle(Path(bundle_dir), self.question_bank, self.tts_cache, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+            except Exception as e:
+                logger.error(f"Failed to load question bundle {bundle_dir}: {str(e)}")
+        
+        # Performance reports are generated in the background after an interview ends
+        self.report_jobs = ReportJobManager()
+        
+        # Per-turn stage timings and rolling latency percentiles
+        self.latency = create_latency_tracer()
+        
+        # Interview sessions, looked up by interview ID
+        self.sessions = create_session_manager()
+        
+        # Audio files produced for each interview, for cleanup without directory scans
+        self.artifacts = ArtifactRegistry(
+            self.audio_dir, [audio_format["extension"] for audio_format in AUDIO_FORMATS.values()]
+        )
+        self.sessions.add_expiry_listener(self.artifacts.expire)
+        
+        # Question audio is synthesized in the background once an interview starts
+        self.question_prefetcher = QuestionPrefetcher(self._synthesize_question)
+        self.sessions.add_expiry_listener(self.question_prefetcher.cancel)
+        
+        # Feedback can start from partial transcripts before the answer is submitted
+        self.feedback_speculator = create_feedback_speculator(
+            self._speculative_feedback,
+            lambda text: FEEDBACK_PROMPT_TOKENS + len(text) // 4
+        )
+        self.sessions.add_expiry_listener(self.feedback_speculator.cancel)
         
         # Question categories for different problem types
         self.question_templates = {
@@ -99,6 +229,21 @@ class LeetCodeVoiceAgent:
     async def generate_interview_questions(self, problem_data: Dict[str, Any], language: str = "Python") -> List[str]:
         """Generate interview questions based on the LeetCode problem"""
         
+        questions = await self.question_bank.get_questions(problem_data, language)
+        if questions:
+            return questions
+        
+        # Fallback to template-based questions
+        logger.warning("No AI-generated questions available, using template fallback")
+        return self._generate_template_questions(
+            problem_data.get("title", ""),
+            problem_data.get("difficulty", "Medium"),
+            language
+        )
+    
+    async def request_question_set(self, problem_data: Dict[str, Any], language: str) -> Optional[List[str]]:
+        """Ask the LLM for one set of interview questions; returns None on failure"""
+        
         try:
             problem_title = problem_data.get("title", "")
             problem_content = problem_data.get("content", "")
@@ -146,13 +291,12 @@ class LeetCodeVoiceAgent:
                 else:
                     raise ValueError("Invalid questions format")
             except (json.JSONDecodeError, ValueError):
-                # Fallback to template-based questions
-                logger.warning("Failed to parse AI-generated questions, using template fallback")
-                return self._generate_template_questions(problem_title, difficulty, language)
+                logger.warning("Failed to parse AI-generated questions")
+                return None
                 
         except Exception as e:
             logger.error(f"Error generating questions: {str(e)}")
-            return self._generate_template_questions(problem_title, difficulty, language)
+            return None
     
     def _generate_template_questions(self, problem_title: str, difficulty: str, language: str) -> List[str]:
         """Generate fallback questions using templates"""
@@ -176,7 +320,8 @@ class LeetCodeVoiceAgent:
         
         return customized_questions
     
-    async def text_to_speech(self, text: str, output_filename: str = None) -> str:
+    async def text_to_speech(self, text: str, output_filename: str = None, priority: int = PRIORITY_LIVE,
+                             encode: bool = True, interview_id: Optional[str] = None) -> str:
         """Convert text to speech using ChatterboxTTS"""
         
         try:
@@ -184,44 +329,234 @@ class LeetCodeVoiceAgent:
                 output_filename = f"tts_{datetime.now().timestamp()}.wav"
             
             output_path = self.audio_dir / output_filename
+            if interview_id:
+                self.artifacts.register(interview_id, output_filename)
             
-            # Generate speech with optimal settings for interview context
-            wav = self.tts_model.generate(
-                text, 
-                exaggeration=0.4,  # Slightly less dramatic for professional context
-                cfg_weight=0.5     # Balanced pacing
-            )
+            async def synthesize(path: Path) -> None:
+                # Generate and save speech on the TTS worker, with optimal settings for interview context
+                await self.tts_worker.synthesize(
+                    text,
+                    str(path),
+                    exaggeration=TTS_EXAGGERATION,
+                    cfg_weight=TTS_CFG_WEIGHT,
+                    priority=priority
+                )
             
-            # Save the audio file
-            ta.save(str(output_path), wav, self.tts_model.sr)
+            cache_key = self.tts_cache.key(text, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+            with trace_stage("text_to_speech", file=output_filename, chars=len(text)) as stage:
+                cache_hit = await self.tts_cache.fetch(cache_key, output_path, synthesize)
+                stage["cache_hit"] = cache_hit
             
-            logger.info(f"Generated TTS audio: {output_path}")
+            logger.info(f"{'Reused cached' if cache_hit else 'Generated'} TTS audio: {output_path}")
+            if encode:
+                self._encode_audio(cache_key, output_path, cache_hit)
             return str(output_path)
             
         except Exception as e:
             logger.error(f"Error in text-to-speech: {str(e)}")
             raise
     
+    def stream_text_to_speech(self, text: str, output_filename: str = None,
+                              interview_id: Optional[str] = None) -> Tuple[str, AsyncGenerator[bytes, None]]:
+        """Synthesize text sentence by sentence, yielding WAV bytes as each sentence is ready
+        
+        Returns the path the complete audio is written to once the stream
+        finishes, and the byte stream itself (a streaming WAV header followed by
+        PCM16 chunks).
+        """
+        if not output_filename:
+            output_filename = f"tts_{datetime.now().timestamp()}.wav"
+        output_path = self.audio_dir / output_filename
+        if interview_id:
+            self.artifacts.register(interview_id, output_filename)
+        cache_key = self.tts_cache.key(text, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+        
+        async def chunks() -> AsyncGenerator[bytes, None]:
+            cached = self.tts_cache.lookup(cache_key)
+            if cached is not None:
+                self.tts_cache.record_hit()
+                # Linking falls back to a full copy across filesystems; keep it off the loop
+                await asyncio.to_thread(link_or_copy, cached, output_path)
+                audio_file = await asyncio.to_thread(open, output_path, "rb")
+                try:
+                    while True:
+                        chunk = await asyncio.to_thread(audio_file.read, STREAM_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        yield chunk
+                finally:
+                    audio_file.close()
+                self._encode_audio(cache_key, output_path, cache_hit=True)
+                return
+            self.tts_cache.record_miss()
+            
+            started = time.monotonic()
+            sample_rate = self.tts_model.sr
+            sentences = split_sentences(text)
+            pcm_chunks: List[bytes] = []
+            tasks: List[asyncio.Task] = []
+            
+            def submit(sentence: str) -> asyncio.Task:
+                return asyncio.create_task(self.tts_worker.generate(
+                    sentence,
+                    exaggeration=TTS_EXAGGERATION,
+                    cfg_weight=TTS_CFG_WEIGHT
+                ))
+            
+            try:
+                yield streaming_wav_header(sample_rate)
+                tasks.append(submit(sentences[0]))
+                for index in range(len(sentences)):
+                    wav = await tasks[index]
+                    if index == 0:
+                        logger.info(f"First TTS chunk ready in {time.monotonic() - started:.2f}s")
+                        # The worker runs one job at a time, so queueing the rest
+                        # only now keeps the first sentence out of a larger batch
+                        tasks.extend(submit(sentence) for sentence in sentences[1:])
+                    pcm = to_pcm16(wav)
+                    pcm_chunks.append(pcm)
+                    yield pcm
+                
+                # Keep the complete utterance for replay and later cache hits;
+                # unlinked first in case it is a hard link to a cache entry
+                output_path.unlink(missing_ok=True)
+                await asyncio.to_thread(write_pcm16_wav, output_path, pcm_chunks, sample_rate)
+                self.tts_cache.store(cache_key, output_path)
+                self._encode_audio(cache_key, output_path, cache_hit=False)
+                logger.info(f"Streamed {len(sentences)} TTS chunks in {time.monotonic() - started:.2f}s: {output_path}")
+            finally:
+                # Client went away or synthesis failed: drop the queued sentences
+                for task in tasks:
+                    task.cancel()
+        
+        return str(output_path), chunks()
+    
+    def _encode_audio(self, cache_key: str, output_path: Path, cache_hit: bool) -> None:
+        """Provide the compressed formats of a synthesized file
+        
+        Encodings are cached with the audio, so a cache hit links them instead of
+        running ffmpeg again; only audio without cached encodings is encoded.
+        """
+        if not self.audio_encoder.enabled:
+            return
+        extensions = [AUDIO_FORMATS[fmt]["extension"] for fmt in self.audio_encoder.formats]
+        if cache_hit and self.tts_cache.link_variants(cache_key, output_path, extensions):
+            if not self.audio_encoder.keep_wav:
+                output_path.unlink(missing_ok=True)
+            return
+        self.audio_encoder.schedule(
+            str(output_path),
+            on_encoded=lambda encoded_path: self.tts_cache.store_variant(cache_key, encoded_path)
+        )
+    
+    async def _synthesize_question(self, question: str, output_filename: str, priority: int) -> str:
+        return await self.text_to_speech(question, output_filename, priority=priority)
+    
+    def _start_question_prefetch(self, interview: Dict[str, Any]) -> None:
+        """Queue background synthesis of the questions not asked yet"""
+        interview_id = interview["id"]
+        questions = interview["questions"]
+        filenames = [f"question_{interview_id}_{index}.wav" for index in range(len(questions))]
+        for filename in filenames:
+            self.artifacts.register(interview_id, filename)
+        self.question_prefetcher.start(
+            interview_id,
+            questions,
+            filenames,
+            first_index=interview["current_question_index"]
+        )
+    
+    def _question_audio_readiness(self, interview_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Prefetch state per question, with audio URLs instead of file paths"""
+        readiness = self.question_prefetcher.readiness(interview_id)
+        if readiness is None:
+            return None
+        return [{**item, "audio_path": audio_url(item["audio_path"])} for item in readiness]
+    
+    async def _question_audio(self, interview: Dict[str, Any], index: int) -> str:
+        """Audio for one question, normally already prefetched"""
+        if not self.question_prefetcher.has(interview["id"]):
+            # Session was loaded back from storage, e.g. after a restart
+            self._start_question_prefetch(interview)
+        return await self.question_prefetcher.audio_for(interview["id"], index)
+    
+    async def prewarm_tts_cache(self) -> None:
+        """Synthesize the fixed interview phrases into the TTS cache"""
+        phrases = [FINAL_MESSAGE]
+        # Template questions that are not customized per problem
+        for templates in self.question_templates.values():
+            phrases.extend(q for q in templates if "this problem" not in q and "your approach" not in q)
+        
+        warmed = 0
+        for phrase in phrases:
+            cache_key = self.tts_cache.key(phrase, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+            if self.tts_cache.lookup(cache_key):
+                continue
+            try:
+                warm_path = self.audio_dir / f"prewarm_{cache_key[:16]}.wav"
+                await self.text_to_speech(phrase, warm_path.name, encode=False)
+                warm_path.unlink(missing_ok=True)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm TTS cache: {str(e)}")
+        
+        logger.info(f"TTS cache pre-warmed with {warmed} new phrases ({len(phrases)} fixed phrases)")
+    
     async def speech_to_text(self, audio_file_path: str) -> str:
-        """Convert speech to text using speech_recognition"""
+        """Convert speech to text with the configured STT backend"""
+        
+        try:
+            data = await asyncio.to_thread(Path(audio_file_path).read_bytes)
+        except Exception as e:
+            logger.error(f"Speech recognition error: {str(e)}")
+            return "Sorry, there was an error processing your speech."
+        return await self.speech_to_text_from_bytes(data)
+    
+    async def speech_to_text_from_bytes(self, data: bytes) -> str:
+        """Convert an in-memory audio upload to text
+        
+        The upload is decoded, downmixed, resampled to 16 kHz, trimmed and
+        normalized before it reaches the STT backend.
+        """
         
         try:
-            with sr.AudioFile(audio_file_path) as source:
-                audio = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio)
-                logger.info(f"Transcribed: {text}")
-                return text
-        except sr.UnknownValueError:
-            logger.warning("Could not understand audio")
-            return "I couldn't understand that. Could you please repeat?"
-        except sr.RequestError as e:
+            with self.latency.turn("speech_to_text"):
+                with trace_stage("stt_preprocess", input_bytes=len(data)) as stage:
+                    audio = await asyncio.to_thread(preprocess_audio, data, STT_SAMPLE_RATE)
+                    stage["input_ms"] = round(audio.input_seconds * 1000, 1)
+                    stage["output_ms"] = round(audio.output_seconds * 1000, 1)
+                # Nothing louder than the noise floor: skip recognition entirely
+                text = await self.transcribe_pcm(audio.pcm, audio.sample_rate) if audio.pcm else ""
+            if not text:
+                logger.warning("Could not understand audio")
+                return "I couldn't understand that. Could you please repeat?"
+            logger.info(f"Transcribed: {text}")
+            return text
+        except Exception as e:
             logger.error(f"Speech recognition error: {str(e)}")
             return "Sorry, there was an error processing your speech."
     
+    async def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> str:
+        """Transcribe one segment of 16-bit mono PCM; returns "" if nothing was understood"""
+        
+        # Recognition blocks (network call or local CPU inference); keep it off the event loop
+        audio_seconds = len(pcm) / 2 / sample_rate
+        with self.latency.turn("transcribe_segment"):
+            with trace_stage("stt_recognition", backend=self.stt.name, audio_ms=round(audio_seconds * 1000, 1)) as stage:
+                started = time.perf_counter()
+                text = await asyncio.to_thread(self.stt.transcribe, pcm, sample_rate)
+                if audio_seconds:
+                    stage["rtf"] = round((time.perf_counter() - started) / audio_seconds, 3)
+        if text:
+            logger.info(f"Transcribed segment: {text}")
+        return text
+    
     async def listen_from_microphone(self, timeout: int = 10, phrase_timeout: int = 5) -> str:
         """Listen to microphone input and convert to text"""
         
         try:
+            if self.microphone is None:
+                self.microphone = sr.Microphone()
             with self.microphone as source:
                 # Adjust for ambient noise
                 self.recognizer.adjust_for_ambient_noise(source, duration=1)
@@ -230,16 +565,18 @@ class LeetCodeVoiceAgent:
                 # Listen for audio
                 audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
                 
-                # Convert to text
-                text = self.recognizer.recognize_google(audio)
-                logger.info(f"Heard: {text}")
-                return text
+            # Convert to text
+            text = await self.transcribe_pcm(
+                audio.get_raw_data(convert_rate=STT_SAMPLE_RATE, convert_width=2), STT_SAMPLE_RATE
+            )
+            if not text:
+                return "I couldn't understand that. Could you please repeat?"
+            logger.info(f"Heard: {text}")
+            return text
                 
         except sr.WaitTimeoutError:
             return "No response heard. Please try speaking again."
-        except sr.UnknownValueError:
-            return "I couldn't understand that. Could you please repeat?"
-        except sr.RequestError as e:
+        except Exception as e:
             logger.error(f"Speech recognition error: {str(e)}")
             return "Sorry, there was an error processing your speech."
     
@@ -247,39 +584,73 @@ class LeetCodeVoiceAgent:
         """Generate contextual feedback for user responses"""
         
         try:
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are an experienced technical interviewer providing feedback on a candidate's response to a LeetCode problem question.
+            feedback, _ = await self._request_feedback(question, user_response, context)
+            return feedback
+            
+        except Exception as e:
+            logger.error(f"Error generating feedback: {str(e)}")
+            return "Thank you for your response. Let's continue with the next question."
+    
+    async def _request_feedback(self, question: str, user_response: str, context: Dict[str, Any]) -> Tuple[str, int]:
+        """Call the LLM for feedback; returns the feedback and the tokens used"""
+        
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content="""You are an experienced technical interviewer providing feedback on a candidate's response to a LeetCode problem question.
 
-                Provide constructive, encouraging feedback that:
-                1. Acknowledges what the candidate did well
-                2. Gently corrects any misconceptions
-                3. Provides hints or guidance if needed
-                4. Asks a follow-up question if appropriate
-                5. Keeps the conversation flowing naturally
+            Provide constructive, encouraging feedback that:
+            1. Acknowledges what the candidate did well
+            2. Gently corrects any misconceptions
+            3. Provides hints or guidance if needed
+            4. Asks a follow-up question if appropriate
+            5. Keeps the conversation flowing naturally
 
-                Keep responses concise (2-3 sentences) and conversational.
-                Be encouraging and professional.
-                """),
-                HumanMessage(content=f"""
-                Interview Context:
-                - Problem: {context.get('problem_title', 'N/A')}
-                - Difficulty: {context.get('difficulty', 'N/A')}
-                - Language: {context.get('language', 'N/A')}
+            Keep responses concise (2-3 sentences) and conversational.
+            Be encouraging and professional.
+            """),
+            HumanMessage(content=f"""
+            Interview Context:
+            - Problem: {context.get('problem_title', 'N/A')}
+            - Difficulty: {context.get('difficulty', 'N/A')}
+            - Language: {context.get('language', 'N/A')}
 
-                Question Asked: {question}
-                
-                Candidate's Response: {user_response}
-                
-                Please provide appropriate feedback.
-                """)
-            ])
+            Question Asked: {question}
             
-            response = await self.llm.ainvoke(prompt.format_messages())
-            return response.content.strip()
+            Candidate's Response: {user_response}
             
-        except Exception as e:
-            logger.error(f"Error generating feedback: {str(e)}")
-            return "Thank you for your response. Let's continue with the next question."
+            Please provide appropriate feedback.
+            """)
+        ])
+        
+        with trace_stage("feedback_llm"):
+            response = await self.llm.ainvoke(prompt.format_messages())
+        feedback = response.content.strip()
+        usage = getattr(response, "usage_metadata", None) or {}
+        tokens = usage.get("total_tokens") or FEEDBACK_PROMPT_TOKENS + (len(user_response) + len(feedback)) // 4
+        return feedback, tokens
+    
+    async def _speculative_feedback(self, interview_id: str, user_response: str) -> Tuple[int, str, int]:
+        """Feedback on a partial answer for the interview's current question"""
+        interview = await self.sessions.get(interview_id)
+        if not interview or interview["status"] != "active":
+            raise ValueError(f"Interview {interview_id} is not active")
+        question_index = interview["current_question_index"]
+        if question_index >= len(interview["questions"]):
+            raise ValueError(f"Interview {interview_id} has no open question")
+        feedback, tokens = await self._request_feedback(
+            interview["questions"][question_index], user_response, self._feedback_context(interview)
+        )
+        return question_index, feedback, tokens
+    
+    def _feedback_context(self, interview: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "problem_title": interview["problem_data"].get("title"),
+            "difficulty": interview["problem_data"].get("difficulty"),
+            "language": interview["language"]
+        }
+    
+    def update_answer_transcript(self, interview_id: str, text: str, final: bool = False) -> None:
+        """Live transcript of the answer being spoken, used to start feedback early"""
+        self.feedback_speculator.update(interview_id, text, final=final)
     
     async def start_interview(self, problem_data: Dict[str, Any], user_id: str, language: str = "Python") -> Dict[str, Any]:
         """Start a new LeetCode interview session"""
@@ -290,7 +661,7 @@ class LeetCodeVoiceAgent:
             
             # Create interview session
             interview_session = {
-                "id": f"interview_{datetime.now().timestamp()}",
+                "id": f"interview_{datetime.now().timestamp()}_{uuid.uuid4().hex[:8]}",
                 "user_id": user_id,
                 "problem_data": problem_data,
                 "language": language,
@@ -302,7 +673,8 @@ class LeetCodeVoiceAgent:
                 "status": "active"
             }
             
-            self.current_interview = interview_session
+            await self.sessions.create(interview_session)
+            self._start_question_prefetch(interview_session)
             
             # Generate welcome message
             welcome_message = f"""
@@ -316,13 +688,15 @@ class LeetCodeVoiceAgent:
             """
             
             # Generate TTS for welcome message
-            welcome_audio_path = await self.text_to_speech(welcome_message, f"welcome_{interview_session['id']}.wav")
+            welcome_audio_path = await self.text_to_speech(
+                welcome_message, f"welcome_{interview_session['id']}.wav", interview_id=interview_session["id"]
+            )
             
             return {
                 "success": True,
                 "interview_id": interview_session["id"],
                 "welcome_message": welcome_message,
-                "welcome_audio_path": welcome_audio_path,
+                "welcome_audio_path": audio_url(welcome_audio_path),
                 "first_question": questions[0] if questions else "Let's start discussing the problem.",
                 "total_questions": len(questions)
             }
@@ -338,64 +712,14 @@ class LeetCodeVoiceAgent:
         """Process user response and generate next question or feedback"""
         
         try:
-            if not self.current_interview or self.current_interview["id"] != interview_id:
-                return {"success": False, "error": "Interview session not found"}
-            
-            current_question_index = self.current_interview["current_question_index"]
-            questions = self.current_interview["questions"]
-            
-            if current_question_index >= len(questions):
-                return await self.end_interview(interview_id)
-            
-            current_question = questions[current_question_index]
-            
-            # Store user response
-            self.current_interview["responses"].append({
-                "question_index": current_question_index,
-                "question": current_question,
-                "response": user_response,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Generate feedback
-            context = {
-                "problem_title": self.current_interview["problem_data"].get("title"),
-                "difficulty": self.current_interview["problem_data"].get("difficulty"),
-                "language": self.current_interview["language"]
-            }
-            
-            feedback = await self.generate_feedback(current_question, user_response, context)
-            
-            self.current_interview["feedback"].append({
-                "question_index": current_question_index,
-                "feedback": feedback,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Generate TTS for feedback
-            feedback_audio_path = await self.text_to_speech(feedback, f"feedback_{interview_id}_{current_question_index}.wav")
-            
-            # Move to next question
-            self.current_interview["current_question_index"] += 1
-            next_question_index = self.current_interview["current_question_index"]
-            
-            if next_question_index < len(questions):
-                next_question = questions[next_question_index]
-                next_question_audio_path = await self.text_to_speech(next_question, f"question_{interview_id}_{next_question_index}.wav")
-                
-                return {
-                    "success": True,
-                    "feedback": feedback,
-                    "feedback_audio_path": feedback_audio_path,
-                    "next_question": next_question,
-                    "next_question_audio_path": next_question_audio_path,
-                    "question_number": next_question_index + 1,
-                    "total_questions": len(questions),
-                    "completed": False
-                }
-            else:
-                # All questions completed
-                return await self.end_interview(interview_id)
+            with self.latency.turn("answer", interview_id):
+                async with AsyncExitStack() as stack:
+                    # Turns of the same interview are handled one at a time
+                    with trace_stage("session_lock_wait"):
+                        interview = await stack.enter_async_context(self.sessions.locked(interview_id))
+                    if not interview:
+                        return {"success": False, "error": "Interview session not found"}
+                    return await self._process_turn(interview, user_response)
                 
         except Exception as e:
             logger.error(f"Error processing user response: {str(e)}")
@@ -404,32 +728,97 @@ class LeetCodeVoiceAgent:
                 "error": str(e)
             }
     
-    async def end_interview(self, interview_id: str) -> Dict[str, Any]:
-        """End the interview and generate final report"""
+    async def _process_turn(self, interview: Dict[str, Any], user_response: str) -> Dict[str, Any]:
+        """Handle one answer for an interview; the caller holds the session lock"""
+        interview_id = interview["id"]
+        current_question_index = interview["current_question_index"]
+        questions = interview["questions"]
+        
+        if interview["status"] != "active":
+            return {"success": False, "error": "Interview has already ended"}
+        
+        if current_question_index >= len(questions):
+            return await self._finish_interview(interview)
+        
+        current_question = questions[current_question_index]
+        
+        # Store user response
+        interview["responses"].append({
+            "question_index": current_question_index,
+            "question": current_question,
+            "response": user_response,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+        # The next question does not depend on the feedback, so its audio
+        # (usually already prefetched) is awaited alongside the feedback
+        next_question_index = current_question_index + 1
+        next_question_audio_task = None
+        if next_question_index < len(questions):
+            next_question_audio_task = asyncio.create_task(
+                self._question_audio(interview, next_question_index)
+            )
         
         try:
-            if not self.current_interview or self.current_interview["id"] != interview_id:
-                return {"success": False, "error": "Interview session not found"}
+            # Generate feedback, unless it was already generated from the live transcript
+            with trace_stage("feedback_speculation") as stage:
+                feedback = await self.feedback_speculator.take(interview_id, current_question_index, user_response)
+                stage["hit"] = feedback is not None
+            if feedback is None:
+                feedback = await self.generate_feedback(
+                    current_question, user_response, self._feedback_context(interview)
+                )
             
-            self.current_interview["status"] = "completed"
-            self.current_interview["completed_at"] = datetime.now().isoformat()
-            
-            # Generate final assessment
-            final_message = "Thank you for completing the interview! You did well discussing the problem and your approach. I'll now generate a detailed report of your performance."
-            
-            final_audio_path = await self.text_to_speech(final_message, f"final_{interview_id}.wav")
+            interview["feedback"].append({
+                "question_index": current_question_index,
+                "feedback": feedback,
+                "timestamp": datetime.now().isoformat()
+            })
             
-            # Generate performance report
-            report = await self.generate_performance_report(self.current_interview)
+            # Generate TTS for feedback
+            feedback_audio_path = await self.text_to_speech(
+                feedback, f"feedback_{interview_id}_{current_question_index}.wav", interview_id=interview_id
+            )
+        except BaseException:
+            if next_question_audio_task:
+                next_question_audio_task.cancel()
+            raise
+        
+        # Move to next question
+        interview["current_question_index"] = next_question_index
+        with trace_stage("session_save"):
+            await self.sessions.save(interview)
+        
+        if next_question_audio_task:
+            next_question = questions[next_question_index]
+            # Only the part not hidden behind the feedback shows up here
+            with trace_stage("next_question_audio_wait"):
+                next_question_audio_path = await next_question_audio_task
             
             return {
                 "success": True,
-                "completed": True,
-                "final_message": final_message,
-                "final_audio_path": final_audio_path,
-                "interview_data": self.current_interview,
-                "performance_report": report
+                "feedback": feedback,
+                "feedback_audio_path": audio_url(feedback_audio_path),
+                "next_question": next_question,
+                "next_question_audio_path": audio_url(next_question_audio_path),
+                "question_number": next_question_index + 1,
+                "total_questions": len(questions),
+                "completed": False
             }
+        else:
+            # All questions completed
+            return await self._finish_interview(interview)
+    
+    async def end_interview(self, interview_id: str, wait_for_report: bool = False) -> Dict[str, Any]:
+        """End the interview and generate final report"""
+        
+        try:
+            async with self.sessions.locked(interview_id) as interview:
+                if not interview:
+                    return {"success": False, "error": "Interview session not found"}
+                if interview["status"] == "completed":
+                    return await self._completed_interview_result(interview, wait_for_report=wait_for_report)
+                return await self._finish_interview(interview, wait_for_report=wait_for_report)
             
         except Exception as e:
             logger.error(f"Error ending interview: {str(e)}")
@@ -438,61 +827,143 @@ class LeetCodeVoiceAgent:
                 "error": str(e)
             }
     
-    async def generate_performance_report(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a comprehensive performance report"""
+    async def _finish_interview(self, interview: Dict[str, Any], wait_for_report: bool = False) -> Dict[str, Any]:
+        """Complete an interview; the caller holds the session lock
         
-        try:
-            # Prepare context for report generation
-            responses_text = "\n".join([
-                f"Q{i+1}: {resp['question']}\nA: {resp['response']}\n"
-                for i, resp in enumerate(interview_data["responses"])
-            ])
-            
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are an expert technical interviewer generating a performance report for a LeetCode interview.
+        The performance report is generated in the background unless
+        ``wait_for_report`` is set; poll or stream it by ``report_id``.
+        """
+        interview_id = interview["id"]
+        interview["status"] = "completed"
+        interview["completed_at"] = datetime.now().isoformat()
+        await self.sessions.save(interview)
+        self.question_prefetcher.cancel(interview_id)
+        self.feedback_speculator.cancel(interview_id)
+        self.artifacts.mark_ended(interview_id)
+        
+        # Generate final assessment
+        final_message = FINAL_MESSAGE
+        
+        final_audio_path = await self.text_to_speech(
+            final_message, f"final_{interview_id}.wav", interview_id=interview_id
+        )
+        
+        result = {
+            "success": True,
+            "completed": True,
+            "final_message": final_message,
+            "final_audio_path": audio_url(final_audio_path),
+            "interview_data": interview
+        }
+        
+        # Generate performance report
+        if wait_for_report:
+            result["performance_report"] = await self.generate_performance_report(interview)
+            return result
+        
+        job = self.report_jobs.start(interview_id, lambda on_section: self._run_report_job(interview, on_section))
+        interview["report_id"] = job.report_id
+        await self.sessions.save(interview)
+        result["report_id"] = job.report_id
+        result["report_status"] = job.status
+        return result
+    
+    async def _completed_interview_result(self, interview: Dict[str, Any],
+                                          wait_for_report: bool = False) -> Dict[str, Any]:
+        """Result of ``end_interview`` for an interview that has already ended
+        
+        Hands back the existing report instead of starting another one, and
+        leaves the audio cleanup timers alone.
+        """
+        interview_id = interview["id"]
+        result = {
+            "success": True,
+            "completed": True,
+            "final_message": FINAL_MESSAGE,
+            "final_audio_path": audio_url(f"final_{interview_id}.wav"),
+            "interview_data": interview
+        }
+        
+        report_id = interview.get("report_id")
+        if not report_id:
+            # Ended with wait_for_report, so no report job was kept
+            if wait_for_report:
+                result["performance_report"] = await self.generate_performance_report(interview)
+                return result
+            job = self.report_jobs.start(interview_id, lambda on_section: self._run_report_job(interview, on_section))
+            interview["report_id"] = job.report_id
+            await self.sessions.save(interview)
+            report_id = job.report_id
+        
+        job = self.report_jobs.get(report_id)
+        if job and wait_for_report:
+            # The job records its own failures, so waiting never raises
+            await asyncio.shield(job.task)
+            result["performance_report"] = job.report
+        result["report_id"] = report_id
+        result["report_status"] = job.status if job else "expired"
+        return result
+    
+    def _report_messages(self, interview_data: Dict[str, Any]) -> List[Any]:
+        """Prompt messages for the performance report"""
+        
+        # Prepare context for report generation
+        responses_text = "\n".join([
+            f"Q{i+1}: {resp['question']}\nA: {resp['response']}\n"
+            for i, resp in enumerate(interview_data["responses"])
+        ])
+        
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content="""You are an expert technical interviewer generating a performance report for a LeetCode interview.
 
-                Analyze the candidate's responses and provide:
-                1. Overall Score (0-100)
-                2. Category Scores for:
-                   - Problem Understanding (0-20)
-                   - Algorithm Design (0-20) 
-                   - Time & Space Complexity (0-20)
-                   - Implementation Knowledge (0-20)
-                   - Communication & Clarity (0-20)
-                3. Strengths (3-5 bullet points)
-                4. Areas for Improvement (3-5 bullet points)
-                5. Final Assessment (2-3 sentences)
+            Analyze the candidate's responses and provide:
+            1. Overall Score (0-100)
+            2. Category Scores for:
+               - Problem Understanding (0-20)
+               - Algorithm Design (0-20) 
+               - Time & Space Complexity (0-20)
+               - Implementation Knowledge (0-20)
+               - Communication & Clarity (0-20)
+            3. Strengths (3-5 bullet points)
+            4. Areas for Improvement (3-5 bullet points)
+            5. Final Assessment (2-3 sentences)
 
-                Return a JSON object with this structure:
-                {
-                    "overall_score": number,
-                    "category_scores": {
-                        "problem_understanding": number,
-                        "algorithm_design": number,
-                        "complexity_analysis": number,
-                        "implementation_knowledge": number,
-                        "communication": number
-                    },
-                    "strengths": [array of strings],
-                    "areas_for_improvement": [array of strings],
-                    "final_assessment": "string"
-                }
-                """),
-                HumanMessage(content=f"""
-                Interview Details:
-                - Problem: {interview_data['problem_data'].get('title')}
-                - Difficulty: {interview_data['problem_data'].get('difficulty')}
-                - Language: {interview_data['language']}
-                - Duration: {len(interview_data['responses'])} questions answered
+            Return a JSON object with this structure:
+            {
+                "overall_score": number,
+                "category_scores": {
+                    "problem_understanding": number,
+                    "algorithm_design": number,
+                    "complexity_analysis": number,
+                    "implementation_knowledge": number,
+                    "communication": number
+                },
+                "strengths": [array of strings],
+                "areas_for_improvement": [array of strings],
+                "final_assessment": "string"
+            }
+            """),
+            HumanMessage(content=f"""
+            Interview Details:
+            - Problem: {interview_data['problem_data'].get('title')}
+            - Difficulty: {interview_data['problem_data'].get('difficulty')}
+            - Language: {interview_data['language']}
+            - Duration: {len(interview_data['responses'])} questions answered
 
-                Questions and Responses:
-                {responses_text}
+            Questions and Responses:
+            {responses_text}
 
-                Please analyze and generate the performance report.
-                """)
-            ])
-            
-            response = await self.llm.ainvoke(prompt.format_messages())
+            Please analyze and generate the performance report.
+            """)
+        ])
+        
+        return prompt.format_messages()
+    
+    async def generate_performance_report(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a comprehensive performance report"""
+        
+        try:
+            response = await self.llm.ainvoke(self._report_messages(interview_data))
             
             try:
                 report = json.loads(response.content.strip())
@@ -506,6 +977,47 @@ class LeetCodeVoiceAgent:
             logger.error(f"Error generating performance report: {str(e)}")
             return self._generate_fallback_report(interview_data)
     
+    async def stream_performance_report(self, interview_data: Dict[str, Any],
+                                        on_section: Callable[[str, Any], Awaitable[None]]) -> Dict[str, Any]:
+        """Generate the performance report, reporting each top-level section as soon as it is complete"""
+        
+        scanner = JSONSectionScanner()
+        emitted = set()
+        try:
+            async for chunk in self.llm.astream(self._report_messages(interview_data)):
+                for key, value in scanner.feed(chunk.content):
+                    emitted.add(key)
+                    await on_section(key, value)
+            
+            text = scanner.text.strip()
+            # Tolerate a Markdown code fence around the JSON
+            report = json.loads(text[text.index("{"):text.rindex("}") + 1])
+            report["generated_at"] = datetime.now().isoformat()
+        except Exception as e:
+            logger.error(f"Error generating performance report: {str(e)}")
+            report = self._generate_fallback_report(interview_data)
+        
+        # Sections the stream did not produce (or the whole fallback report)
+        for key, value in report.items():
+            if key not in emitted:
+                await on_section(key, value)
+        return report
+    
+    async def _run_report_job(self, interview: Dict[str, Any],
+                              on_section: Callable[[str, Any], Awaitable[None]]) -> Dict[str, Any]:
+        report = await self.stream_performance_report(interview, on_section)
+        interview["performance_report"] = report
+        await self.sessions.save(interview)
+        return report
+    
+    def get_report(self, report_id: str) -> Dict[str, Any]:
+        """Status and (partial) content of a background report job"""
+        
+        job = self.report_jobs.get(report_id)
+        if not job:
+            return {"success": False, "error": "Report not found"}
+        return {"success": True, **job.to_dict()}
+    
     def _generate_fallback_report(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a basic fallback report if AI generation fails"""
         
@@ -535,17 +1047,38 @@ class LeetCodeVoiceAgent:
             "generated_at": datetime.now().isoformat()
         }
     
-    def get_interview_status(self, interview_id: str) -> Dict[str, Any]:
+    async def get_interview_status(self, interview_id: str) -> Dict[str, Any]:
         """Get current interview status"""
         
-        if not self.current_interview or self.current_interview["id"] != interview_id:
+        interview = await self.sessions.get(interview_id)
+        if not interview:
             return {"success": False, "error": "Interview session not found"}
         
         return {
             "success": True,
             "interview_id": interview_id,
-            "status": self.current_interview["status"],
-            "current_question_index": self.current_interview["current_question_index"],
-            "total_questions": len(self.current_interview["questions"]),
-            "responses_count": len(self.current_interview["responses"])
+            "status": interview["status"],
+            "current_question_index": interview["current_question_index"],
+            "total_questions": len(interview["questions"]),
+            "responses_count": len(interview["responses"]),
+            "question_audio": self._question_audio_readiness(interview_id)
+        }
+    
+    async def get_question_audio_status(self, interview_id: str) -> Dict[str, Any]:
+        """Per-question readiness of the prefetched question audio"""
+        
+        interview = await self.sessions.get(interview_id)
+        if not interview:
+            return {"success": False, "error": "Interview session not found"}
+        
+        readiness = self._question_audio_readiness(interview_id)
+        if readiness is None and interview["status"] == "active":
+            self._start_question_prefetch(interview)
+            readiness = self._question_audio_readiness(interview_id)
+        
+        return {
+            "success": True,
+            "interview_id": interview_id,
+            "questions": readiness or [],
+            "ready_count": sum(1 for question in readiness or [] if question["state"] == "ready")
         }
\ No newline at end of file
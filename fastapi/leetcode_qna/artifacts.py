@@ -0,0 +1,110 @@
+import os
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long audio of a finished interview stays available for playback (seconds)
+ARTIFACT_RETENTION_SECONDS = float(os.getenv("LEETCODE_AUDIO_RETENTION_SECONDS", "1800"))
+
+
+class ArtifactRegistry:
+    """Records the audio files produced for each interview
+
+    Cleanup deletes exactly the registered files (and their encoded variants)
+    instead of scanning the audio directory. Files of a session are deleted
+    ``retention_seconds`` after it ends, immediately when it expires, or on
+    request. The registry lives in memory, so files written before a restart
+    are not tracked.
+    """
+
+    def __init__(self, audio_dir: Path, variant_suffixes: List[str],
+                 retention_seconds: float = ARTIFACT_RETENTION_SECONDS):
+        self.audio_dir = audio_dir
+        self.variant_suffixes = variant_suffixes
+        self.retention_seconds = retention_seconds
+        self._files: Dict[str, Set[str]] = {}
+        self._ended: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.stats = {"registered": 0, "deleted": 0, "sessions_cleaned": 0}
+
+    def register(self, session_id: str, path: str) -> None:
+        """Associate an audio file (by name, within the audio directory) with a session"""
+        name = Path(path).name
+        files = self._files.setdefault(session_id, set())
+        if name not in files:
+            files.add(name)
+            self.stats["registered"] += 1
+
+    def files(self, session_id: str) -> List[str]:
+        return sorted(self._files.get(session_id, ()))
+
+    def _unlink(self, names: Set[str]) -> int:
+        deleted = 0
+        for name in names:
+            path = self.audio_dir / name
+            for variant in {path, *(path.with_suffix(suffix) for suffix in self.variant_suffixes)}:
+                try:
+                    variant.unlink()
+                    deleted += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to delete {variant}: {str(e)}")
+        return deleted
+
+    async def delete_session(self, session_id: str) -> int:
+        """Delete every file recorded for a session; returns the number of files removed"""
+        timer = self._timers.pop(session_id, None)
+        if timer:
+            timer.cancel()
+        self._ended.pop(session_id, None)
+        names = self._files.pop(session_id, None)
+        if not names:
+            return 0
+
+        deleted = await asyncio.to_thread(self._unlink, names)
+        self.stats["deleted"] += deleted
+        self.stats["sessions_cleaned"] += 1
+        logger.info(f"Deleted {deleted} audio files for {session_id}")
+        return deleted
+
+    def _delete_later(self, session_id: str) -> None:
+        self._timers.pop(session_id, None)
+        asyncio.create_task(self.delete_session(session_id))
+
+    def mark_ended(self, session_id: str) -> None:
+        """The interview is over; delete its files after the retention period"""
+        self._ended[session_id] = time.time()
+        if session_id in self._timers:
+            self._timers[session_id].cancel()
+        self._timers[session_id] = asyncio.get_running_loop().call_later(
+            self.retention_seconds, self._delete_later, session_id
+        )
+
+    def expire(self, session_id: str) -> None:
+        """Session expiry listener: the session is gone, so are its files"""
+        if session_id in self._files or session_id in self._ended:
+            asyncio.create_task(self.delete_session(session_id))
+
+    async def purge_ended(self, older_than_seconds: float = 0) -> Dict[str, int]:
+        """Delete the files of every session that ended at least ``older_than_seconds`` ago"""
+        cutoff = time.time() - older_than_seconds
+        sessions = [session_id for session_id, ended_at in self._ended.items() if ended_at <= cutoff]
+        deleted = 0
+        for session_id in sessions:
+            deleted += await self.delete_session(session_id)
+        return {"sessions": len(sessions), "files": deleted}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sessions": len(self._files),
+            "files": sum(len(names) for names in self._files.values()),
+            "ended_sessions": len(self._ended),
+            "retention_seconds": self.retention_seconds
+        }
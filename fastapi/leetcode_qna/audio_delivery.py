@@ -0,0 +1,259 @@
+import os
+import re
+import shutil
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Callable
+
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Output formats: file extension, media type and ffmpeg encoder arguments.
+# Speech at 24 kHz is intelligible and natural well below these bitrates.
+AUDIO_FORMATS: Dict[str, Dict[str, Any]] = {
+    "opus": {
+        "extension": ".ogg",
+        "media_type": "audio/ogg",
+        "ffmpeg_args": ["-c:a", "libopus", "-b:a", "32k", "-application", "voip", "-f", "ogg"]
+    },
+    "mp3": {
+        "extension": ".mp3",
+        "media_type": "audio/mpeg",
+        "ffmpeg_args": ["-c:a", "libmp3lame", "-b:a", "48k", "-f", "mp3"]
+    },
+    "wav": {
+        "extension": ".wav",
+        "media_type": "audio/wav",
+        "ffmpeg_args": []
+    }
+}
+
+# Accept header media types understood for each format
+_MEDIA_TYPE_FORMATS = {
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "application/ogg": "opus",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav"
+}
+
+# Where clients fetch interview audio (see route.get_audio_file)
+AUDIO_URL_PREFIX = "/leetcode-qna/audio"
+
+# Encoded files never change once written
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CHUNK_SIZE = 64 * 1024
+
+
+class AudioEncoder:
+    """Encodes synthesized WAV files to compressed formats in the background
+
+    Each WAV handed to ``schedule`` is converted by ffmpeg to every configured
+    format next to the original file. Once all encodings succeed the WAV is
+    deleted unless ``keep_wav`` is set. Without ffmpeg the encoder is disabled
+    and WAV files are served as before.
+    """
+
+    def __init__(self, formats: List[str], keep_wav: bool = False, max_concurrency: int = 2,
+                 ffmpeg: Optional[str] = None):
+        self.formats = [fmt for fmt in formats if fmt != "wav"]
+        self.keep_wav = keep_wav
+        self.ffmpeg = ffmpeg
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.stats = {"encoded": 0, "failures": 0, "wav_bytes": 0, "encoded_bytes": 0}
+        if not self.ffmpeg:
+            logger.warning("ffmpeg not found; interview audio will be served as WAV")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.ffmpeg and self.formats)
+
+    def schedule(self, wav_path: str, on_encoded: Optional[Callable[[Path], None]] = None) -> None:
+        """Queue background encoding of a freshly written WAV file
+
+        ``on_encoded`` is called with each encoded file once it is complete.
+        """
+        if not self.enabled:
+            return
+        path = Path(wav_path)
+        if str(path) in self._pending:
+            return
+        task = asyncio.create_task(self._encode(path, on_encoded))
+        self._pending[str(path)] = task
+        task.add_done_callback(lambda _: self._pending.pop(str(path), None))
+
+    def is_pending(self, wav_path: Path) -> bool:
+        """Whether encodings of ``wav_path`` are still being produced"""
+        return str(wav_path) in self._pending
+
+    async def _encode(self, wav_path: Path, on_encoded: Optional[Callable[[Path], None]]) -> None:
+        async with self._semaphore:
+            try:
+                wav_bytes = wav_path.stat().st_size
+            except FileNotFoundError:
+                return
+            results = [await self._encode_one(wav_path, fmt, on_encoded) for fmt in self.formats]
+
+        if all(results):
+            self.stats["wav_bytes"] += wav_bytes
+            if not self.keep_wav:
+                wav_path.unlink(missing_ok=True)
+
+    async def _encode_one(self, wav_path: Path, fmt: str, on_encoded: Optional[Callable[[Path], None]]) -> bool:
+        spec = AUDIO_FORMATS[fmt]
+        target = wav_path.with_suffix(spec["extension"])
+        partial = target.with_name(f"{target.name}.part")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-i", str(wav_path),
+                *spec["ffmpeg_args"], str(partial),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise RuntimeError(stderr.decode("utf-8", "replace").strip() or f"exit code {process.returncode}")
+            os.replace(partial, target)
+        except Exception as e:
+            logger.error(f"Failed to encode {wav_path.name} to {fmt}: {str(e)}")
+            partial.unlink(missing_ok=True)
+            self.stats["failures"] += 1
+            return False
+
+        self.stats["encoded"] += 1
+        self.stats["encoded_bytes"] += target.stat().st_size
+        if on_encoded:
+            try:
+                on_encoded(target)
+            except Exception as e:
+                logger.warning(f"Failed to keep encoded {target.name}: {str(e)}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Encoding counters for health endpoints"""
+        encoded_per_wav = self.stats["encoded_bytes"] / max(1, len(self.formats))
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "formats": self.formats,
+            "pending": len(self._pending),
+            "compression_ratio": round(self.stats["wav_bytes"] / encoded_per_wav, 1) if encoded_per_wav else None
+        }
+
+
+def create_audio_encoder() -> AudioEncoder:
+    """Build the audio encoder from environment settings"""
+    formats = [fmt.strip() for fmt in os.getenv("LEETCODE_AUDIO_FORMATS", "opus,mp3").split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in AUDIO_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown audio formats in LEETCODE_AUDIO_FORMATS: {', '.join(unknown)}")
+    return AudioEncoder(
+        formats,
+        keep_wav=os.getenv("LEETCODE_AUDIO_KEEP_WAV", "0") == "1",
+        max_concurrency=int(os.getenv("LEETCODE_AUDIO_ENCODE_CONCURRENCY", "2")),
+        ffmpeg=shutil.which(os.getenv("FFMPEG_BINARY", "ffmpeg"))
+    )
+
+
+def audio_url(path: Optional[str]) -> Optional[str]:
+    """URL of a synthesized file on the negotiating audio endpoint
+    
+    The WAV is deleted once it has been encoded, so its own path only works
+    for a few seconds. The endpoint takes the WAV name and serves whichever
+    format the client accepts and exists.
+    """
+    if not path:
+        return None
+    return f"{AUDIO_URL_PREFIX}/{Path(path).name}"
+
+
+def negotiate_formats(preferred: List[str], accept: Optional[str] = None, requested: Optional[str] = None) -> List[str]:
+    """Order the formats a client should receive, best first
+
+    An explicit ``requested`` format wins. Otherwise formats named in the Accept
+    header are ranked by q-value, with wildcards matching the server preference.
+    Only ``preferred`` formats are considered; WAV is always the last resort.
+    """
+    if requested:
+        return [requested] if requested == "wav" else [requested, "wav"]
+
+    ranked: List[Tuple[float, int, str]] = []
+    for position, item in enumerate((accept or "*/*").split(",")):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                continue
+        if quality <= 0:
+            continue
+        media_type = media_type.strip().lower()
+        if media_type in ("*/*", "audio/*"):
+            candidates = preferred
+        else:
+            fmt = _MEDIA_TYPE_FORMATS.get(media_type)
+            candidates = [fmt] if fmt in preferred or fmt == "wav" else []
+        for fmt in candidates:
+            ranked.append((-quality, position, fmt))
+
+    order: List[str] = []
+    for _, _, fmt in sorted(ranked, key=lambda entry: (entry[0], entry[1])):
+        if fmt not in order:
+            order.append(fmt)
+    if "wav" not in order:
+        order.append("wav")
+    return order
+
+
+def _iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as audio_file:
+        audio_file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = audio_file.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(path: Path, media_type: str, range_header: Optional[str],
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serve a file, honouring a single-range ``Range`` header"""
+    size = path.stat().st_size
+    headers = {"Accept-Ranges": "bytes", **(headers or {})}
+
+    match = _RANGE_PATTERN.match(range_header.strip()) if range_header else None
+    if not match or (not match.group(1) and not match.group(2)):
+        # No range (or one we do not support, e.g. multiple ranges): whole file
+        return FileResponse(path=str(path), media_type=media_type, headers=headers)
+
+    if match.group(1):
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(0, size - int(match.group(2)))
+        end = size - 1
+
+    if start >= size or start > end:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    length = end - start + 1
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=206,
+        media_type=media_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(length)}
+    )
@@ -0,0 +1,194 @@
+import os
+import time
+import shutil
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+from .vad import create_vad
+from .stt import STTStream
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Compressed streams are decoded to this rate before voice activity detection
+DECODED_SAMPLE_RATE = 16000
+_READ_SIZE = 8192
+
+
+class FFmpegPCMDecoder:
+    """Decodes a compressed audio stream (WebM/Ogg Opus) to 16 kHz mono PCM16 through an ffmpeg pipe"""
+
+    def __init__(self, ffmpeg: str, on_pcm: Callable[[bytes], Awaitable[None]]):
+        self.ffmpeg = ffmpeg
+        self.on_pcm = on_pcm
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            self.ffmpeg, "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(DECODED_SAMPLE_RATE), "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            pcm = await self._process.stdout.read(_READ_SIZE)
+            if not pcm:
+                return
+            await self.on_pcm(pcm)
+
+    async def write(self, data: bytes) -> None:
+        self._process.stdin.write(data)
+        await self._process.stdin.drain()
+
+    async def finish(self) -> None:
+        """Close the input and wait until all decoded audio has been delivered"""
+        self._process.stdin.close()
+        await self._reader
+        await self._process.wait()
+
+    def kill(self) -> None:
+        if self._reader and not self._reader.done():
+            self._reader.cancel()
+        if self._process and self._process.returncode is None:
+            self._process.kill()
+
+
+class SpeechIngestSession:
+    """Turns a live audio stream into transcribed segments
+
+    Incoming PCM (or decoded Opus) goes through the VAD. Each segment that
+    closes is transcribed right away while the candidate keeps talking, and
+    transcripts are reported in segment order through ``send``. When the STT
+    backend supports incremental recognition (``open_stream``), audio is fed
+    to it as it arrives, ``partial`` events are reported while the candidate
+    speaks and the segment transcript is ready as soon as the segment closes.
+    ``on_text`` receives the whole transcript so far (with the current partial)
+    whenever it changes, and once more with ``final=True`` at the end.
+    """
+
+    def __init__(self, transcribe: Callable[[bytes, int], Awaitable[str]],
+                 send: Callable[[Dict[str, Any]], Awaitable[None]],
+                 sample_rate: int = DECODED_SAMPLE_RATE, encoding: str = "pcm16",
+                 open_stream: Optional[Callable[[int], Optional[STTStream]]] = None,
+                 on_text: Optional[Callable[[str, bool], None]] = None):
+        self.transcribe = transcribe
+        self.send = send
+        self.open_stream = open_stream
+        self.on_text = on_text
+        self.encoding = encoding
+        self.sample_rate = DECODED_SAMPLE_RATE if encoding == "opus" else sample_rate
+        self.vad = create_vad(self.sample_rate)
+        self.decoder: Optional[FFmpegPCMDecoder] = None
+        self.transcripts: List[str] = []
+        self._segment_count = 0
+        self._last_emit: Optional[asyncio.Task] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stream: Optional[STTStream] = open_stream(self.sample_rate) if open_stream else None
+        self._partial = ""
+
+    async def start(self) -> None:
+        if self.encoding == "opus":
+            ffmpeg = shutil.which(os.getenv("FFMPEG_BINARY", "ffmpeg"))
+            if not ffmpeg:
+                raise RuntimeError("ffmpeg is required for Opus input")
+            self.decoder = FFmpegPCMDecoder(ffmpeg, self._feed_pcm)
+            await self.decoder.start()
+        await self.send({"type": "ready", "encoding": self.encoding, "sample_rate": self.sample_rate})
+
+    async def push_audio(self, data: bytes) -> None:
+        """Accept one binary frame from the client"""
+        if self.decoder:
+            await self.decoder.write(data)
+        else:
+            await self._feed_pcm(data)
+
+    async def _feed_pcm(self, pcm: bytes) -> None:
+        was_in_speech = self.vad.in_speech
+        if self._stream:
+            partial = await asyncio.to_thread(self._stream.accept, pcm)
+            # Leading silence is not worth reporting
+            if partial and partial != self._partial and (was_in_speech or self.vad.in_speech):
+                self._partial = partial
+                await self.send({"type": "partial", "segment": self._segment_count, "text": partial})
+                self._notify_text()
+        for segment in self.vad.feed(pcm):
+            await self._close_segment(segment)
+        if self.vad.in_speech and not was_in_speech:
+            await self.send({
+                "type": "speech_start",
+                "segment": self._segment_count,
+                "offset_ms": self.vad.offset_ms(self.vad.speech_started_frame)
+            })
+
+    async def _close_segment(self, pcm: bytes) -> None:
+        index = self._segment_count
+        self._segment_count += 1
+        duration_ms = int(len(pcm) / 2 / self.sample_rate * 1000)
+        await self.send({"type": "segment_end", "segment": index, "duration_ms": duration_ms})
+        if self._stream:
+            # The streaming recognizer has already heard the segment; start a fresh one
+            stream, self._stream = self._stream, self.open_stream(self.sample_rate)
+            self._partial = ""
+            recognition = asyncio.to_thread(stream.result)
+        else:
+            recognition = self.transcribe(pcm, self.sample_rate)
+        task = asyncio.create_task(self._transcribe_segment(index, recognition, self._last_emit))
+        self._last_emit = task
+        self._tasks.append(task)
+
+    async def _transcribe_segment(self, index: int, recognition: Awaitable[str],
+                                  previous: Optional[asyncio.Task]) -> None:
+        started = time.monotonic()
+        event: Dict[str, Any] = {"type": "transcript", "segment": index}
+        try:
+            event["text"] = await recognition
+        except Exception as e:
+            logger.error(f"Failed to transcribe segment {index}: {str(e)}")
+            event["text"] = ""
+            event["error"] = str(e)
+        event["transcription_ms"] = int((time.monotonic() - started) * 1000)
+
+        # Report transcripts in the order the segments were spoken
+        if previous:
+            await asyncio.gather(previous, return_exceptions=True)
+        if event["text"]:
+            self.transcripts.append(event["text"])
+        await self.send(event)
+        self._notify_text()
+
+    def _notify_text(self, final: bool = False) -> None:
+        if not self.on_text:
+            return
+        text = " ".join(self.transcripts + ([self._partial] if self._partial and not final else []))
+        try:
+            self.on_text(text, final)
+        except Exception as e:
+            logger.warning(f"Transcript listener failed: {str(e)}")
+
+    async def finish(self) -> str:
+        """End of stream: close the open segment and wait for all transcripts"""
+        if self.decoder:
+            await self.decoder.finish()
+        segment = self.vad.flush()
+        if segment:
+            await self._close_segment(segment)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        text = " ".join(self.transcripts)
+        self._notify_text(final=True)
+        await self.send({"type": "final", "text": text, "segments": self._segment_count})
+        return text
+
+    def close(self) -> None:
+        """Release the decoder and abandon pending transcriptions"""
+        if self.decoder:
+            self.decoder.kill()
+        for task in self._tasks:
+            task.cancel()
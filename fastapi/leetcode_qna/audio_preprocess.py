@@ -0,0 +1,179 @@
+import io
+import os
+import math
+import wave
+import shutil
+import logging
+import tempfile
+import subprocess
+from typing import Tuple
+
+import numpy as np
+from scipy.signal import resample_poly
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Frames quieter than this relative to the loudest frame count as silence
+TRIM_THRESHOLD_DB = float(os.getenv("LEETCODE_STT_TRIM_DB", "-35"))
+# Uploads whose loudest frame is below this level are treated as silence
+SILENCE_FLOOR_DBFS = -50.0
+# Silence kept around the speech so word onsets are not clipped
+TRIM_PADDING_SECONDS = 0.2
+# Loudness the speech is normalized to, and the most gain applied to reach it
+TARGET_RMS_DBFS = float(os.getenv("LEETCODE_STT_TARGET_DBFS", "-20"))
+MAX_GAIN_DB = 30.0
+PEAK_LIMIT = 0.98
+_FRAME_SECONDS = 0.02
+
+
+class PreprocessedAudio:
+    """Mono PCM16 ready for speech-to-text, plus what the upload looked like"""
+
+    __slots__ = ("pcm", "sample_rate", "input_bytes", "input_sample_rate", "input_channels",
+                 "input_seconds", "output_seconds")
+
+    def __init__(self, pcm: bytes, sample_rate: int, input_bytes: int, input_sample_rate: int,
+                 input_channels: int, input_seconds: float):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.input_bytes = input_bytes
+        self.input_sample_rate = input_sample_rate
+        self.input_channels = input_channels
+        self.input_seconds = input_seconds
+        self.output_seconds = len(pcm) / 2 / sample_rate
+
+
+def _decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Integer PCM WAV to float32 samples shaped (frames, channels)"""
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        # Widen 24-bit samples to 32-bit by putting them in the top three bytes
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((raw.shape[0], 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        samples = padded.view("<i4").reshape(-1).astype(np.float32) / 2147483648.0
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+    return samples.reshape(-1, channels), sample_rate
+
+
+def _ffmpeg_binary():
+    return shutil.which(os.getenv("FFMPEG_BINARY", "ffmpeg"))
+
+
+def _decode_ffmpeg(data: bytes, sample_rate: int) -> np.ndarray:
+    """Any other container (WebM, Ogg, MP3, float WAV, ...) through an ffmpeg pipe
+
+    ffmpeg already delivers mono at ``sample_rate``, so only trimming and
+    normalization remain.
+    """
+    ffmpeg = _ffmpeg_binary()
+    result = subprocess.run(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        input=data, capture_output=True, check=False
+    )
+    if result.returncode != 0:
+        raise ValueError(f"Could not decode audio: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype="<f4").reshape(-1, 1)
+
+
+def _decode_audiofile(data: bytes) -> Tuple[np.ndarray, int]:
+    """AIFF and FLAC through speech_recognition, for hosts without ffmpeg"""
+    import speech_recognition as sr
+
+    # AudioFile only rewinds between its WAV/AIFF/FLAC probes when given a path
+    with tempfile.NamedTemporaryFile() as upload:
+        upload.write(data)
+        upload.flush()
+        try:
+            with sr.AudioFile(upload.name) as source:
+                audio = sr.Recognizer().record(source)
+        except Exception as e:
+            raise ValueError(f"Unsupported audio format (install ffmpeg for WebM, Ogg and MP3): {str(e)}")
+    # AudioFile has already mixed the channels down
+    samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype="<i2").astype(np.float32) / 32768.0
+    return samples.reshape(-1, 1), audio.sample_rate
+
+
+def downmix(samples: np.ndarray) -> np.ndarray:
+    """(frames, channels) to mono"""
+    if samples.shape[1] == 1:
+        return samples[:, 0]
+    # A matrix-vector product is much faster than mean(axis=1) over interleaved channels
+    channels = samples.shape[1]
+    return samples @ np.full(channels, 1.0 / channels, dtype=np.float32)
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Polyphase resampling by the reduced ``target_rate / source_rate`` ratio"""
+    if source_rate == target_rate or samples.size == 0:
+        return samples
+    divisor = math.gcd(source_rate, target_rate)
+    return resample_poly(samples, target_rate // divisor, source_rate // divisor).astype(np.float32)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = TRIM_THRESHOLD_DB,
+                 padding_seconds: float = TRIM_PADDING_SECONDS) -> np.ndarray:
+    """Cut leading and trailing silence; returns an empty array if nothing is above the threshold"""
+    frame = max(1, int(sample_rate * _FRAME_SECONDS))
+    frame_count = samples.size // frame
+    if frame_count == 0:
+        return samples
+
+    energy = np.sqrt(np.mean(np.square(samples[:frame_count * frame].reshape(frame_count, frame)), axis=1))
+    loudest = energy.max()
+    if loudest < 10 ** (SILENCE_FLOOR_DBFS / 20):
+        return samples[:0]
+    voiced = np.flatnonzero(energy >= loudest * 10 ** (threshold_db / 20))
+
+    padding = int(padding_seconds * sample_rate)
+    start = max(0, voiced[0] * frame - padding)
+    end = min(samples.size, (voiced[-1] + 1) * frame + padding)
+    return samples[start:end]
+
+
+def normalize_loudness(samples: np.ndarray, target_dbfs: float = TARGET_RMS_DBFS) -> np.ndarray:
+    """Scale to the target RMS level without clipping or boosting noise by more than MAX_GAIN_DB"""
+    if samples.size == 0:
+        return samples
+    rms = float(np.sqrt(np.mean(np.square(samples))))
+    peak = float(np.abs(samples).max())
+    if rms <= 0 or peak <= 0:
+        return samples
+    gain = min(10 ** (target_dbfs / 20) / rms, PEAK_LIMIT / peak, 10 ** (MAX_GAIN_DB / 20))
+    return samples * np.float32(gain)
+
+
+def preprocess_audio(data: bytes, sample_rate: int = 16000) -> PreprocessedAudio:
+    """Decode an upload and turn it into trimmed, normalized mono PCM16 at ``sample_rate``
+
+    Works on the in-memory bytes; blocking, so call it from a worker thread.
+    """
+    try:
+        samples, source_rate = _decode_wav(data)
+    except (wave.Error, EOFError, ValueError):
+        if _ffmpeg_binary():
+            samples, source_rate = _decode_ffmpeg(data, sample_rate), sample_rate
+        else:
+            samples, source_rate = _decode_audiofile(data)
+    channels = samples.shape[1]
+    input_seconds = samples.shape[0] / source_rate if source_rate else 0.0
+
+    # Trimming before resampling keeps the filter from running over silence
+    speech = trim_silence(downmix(samples), source_rate)
+    speech = normalize_loudness(resample(speech, source_rate, sample_rate))
+    pcm = (np.clip(speech, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    return PreprocessedAudio(pcm, sample_rate, len(data), source_rate, channels, input_seconds)
@@ -0,0 +1,183 @@
+import os
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Iterator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# The trace of the turn being handled by the current task, if any
+_current_trace: ContextVar[Optional["TurnTrace"]] = ContextVar("leetcode_turn_trace", default=None)
+
+
+class RollingHistogram:
+    """Percentiles over the most recent ``window`` samples"""
+
+    def __init__(self, window: int):
+        self.samples: "deque[float]" = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": 0}
+
+        def percentile(p: float) -> float:
+            # Nearest-rank percentile
+            return round(ordered[max(0, int(round(p / 100 * len(ordered))) - 1)], 2)
+
+        return {
+            "count": self.count,
+            "window": len(ordered),
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": round(ordered[-1], 2),
+            "mean": round(sum(ordered) / len(ordered), 2)
+        }
+
+
+class TurnTrace:
+    """Stage timings for one voice turn"""
+
+    def __init__(self, tracer: "LatencyTracer", kind: str, interview_id: Optional[str]):
+        self.tracer = tracer
+        self.kind = kind
+        self.interview_id = interview_id
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.stages: List[Dict[str, Any]] = []
+        self.total_ms: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.total_ms is not None
+
+    def record(self, stage: str, seconds: float, started: Optional[float] = None, **fields: Any) -> None:
+        if self.finished:
+            # Work that outlived its turn (e.g. a cancelled prefetch) is not counted
+            return
+        if started is None:
+            started = time.perf_counter() - seconds
+        entry = {
+            "stage": stage,
+            "start_ms": round((started - self.started) * 1000, 1),
+            "duration_ms": round(seconds * 1000, 1),
+            **fields
+        }
+        self.stages.append(entry)
+        self.tracer.observe_stage(stage, seconds * 1000)
+        if "rtf" in fields:
+            self.tracer.observe_metric(f"{stage}_rtf", fields["rtf"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "interview_id": self.interview_id,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "stages": self.stages
+        }
+
+
+class LatencyTracer:
+    """Collects per-turn traces and rolling per-stage latency percentiles
+
+    ``turn`` opens a trace for the current task; ``trace_stage`` and
+    ``record_stage`` add to it from anywhere in the call chain (including
+    tasks created during the turn). Turns slower than ``budget_ms`` are logged
+    with their stage breakdown.
+    """
+
+    def __init__(self, window: int = 1000, recent_turns: int = 50, budget_ms: float = 3000):
+        self.window = window
+        self.budget_ms = budget_ms
+        self.stage_histograms: Dict[str, RollingHistogram] = {}
+        self.metric_histograms: Dict[str, RollingHistogram] = {}
+        self.turn_histograms: Dict[str, RollingHistogram] = {}
+        self.recent: "deque[Dict[str, Any]]" = deque(maxlen=recent_turns)
+        self.over_budget = 0
+
+    def _histogram(self, histograms: Dict[str, RollingHistogram], name: str) -> RollingHistogram:
+        if name not in histograms:
+            histograms[name] = RollingHistogram(self.window)
+        return histograms[name]
+
+    def observe_stage(self, stage: str, milliseconds: float) -> None:
+        self._histogram(self.stage_histograms, stage).add(milliseconds)
+
+    def observe_metric(self, name: str, value: float) -> None:
+        self._histogram(self.metric_histograms, name).add(value)
+
+    @contextmanager
+    def turn(self, kind: str, interview_id: Optional[str] = None) -> Iterator[TurnTrace]:
+        """Trace a turn; inside an existing turn the outer trace is reused"""
+        current = _current_trace.get()
+        if current is not None and not current.finished:
+            yield current
+            return
+
+        trace = TurnTrace(self, kind, interview_id)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 1)
+            self._histogram(self.turn_histograms, kind).add(trace.total_ms)
+            self.recent.append(trace.to_dict())
+            if trace.total_ms > self.budget_ms:
+                self.over_budget += 1
+                breakdown = ", ".join(f"{stage['stage']}={stage['duration_ms']}ms" for stage in trace.stages)
+                logger.warning(f"Slow {kind} turn for {interview_id}: {trace.total_ms}ms ({breakdown})")
+
+    def snapshot(self, recent: int = 10) -> Dict[str, Any]:
+        """Percentiles per stage (ms), per turn kind (ms) and for other metrics such as RTF"""
+        return {
+            "budget_ms": self.budget_ms,
+            "over_budget": self.over_budget,
+            "turns": {kind: histogram.summary() for kind, histogram in self.turn_histograms.items()},
+            "stages": {stage: histogram.summary() for stage, histogram in self.stage_histograms.items()},
+            "metrics": {name: histogram.summary() for name, histogram in self.metric_histograms.items()},
+            "recent_turns": list(self.recent)[-recent:] if recent > 0 else []
+        }
+
+
+def current_trace() -> Optional[TurnTrace]:
+    return _current_trace.get()
+
+
+def record_stage(stage: str, seconds: float, started: Optional[float] = None, **fields: Any) -> None:
+    """Add a measured stage to the current turn; a no-op outside a turn"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(stage, seconds, started, **fields)
+
+
+@contextmanager
+def trace_stage(stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block as a stage of the current turn
+
+    Yields a dict the block can add fields to (e.g. ``cache_hit``).
+    """
+    started = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        record_stage(stage, time.perf_counter() - started, started, **fields)
+
+
+def create_latency_tracer() -> LatencyTracer:
+    """Build the latency tracer from environment settings"""
+    return LatencyTracer(
+        window=int(os.getenv("LEETCODE_LATENCY_WINDOW", "1000")),
+        recent_turns=int(os.getenv("LEETCODE_LATENCY_RECENT_TURNS", "50")),
+        budget_ms=float(os.getenv("LEETCODE_TURN_BUDGET_MS", "3000"))
+    )
@@ -0,0 +1,140 @@
+import asyncio
+import contextvars
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+from .tts_worker import PRIORITY_LIVE, PRIORITY_BACKGROUND
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Per-question audio states
+PENDING = "pending"
+SYNTHESIZING = "synthesizing"
+READY = "ready"
+FAILED = "failed"
+
+
+class _InterviewPrefetch:
+    __slots__ = ("questions", "filenames", "states", "paths", "inflight_index", "inflight", "task")
+
+    def __init__(self, questions: List[str], filenames: List[str]):
+        self.questions = questions
+        self.filenames = filenames
+        self.states = [PENDING] * len(questions)
+        self.paths: List[Optional[str]] = [None] * len(questions)
+        self.inflight_index: Optional[int] = None
+        self.inflight: Optional[asyncio.Task] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class QuestionPrefetcher:
+    """Synthesizes interview questions in the background, ahead of the turn that needs them
+
+    Each interview gets one prefetch task that walks its questions in the order
+    they will be asked, with one request in the TTS worker at a time. Requests run
+    at background priority (earlier questions first across all interviews), so
+    live feedback audio waits at most for the one synthesis already in progress
+    (one batch, for models that synthesize batches). A turn that needs a question
+    the prefetcher has not reached yet synthesizes it at live priority instead.
+    """
+
+    def __init__(self, synthesize: Callable[[str, str, int], Awaitable[str]]):
+        # synthesize(text, output_filename, priority) -> audio path
+        self.synthesize = synthesize
+        self._interviews: Dict[str, _InterviewPrefetch] = {}
+
+    def start(self, interview_id: str, questions: List[str], filenames: List[str], first_index: int = 0) -> None:
+        """Begin synthesizing ``questions[first_index:]`` for an interview"""
+        self.cancel(interview_id)
+        prefetch = _InterviewPrefetch(questions, filenames)
+        # Run in a fresh context so the synthesis is not traced as part of
+        # whichever turn happened to start the prefetch
+        prefetch.task = contextvars.Context().run(
+            asyncio.create_task, self._run(interview_id, prefetch, first_index)
+        )
+        self._interviews[interview_id] = prefetch
+
+    async def _run(self, interview_id: str, prefetch: _InterviewPrefetch, first_index: int) -> None:
+        for index in range(first_index, len(prefetch.questions)):
+            if prefetch.states[index] != PENDING:
+                # Already requested by a live turn
+                continue
+
+            prefetch.states[index] = SYNTHESIZING
+            prefetch.inflight_index = index
+            prefetch.inflight = asyncio.create_task(self.synthesize(
+                prefetch.questions[index],
+                prefetch.filenames[index],
+                PRIORITY_BACKGROUND + index
+            ))
+            try:
+                prefetch.paths[index] = await prefetch.inflight
+                prefetch.states[index] = READY
+            except asyncio.CancelledError:
+                prefetch.inflight.cancel()
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to prefetch question {index} audio for {interview_id}: {str(e)}")
+                prefetch.states[index] = FAILED
+            finally:
+                prefetch.inflight_index = None
+
+        logger.info(f"Prefetched question audio for {interview_id}")
+
+    async def audio_for(self, interview_id: str, index: int) -> str:
+        """Audio for one question, reusing the prefetched file when available"""
+        prefetch = self._interviews.get(interview_id)
+        if prefetch is None:
+            raise KeyError(interview_id)
+
+        if prefetch.states[index] == READY:
+            return prefetch.paths[index]
+        if prefetch.inflight_index == index:
+            try:
+                # Shielded so an abandoned turn does not cancel the prefetch
+                return await asyncio.shield(prefetch.inflight)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Prefetch of question {index} failed, retrying live: {str(e)}")
+
+        # Not reached yet (or failed): synthesize it now at live priority
+        prefetch.states[index] = SYNTHESIZING
+        try:
+            path = await self.synthesize(prefetch.questions[index], prefetch.filenames[index], PRIORITY_LIVE)
+        except BaseException:
+            prefetch.states[index] = FAILED
+            raise
+        prefetch.paths[index] = path
+        prefetch.states[index] = READY
+        return path
+
+    def has(self, interview_id: str) -> bool:
+        """Whether question audio is being tracked for an interview"""
+        return interview_id in self._interviews
+
+    def cancel(self, interview_id: str) -> None:
+        """Stop prefetching for an interview and forget its state"""
+        prefetch = self._interviews.pop(interview_id, None)
+        if prefetch and prefetch.task and not prefetch.task.done():
+            prefetch.task.cancel()
+            logger.info(f"Cancelled question audio prefetch for {interview_id}")
+
+    def readiness(self, interview_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Per-question audio state, or None if the interview is not tracked"""
+        prefetch = self._interviews.get(interview_id)
+        if prefetch is None:
+            return None
+        return [
+            {"question_index": index, "state": state, "audio_path": prefetch.paths[index]}
+            for index, state in enumerate(prefetch.states)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts of tracked interviews and question states"""
+        counts = {PENDING: 0, SYNTHESIZING: 0, READY: 0, FAILED: 0}
+        for prefetch in self._interviews.values():
+            for state in prefetch.states:
+                counts[state] += 1
+        return {"interviews": len(self._interviews), "questions": counts}
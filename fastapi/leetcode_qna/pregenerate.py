@@ -0,0 +1,241 @@
+"""Pre-generate interview questions and their audio for a catalog of problems
+
+Reads a JSONL catalog (one ``problem_data`` object per line) and writes a bundle
+the service loads at startup when LEETCODE_QUESTION_BUNDLE points at it:
+
+    <output>/index.json        question sets and audio references per bank key
+    <output>/audio/<key>.wav   question audio, named by TTS cache key
+    <output>/checkpoint.jsonl  completed keys; a rerun resumes after the last one
+
+Run from the fastapi directory:
+
+    python -m leetcode_qna.pregenerate catalog.jsonl --output bundles/leetcode \\
+        --languages Python Java --sets 3 --concurrency 4 --requests-per-minute 60
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+from .question_bank import question_bank_key, validate_question_set
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+
+
+class RateLimiter:
+    """Spaces out calls to at most ``per_minute`` per minute"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def read_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Completed entries by key; a torn last line from an interrupted run is ignored"""
+    entries: Dict[str, Dict[str, Any]] = {}
+    if not path.exists():
+        return entries
+    with open(path) as checkpoint:
+        for line in checkpoint:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["key"]] = entry
+    return entries
+
+
+class BundleBuilder:
+    """Generates question sets and audio for catalog entries, checkpointing each key"""
+
+    def __init__(self, agent, output_dir: Path, sets_per_key: int, concurrency: int,
+                 requests_per_minute: float, with_audio: bool = True):
+        self.agent = agent
+        self.output_dir = output_dir
+        self.audio_dir = output_dir / "audio"
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_path = output_dir / "checkpoint.jsonl"
+        self.sets_per_key = sets_per_key
+        self.with_audio = with_audio
+        self.limiter = RateLimiter(requests_per_minute)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._checkpoint_lock = asyncio.Lock()
+        self.stats = {"completed": 0, "skipped": 0, "failed": 0, "llm_calls": 0, "audio_files": 0}
+
+    async def _question_audio(self, question: str) -> str:
+        from .agent import TTS_EXAGGERATION, TTS_CFG_WEIGHT
+
+        cache_key = self.agent.tts_cache.key(question, TTS_EXAGGERATION, TTS_CFG_WEIGHT)
+        path = self.audio_dir / f"{cache_key}.wav"
+        if not path.exists():
+            await self.agent.tts_worker.synthesize(
+                question, str(path), exaggeration=TTS_EXAGGERATION, cfg_weight=TTS_CFG_WEIGHT
+            )
+            self.stats["audio_files"] += 1
+        return f"audio/{path.name}"
+
+    async def build_entry(self, problem_data: Dict[str, Any], language: str) -> Optional[Dict[str, Any]]:
+        key = question_bank_key(problem_data, language)
+        sets: List[Dict[str, Any]] = []
+        attempts = 0
+        while len(sets) < self.sets_per_key and attempts < self.sets_per_key * 2:
+            attempts += 1
+            await self.limiter.acquire()
+            self.stats["llm_calls"] += 1
+            questions = validate_question_set(await self.agent.request_question_set(problem_data, language))
+            if questions is None or any(entry["questions"] == questions for entry in sets):
+                continue
+            audio = [await self._question_audio(question) for question in questions] if self.with_audio else []
+            sets.append({"questions": questions, "audio": audio})
+
+        if not sets:
+            return None
+        return {"key": key, "title": problem_data.get("title", ""), "language": language, "sets": sets}
+
+    async def _run_one(self, problem_data: Dict[str, Any], language: str) -> None:
+        async with self._slots:
+            title = problem_data.get("title", "")
+            try:
+                entry = await self.build_entry(problem_data, language)
+            except Exception as e:
+                logger.error(f"Failed to pre-generate {title} ({language}): {str(e)}")
+                entry = None
+            if entry is None:
+                self.stats["failed"] += 1
+                return
+
+            async with self._checkpoint_lock:
+                with open(self.checkpoint_path, "a") as checkpoint:
+                    checkpoint.write(json.dumps(entry) + "\n")
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+            self.stats["completed"] += 1
+            logger.info(f"Pre-generated {len(entry['sets'])} question sets for {title} ({language})")
+
+    async def run(self, catalog: List[Dict[str, Any]], languages: List[str]) -> None:
+        done: Set[str] = set(read_checkpoint(self.checkpoint_path))
+        jobs = []
+        for problem_data in catalog:
+            for language in languages:
+                if question_bank_key(problem_data, language) in done:
+                    self.stats["skipped"] += 1
+                    continue
+                jobs.append(self._run_one(problem_data, language))
+
+        logger.info(f"Pre-generating {len(jobs)} entries ({self.stats['skipped']} already in the checkpoint)")
+        await asyncio.gather(*jobs)
+        self.write_index()
+
+    def write_index(self) -> None:
+        """Write index.json from the checkpoint"""
+        from .tts_cache import TTS_MODEL_VERSION
+
+        index = {
+            "version": BUNDLE_VERSION,
+            "tts_model_version": TTS_MODEL_VERSION,
+            "created_at": time.time(),
+            "entries": {
+                key: {"title": entry["title"], "language": entry["language"], "sets": entry["sets"]}
+                for key, entry in read_checkpoint(self.checkpoint_path).items()
+            }
+        }
+        partial = self.output_dir / "index.json.tmp"
+        partial.write_text(json.dumps(index, separators=(",", ":")))
+        os.replace(partial, self.output_dir / "index.json")
+        logger.info(f"Wrote bundle index with {len(index['entries'])} entries to {self.output_dir}")
+
+
+def load_question_bundle(bundle_dir: Path, question_bank, tts_cache, exaggeration: float, cfg_weight: float) -> Dict[str, int]:
+    """Load a pre-generated bundle into the question bank and TTS cache"""
+    index = json.loads((bundle_dir / "index.json").read_text())
+    import_audio = index.get("tts_model_version") == tts_cache.model_version
+    if not import_audio:
+        logger.warning(f"Bundle audio was made with TTS model {index.get('tts_model_version')}; skipping audio import")
+
+    loaded = {"sets": 0, "audio": 0}
+    for key, entry in index["entries"].items():
+        for question_set in entry["sets"]:
+            if question_bank.add_set(key, question_set["questions"]):
+                loaded["sets"] += 1
+            if not import_audio:
+                continue
+            for question, audio in zip(question_set["questions"], question_set["audio"]):
+                cache_key = tts_cache.key(question, exaggeration, cfg_weight)
+                audio_path = bundle_dir / audio
+                if tts_cache.lookup(cache_key) is None and audio_path.exists():
+                    tts_cache.store(cache_key, audio_path)
+                    loaded["audio"] += 1
+
+    logger.info(f"Loaded question bundle {bundle_dir}: {loaded['sets']} question sets, {loaded['audio']} audio files")
+    return loaded
+
+
+def read_catalog(path: Path) -> List[Dict[str, Any]]:
+    catalog = []
+    with open(path) as catalog_file:
+        for line_number, line in enumerate(catalog_file, 1):
+            if not line.strip():
+                continue
+            try:
+                catalog.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping catalog line {line_number}: {str(e)}")
+    return catalog
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from .agent import LeetCodeVoiceAgent
+
+    # Without audio only the LLM is needed, so skip loading the TTS model
+    agent = LeetCodeVoiceAgent(load_tts=not args.no_audio)
+    builder = BundleBuilder(
+        agent,
+        Path(args.output),
+        sets_per_key=args.sets,
+        concurrency=args.concurrency,
+        requests_per_minute=args.requests_per_minute,
+        with_audio=not args.no_audio
+    )
+    started = time.monotonic()
+    await builder.run(read_catalog(Path(args.catalog)), args.languages)
+    logger.info(f"Finished in {time.monotonic() - started:.1f}s: {builder.stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate LeetCode interview questions and audio")
+    parser.add_argument("catalog", help="JSONL file with one problem_data object per line")
+    parser.add_argument("--output", default="bundles/leetcode", help="Bundle directory")
+    parser.add_argument("--languages", nargs="+", default=["Python"])
+    parser.add_argument("--sets", type=int, default=3, help="Question sets per problem and language")
+    parser.add_argument("--concurrency", type=int, default=4, help="Problems processed at once")
+    parser.add_argument("--requests-per-minute", type=float, default=60, help="LLM request rate limit")
+    parser.add_argument("--no-audio", action="store_true", help="Only generate questions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; rerun the same command to resume from the checkpoint")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
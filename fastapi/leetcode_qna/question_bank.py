@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MIN_QUESTIONS = 4
+MAX_QUESTIONS = 12
+
+
+def question_bank_key(problem_data: Dict[str, Any], language: str) -> str:
+    """Bank key: problem slug (or a hash of its title and content), difficulty and language"""
+    problem = problem_data.get("titleSlug") or problem_data.get("slug")
+    if not problem:
+        material = f"{problem_data.get('title', '')}\n{problem_data.get('content', '')}"
+        problem = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+    difficulty = str(problem_data.get("difficulty", "Medium")).lower()
+    return f"{problem}|{difficulty}|{language.lower()}"
+
+
+def validate_question_set(questions: Any) -> Optional[List[str]]:
+    """Return a cleaned question list, or None if it is not usable"""
+    if not isinstance(questions, list):
+        return None
+    cleaned: List[str] = []
+    for question in questions:
+        if not isinstance(question, str):
+            return None
+        question = " ".join(question.split())
+        if not 10 <= len(question) <= 400:
+            return None
+        if question not in cleaned:
+            cleaned.append(question)
+    if not MIN_QUESTIONS <= len(cleaned) <= MAX_QUESTIONS:
+        return None
+    return cleaned
+
+
+class QuestionBank:
+    """Shares generated interview question sets across users
+
+    Each key holds up to ``sets_per_key`` validated sets. ``get_questions``
+    picks one at random; a set is retired after ``max_uses`` interviews (the
+    last set of a key is kept) and the key is refilled in the background, so
+    only the first interview on a problem waits for the LLM. With ``path`` set
+    the bank is kept on disk and survives restarts.
+    """
+
+    def __init__(self, request_set: Callable[[Dict[str, Any], str], Awaitable[Optional[List[str]]]],
+                 path: Optional[Path] = None, sets_per_key: int = 5, max_uses: int = 20,
+                 max_concurrent_refills: int = 2):
+        self.request_set = request_set
+        self.path = path
+        self.sets_per_key = sets_per_key
+        self.max_uses = max_uses
+        self._sets: Dict[str, List[Dict[str, Any]]] = {}
+        self._cold: Dict[str, asyncio.Future] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._refill_slots = asyncio.Semaphore(max_concurrent_refills)
+        self.stats = {"hits": 0, "misses": 0, "generated": 0, "rejected": 0}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            self._sets = json.loads(self.path.read_text())
+            logger.info(f"Loaded {sum(len(sets) for sets in self._sets.values())} question sets from {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to load question bank {self.path}: {str(e)}")
+
+    async def _persist(self) -> None:
+        if not self.path:
+            return
+        data = json.dumps(self._sets)
+
+        def write() -> None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f"{self.path.name}.tmp")
+            partial.write_text(data)
+            os.replace(partial, self.path)
+
+        try:
+            await asyncio.to_thread(write)
+        except Exception as e:
+            logger.error(f"Failed to save question bank: {str(e)}")
+
+    def add_set(self, key: str, questions: List[str]) -> bool:
+        """Store a validated set under ``key``; returns False if it was rejected"""
+        questions = validate_question_set(questions)
+        if questions is None:
+            self.stats["rejected"] += 1
+            return False
+        sets = self._sets.setdefault(key, [])
+        if any(entry["questions"] == questions for entry in sets):
+            return False
+        sets.append({"questions": questions, "uses": 0, "created_at": time.time()})
+        return True
+
+    async def _generate(self, problem_data: Dict[str, Any], language: str, key: str) -> Optional[List[str]]:
+        questions = validate_question_set(await self.request_set(problem_data, language))
+        if questions is None:
+            self.stats["rejected"] += 1
+            return None
+        self.stats["generated"] += 1
+        if self.add_set(key, questions):
+            await self._persist()
+        return questions
+
+    async def get_questions(self, problem_data: Dict[str, Any], language: str) -> Optional[List[str]]:
+        """A question set for the problem, or None if none could be generated"""
+        key = question_bank_key(problem_data, language)
+        sets = self._sets.get(key)
+
+        if sets:
+            self.stats["hits"] += 1
+            entry = random.choice(sets)
+            entry["uses"] += 1
+            if entry["uses"] >= self.max_uses and len(sets) > 1:
+                sets.remove(entry)
+            self._schedule_refill(key, problem_data, language)
+            return list(entry["questions"])
+
+        self.stats["misses"] += 1
+        if key in self._cold:
+            # Another interview on this problem is already waiting for the LLM
+            questions = await asyncio.shield(self._cold[key])
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._cold[key] = future
+            try:
+                questions = await self._generate(problem_data, language, key)
+            except Exception as e:
+                logger.error(f"Error generating question set for {key}: {str(e)}")
+                questions = None
+            finally:
+                del self._cold[key]
+                future.set_result(questions if questions is None else list(questions))
+
+        if questions is not None:
+            self._schedule_refill(key, problem_data, language)
+        return questions
+
+    def _schedule_refill(self, key: str, problem_data: Dict[str, Any], language: str) -> None:
+        if len(self._sets.get(key, [])) >= self.sets_per_key:
+            return
+        if key in self._refills and not self._refills[key].done():
+            return
+        self._refills[key] = asyncio.create_task(self._refill(key, problem_data, language))
+
+    async def _refill(self, key: str, problem_data: Dict[str, Any], language: str) -> None:
+        async with self._refill_slots:
+            attempts = 0
+            while len(self._sets.get(key, [])) < self.sets_per_key and attempts < self.sets_per_key * 2:
+                attempts += 1
+                try:
+                    await self._generate(problem_data, language, key)
+                except Exception as e:
+                    logger.warning(f"Question bank refill failed for {key}: {str(e)}")
+        logger.info(f"Question bank has {len(self._sets.get(key, []))} sets for {key}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bank size and hit counters"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "keys": len(self._sets),
+            "sets": sum(len(sets) for sets in self._sets.values()),
+            "refills_running": sum(1 for task in self._refills.values() if not task.done())
+        }
+
+
+def create_question_bank(request_set: Callable[[Dict[str, Any], str], Awaitable[Optional[List[str]]]]) -> QuestionBank:
+    """Build the question bank from environment settings"""
+    path = os.getenv("LEETCODE_QUESTION_BANK_PATH")
+    return QuestionBank(
+        request_set,
+        path=Path(path) if path else None,
+        sets_per_key=int(os.getenv("LEETCODE_QUESTION_SETS_PER_KEY", "5")),
+        max_uses=int(os.getenv("LEETCODE_QUESTION_SET_MAX_USES", "20")),
+        max_concurrent_refills=int(os.getenv("LEETCODE_QUESTION_REFILL_CONCURRENCY", "2"))
+    )
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+from common.stream_runs import StreamRun
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long finished report jobs can still be polled or streamed (seconds)
+REPORT_RETENTION_SECONDS = float(os.getenv("LEETCODE_REPORT_RETENTION_SECONDS", "3600"))
+
+
+class JSONSectionScanner:
+    """Extracts top-level members of a JSON object while it is still being streamed
+
+    ``feed`` takes the next chunk of model output and returns the
+    ``(key, value)`` pairs whose values became complete. Text before the
+    opening brace (such as a Markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._position = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._value_start: Optional[int] = None
+        self._key_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        sections: List[Tuple[str, Any]] = []
+        while self._position < len(self.text):
+            char = self.text[self._position]
+            index = self._position
+            self._position += 1
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._key_start = self._position
+                continue
+            if self._depth == 0:
+                # The object is complete; ignore trailing text
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    section = self._close_member(index)
+                    if section:
+                        sections.append(section)
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = self._position
+            elif char == "," and self._depth == 1:
+                section = self._close_member(index)
+                if section:
+                    sections.append(section)
+                self._key_start = self._position
+        return sections
+
+    def _close_member(self, end: int) -> Optional[Tuple[str, Any]]:
+        if self._value_start is None:
+            return None
+        key_text = self.text[self._key_start:self._value_start - 1]
+        value_text = self.text[self._value_start:end]
+        self._value_start = None
+        try:
+            return json.loads(key_text), json.loads(value_text)
+        except json.JSONDecodeError:
+            return None
+
+
+class ReportJob:
+    """A performance report being generated in the background"""
+
+    def __init__(self, interview_id: str):
+        self.report_id = f"report_{uuid.uuid4().hex}"
+        self.interview_id = interview_id
+        self.status = "pending"
+        self.sections: Dict[str, Any] = {}
+        self.report: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.completed_at: Optional[float] = None
+        # Section events, replayable with Last-Event-ID
+        self.run = StreamRun(self.report_id)
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "report_id": self.report_id,
+            "interview_id": self.interview_id,
+            "status": self.status,
+            "sections": self.sections,
+            "performance_report": self.report,
+            "error": self.error
+        }
+
+
+class ReportJobManager:
+    """Runs report generation jobs and keeps their results for polling and streaming"""
+
+    def __init__(self, retention_seconds: float = REPORT_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self.jobs: Dict[str, ReportJob] = {}
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            report_id for report_id, job in self.jobs.items()
+            if job.completed_at and now - job.completed_at > self.retention_seconds
+        ]
+        for report_id in expired:
+            del self.jobs[report_id]
+
+    def start(self, interview_id: str,
+              generate: Callable[[Callable[[str, Any], Awaitable[None]]], Awaitable[Dict[str, Any]]]) -> ReportJob:
+        """Start ``generate(on_section)`` in the background and return its job"""
+        self._purge_expired()
+        job = ReportJob(interview_id)
+        self.jobs[job.report_id] = job
+
+        async def on_section(key: str, value: Any) -> None:
+            job.sections[key] = value
+            await job.run.publish({"type": "section", "key": key, "value": value})
+
+        async def run() -> None:
+            job.status = "running"
+            try:
+                job.report = await generate(on_section)
+                job.status = "completed"
+                await job.run.publish({"type": "complete", "performance_report": job.report})
+            except Exception as e:
+                logger.error(f"Report job {job.report_id} failed: {str(e)}")
+                job.status = "failed"
+                job.error = str(e)
+                await job.run.publish({"type": "error", "error": str(e)})
+            finally:
+                job.completed_at = time.time()
+                await job.run.finish()
+
+        job.task = asyncio.create_task(run())
+        logger.info(f"Started report job {job.report_id} for {interview_id}")
+        return job
+
+    def get(self, report_id: str) -> Optional[ReportJob]:
+        self._purge_expired()
+        return self.jobs.get(report_id)
+
+    def active_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status in ("pending", "running"))
@@ -1,28 +1,59 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Request, WebSocket, WebSocketDisconnect, Header
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
 import logging
+import asyncio
 import json
 import os
 from pathlib import Path
 
-from .agent import LeetCodeVoiceAgent
+from common.services import services, SERVICE_WARMUP, FAILED
+from common.stream_runs import parse_last_event_id, run_event_response
+
+from .audio_ingest import SpeechIngestSession
+from .audio_delivery import AUDIO_FORMATS, IMMUTABLE_CACHE_CONTROL, audio_url, negotiate_formats, ranged_file_response
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Largest audio upload accepted by /speech-to-text
+MAX_STT_UPLOAD_BYTES = int(os.getenv("LEETCODE_STT_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
 # Create router
 router = APIRouter(prefix="/leetcode-qna", tags=["LeetCode Voice Interview"])
 
-# Initialize the agent
-try:
+def _create_voice_agent():
+    # Imported here so loading the app does not load the TTS model
+    from .agent import LeetCodeVoiceAgent
     voice_agent = LeetCodeVoiceAgent()
     logger.info("LeetCode Voice Agent initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize LeetCode Voice Agent: {str(e)}")
-    voice_agent = None
+    return voice_agent
+
+
+# The agent is built by the service registry on first use or during warmup
+services.register("leetcode_qna", _create_voice_agent)
+
+
+async def _get_voice_agent():
+    """The voice agent, waiting for its initialization; None if that failed"""
+    try:
+        return await services.aget("leetcode_qna")
+    except Exception:
+        return None
+
+
+async def _prewarm_when_ready():
+    voice_agent = await _get_voice_agent()
+    if voice_agent:
+        await voice_agent.prewarm_tts_cache()
+
+@router.on_event("startup")
+async def prewarm_tts_cache():
+    """Fill the TTS cache with the fixed interview phrases once the agent is ready"""
+    if SERVICE_WARMUP != "lazy":
+        asyncio.create_task(_prewarm_when_ready())
 
 # Request/Response Models
 class StartInterviewRequest(BaseModel):
@@ -44,16 +75,28 @@ class InterviewResponse(BaseModel):
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
+    voice_agent = services.peek("leetcode_qna")
     return {
-        "status": "healthy" if voice_agent else "unhealthy",
+        "status": "healthy" if services.state("leetcode_qna") != FAILED else "unhealthy",
         "service": "leetcode-voice-interview",
+        "state": services.state("leetcode_qna"),
         "tts_available": voice_agent is not None,
+        "active_sessions": voice_agent.sessions.active_count() if voice_agent else 0,
+        "tts_worker": voice_agent.tts_worker.get_stats() if voice_agent else None,
+        "tts_cache": voice_agent.tts_cache.get_stats() if voice_agent else None,
+        "audio_encoder": voice_agent.audio_encoder.get_stats() if voice_agent else None,
+        "question_bank": voice_agent.question_bank.get_stats() if voice_agent else None,
+        "active_report_jobs": voice_agent.report_jobs.active_count() if voice_agent else 0,
+        "question_prefetch": voice_agent.question_prefetcher.get_stats() if voice_agent else None,
+        "feedback_speculation": voice_agent.feedback_speculator.get_stats() if voice_agent else None,
+        "audio_artifacts": voice_agent.artifacts.get_stats() if voice_agent else None,
         "audio_directory": str(voice_agent.audio_dir) if voice_agent else None
     }
 
 @router.post("/start-interview", response_model=InterviewResponse)
 async def start_interview(request: StartInterviewRequest):
     """Start a new LeetCode voice interview session"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -94,6 +137,7 @@ async def start_interview(request: StartInterviewRequest):
 @router.post("/respond", response_model=InterviewResponse)
 async def process_user_response(request: UserResponseRequest):
     """Process user response and get next question or feedback"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -132,8 +176,14 @@ async def process_user_response(request: UserResponseRequest):
         )
 
 @router.post("/end-interview/{interview_id}", response_model=InterviewResponse)
-async def end_interview(interview_id: str):
-    """End the interview and generate performance report"""
+async def end_interview(interview_id: str, wait_for_report: bool = False):
+    """End the interview and generate performance report
+    
+    Returns right away with a ``report_id``; fetch the report from
+    ``/reports/{report_id}`` or stream it from ``/reports/{report_id}/stream``.
+    Pass ``wait_for_report=true`` to get the report in this response instead.
+    """
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -144,7 +194,7 @@ async def end_interview(interview_id: str):
         
         logger.info(f"Ending interview {interview_id}")
         
-        result = await voice_agent.end_interview(interview_id)
+        result = await voice_agent.end_interview(interview_id, wait_for_report=wait_for_report)
         
         if result["success"]:
             return InterviewResponse(
@@ -167,9 +217,52 @@ async def end_interview(interview_id: str):
             detail=f"Failed to end interview: {str(e)}"
         )
 
+@router.get("/reports/{report_id}")
+async def get_report(report_id: str):
+    """Poll a performance report; ``sections`` fill in while it is generated"""
+    voice_agent = await _get_voice_agent()
+    
+    if not voice_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="Voice agent not initialized"
+        )
+    
+    result = voice_agent.get_report(report_id)
+    if not result["success"]:
+        raise HTTPException(
+            status_code=404,
+            detail=result.get("error", "Report not found")
+        )
+    return JSONResponse(content=result)
+
+@router.get("/reports/{report_id}/stream")
+async def stream_report(
+    report_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Stream report sections as Server-Sent Events, ending with a ``complete`` event"""
+    voice_agent = await _get_voice_agent()
+    
+    if not voice_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="Voice agent not initialized"
+        )
+    
+    job = voice_agent.report_jobs.get(report_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail="Report not found"
+        )
+    return run_event_response(job.run, parse_last_event_id(last_event_id_header, last_event_id))
+
 @router.get("/interview-status/{interview_id}")
 async def get_interview_status(interview_id: str):
     """Get current interview status"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -178,7 +271,7 @@ async def get_interview_status(interview_id: str):
                 detail="Voice agent not initialized"
             )
         
-        result = voice_agent.get_interview_status(interview_id)
+        result = await voice_agent.get_interview_status(interview_id)
         
         if result["success"]:
             return JSONResponse(content=result)
@@ -197,9 +290,41 @@ async def get_interview_status(interview_id: str):
             detail=f"Failed to get interview status: {str(e)}"
         )
 
+@router.get("/question-audio/{interview_id}")
+async def get_question_audio_status(interview_id: str):
+    """Readiness of each question's pre-synthesized audio"""
+    voice_agent = await _get_voice_agent()
+    
+    try:
+        if not voice_agent:
+            raise HTTPException(
+                status_code=500,
+                detail="Voice agent not initialized"
+            )
+        
+        result = await voice_agent.get_question_audio_status(interview_id)
+        
+        if result["success"]:
+            return JSONResponse(content=result)
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=result.get("error", "Interview not found")
+            )
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting question audio status: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get question audio status: {str(e)}"
+        )
+
 @router.post("/speech-to-text")
 async def speech_to_text_endpoint(audio_file: UploadFile = File(...)):
     """Convert uploaded audio file to text"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -208,24 +333,26 @@ async def speech_to_text_endpoint(audio_file: UploadFile = File(...)):
                 detail="Voice agent not initialized"
             )
         
-        # Save uploaded file temporarily
-        temp_path = voice_agent.audio_dir / f"temp_{audio_file.filename}"
-        
-        with open(temp_path, "wb") as buffer:
-            content = await audio_file.read()
-            buffer.write(content)
+        # The upload is already spooled by the form parser; read it once, straight
+        # into memory, and stop one byte past the cap
+        too_large = audio_file.size is not None and audio_file.size > MAX_STT_UPLOAD_BYTES
+        content = b"" if too_large else await audio_file.read(MAX_STT_UPLOAD_BYTES + 1)
+        if too_large or len(content) > MAX_STT_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Audio upload exceeds {MAX_STT_UPLOAD_BYTES} bytes"
+            )
         
         # Convert to text
-        text = await voice_agent.speech_to_text(str(temp_path))
-        
-        # Clean up temp file
-        temp_path.unlink(missing_ok=True)
+        text = await voice_agent.speech_to_text_from_bytes(content)
         
         return JSONResponse(content={
             "success": True,
             "text": text
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in speech-to-text: {str(e)}")
         raise HTTPException(
@@ -233,9 +360,80 @@ async def speech_to_text_endpoint(audio_file: UploadFile = File(...)):
             detail=f"Failed to convert speech to text: {str(e)}"
         )
 
+@router.websocket("/ws/speech")
+async def speech_websocket(websocket: WebSocket, encoding: str = "pcm16", sample_rate: int = 16000,
+                           interview_id: Optional[str] = None):
+    """Stream microphone audio and receive transcripts as each utterance ends
+    
+    Binary messages carry audio: 16-bit little-endian mono PCM at
+    ``sample_rate`` (``encoding=pcm16``) or a WebM/Ogg Opus stream
+    (``encoding=opus``). Send ``{"type": "end"}`` to flush the last segment and
+    get a ``final`` event with the full transcript. The server reports
+    ``speech_start``, ``segment_end`` and ``transcript`` events as it goes, plus
+    ``partial`` transcripts when the STT backend supports them.
+    
+    With ``interview_id`` the live transcript is also used to start feedback
+    for the current question early; submit the ``final`` text to ``/respond``
+    as usual.
+    """
+    await websocket.accept()
+    
+    voice_agent = await _get_voice_agent()
+    if not voice_agent:
+        await websocket.send_json({"type": "error", "error": "Voice agent not initialized"})
+        await websocket.close(code=1011)
+        return
+    if encoding not in ("pcm16", "opus"):
+        await websocket.send_json({"type": "error", "error": f"Unsupported encoding: {encoding}"})
+        await websocket.close(code=1003)
+        return
+    
+    send_lock = asyncio.Lock()
+    
+    async def send(event: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_json(event)
+    
+    session = SpeechIngestSession(
+        voice_agent.transcribe_pcm,
+        send,
+        sample_rate=sample_rate,
+        encoding=encoding,
+        open_stream=voice_agent.stt.open_stream,
+        on_text=(
+            lambda text, final: voice_agent.update_answer_transcript(interview_id, text, final=final)
+        ) if interview_id else None
+    )
+    try:
+        await session.start()
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await session.push_audio(message["bytes"])
+            elif message.get("text"):
+                control = json.loads(message["text"])
+                if control.get("type") == "end":
+                    await session.finish()
+                    await websocket.close()
+                    break
+    except WebSocketDisconnect:
+        logger.info("Speech WebSocket disconnected")
+    except Exception as e:
+        logger.error(f"Error in speech WebSocket: {str(e)}")
+        try:
+            await send({"type": "error", "error": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        session.close()
+
 @router.post("/text-to-speech")
 async def text_to_speech_endpoint(request: Dict[str, str]):
     """Convert text to speech and return audio file path"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -251,11 +449,12 @@ async def text_to_speech_endpoint(request: Dict[str, str]):
                 detail="Text is required"
             )
         
-        audio_path = await voice_agent.text_to_speech(text)
+        # Optionally tie the file to an interview so it is cleaned up with it
+        audio_path = await voice_agent.text_to_speech(text, interview_id=request.get("interview_id"))
         
         return JSONResponse(content={
             "success": True,
-            "audio_path": f"/media/leetcode_audio/{Path(audio_path).name}"
+            "audio_path": audio_url(audio_path)
         })
         
     except Exception as e:
@@ -265,9 +464,75 @@ async def text_to_speech_endpoint(request: Dict[str, str]):
             detail=f"Failed to convert text to speech: {str(e)}"
         )
 
+@router.post("/text-to-speech/stream")
+async def stream_text_to_speech_endpoint(request: Dict[str, str]):
+    """Stream synthesized speech sentence by sentence as a chunked WAV response"""
+    voice_agent = await _get_voice_agent()
+    
+    if not voice_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="Voice agent not initialized"
+        )
+    
+    text = request.get("text", "")
+    if not text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Text is required"
+        )
+    
+    audio_path, chunks = voice_agent.stream_text_to_speech(text, interview_id=request.get("interview_id"))
+    
+    # The complete file is available at X-Audio-Path once the stream ends
+    return StreamingResponse(
+        chunks,
+        media_type="audio/wav",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Audio-Path": audio_url(audio_path),
+            "Access-Control-Expose-Headers": "X-Audio-Path"
+        }
+    )
+
+@router.get("/tts-cache/stats")
+async def get_tts_cache_stats():
+    """Hit rate and size of the synthesized-audio cache"""
+    voice_agent = await _get_voice_agent()
+    
+    if not voice_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="Voice agent not initialized"
+        )
+    
+    return JSONResponse(content=voice_agent.tts_cache.get_stats())
+
+@router.get("/latency")
+async def get_latency_stats(recent: int = 10):
+    """Rolling p50/p95/p99 latency per turn stage, plus the most recent turn traces"""
+    voice_agent = await _get_voice_agent()
+    
+    if not voice_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="Voice agent not initialized"
+        )
+    
+    return JSONResponse(content={
+        **voice_agent.latency.snapshot(recent=recent),
+        "feedback_speculation": voice_agent.feedback_speculator.get_stats()
+    })
+
 @router.get("/audio/{filename}")
-async def get_audio_file(filename: str):
-    """Serve audio files"""
+async def get_audio_file(filename: str, request: Request, format: Optional[str] = None):
+    """Serve audio files
+    
+    Files are requested by their WAV name. The format (Opus, MP3 or WAV) is
+    chosen from ``?format=`` or the Accept header, and ranges are supported.
+    """
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -276,18 +541,48 @@ async def get_audio_file(filename: str):
                 detail="Voice agent not initialized"
             )
         
-        audio_path = voice_agent.audio_dir / filename
-        
-        if not audio_path.exists():
+        name = Path(filename).name
+        requested = format
+        # A request for an encoded file by its own name gets exactly that file
+        for fmt, spec in AUDIO_FORMATS.items():
+            if not requested and fmt != "wav" and name.endswith(spec["extension"]):
+                requested = fmt
+        if requested and requested not in AUDIO_FORMATS:
             raise HTTPException(
-                status_code=404,
-                detail="Audio file not found"
+                status_code=400,
+                detail=f"Unsupported audio format: {requested}"
+            )
+        
+        stem = Path(name).stem
+        wav_path = voice_agent.audio_dir / f"{stem}.wav"
+        formats = negotiate_formats(
+            voice_agent.audio_encoder.formats,
+            request.headers.get("accept"),
+            requested
+        )
+        
+        for position, fmt in enumerate(formats):
+            audio_path = voice_agent.audio_dir / f"{stem}{AUDIO_FORMATS[fmt]['extension']}"
+            if not audio_path.exists():
+                continue
+            
+            # Only the client's first choice is final; a fallback served while
+            # encoding is still running must not be cached
+            final = position == 0 and not (fmt == "wav" and voice_agent.audio_encoder.is_pending(wav_path))
+            return ranged_file_response(
+                audio_path,
+                AUDIO_FORMATS[fmt]["media_type"],
+                request.headers.get("range"),
+                headers={
+                    "Cache-Control": IMMUTABLE_CACHE_CONTROL if final else "no-cache",
+                    "Vary": "Accept",
+                    "Content-Disposition": f'inline; filename="{audio_path.name}"'
+                }
             )
         
-        return FileResponse(
-            path=str(audio_path),
-            media_type="audio/wav",
-            filename=filename
+        raise HTTPException(
+            status_code=404,
+            detail="Audio file not found"
         )
         
     except HTTPException:
@@ -302,6 +597,7 @@ async def get_audio_file(filename: str):
 @router.post("/listen-microphone")
 async def listen_from_microphone():
     """Listen to microphone input and return transcribed text"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -327,6 +623,7 @@ async def listen_from_microphone():
 @router.delete("/cleanup-audio/{interview_id}")
 async def cleanup_interview_audio(interview_id: str):
     """Clean up audio files for a completed interview"""
+    voice_agent = await _get_voice_agent()
     
     try:
         if not voice_agent:
@@ -335,16 +632,8 @@ async def cleanup_interview_audio(interview_id: str):
                 detail="Voice agent not initialized"
             )
         
-        # Find and delete audio files related to this interview
-        audio_files = list(voice_agent.audio_dir.glob(f"*{interview_id}*"))
-        deleted_count = 0
-        
-        for file_path in audio_files:
-            try:
-                file_path.unlink()
-                deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {file_path}: {str(e)}")
+        # Delete the audio files recorded for this interview
+        deleted_count = await voice_agent.artifacts.delete_session(interview_id)
         
         return JSONResponse(content={
             "success": True,
@@ -357,4 +646,34 @@ async def cleanup_interview_audio(interview_id: str):
         raise HTTPException(
             status_code=500,
             detail=f"Failed to clean up audio files: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/cleanup-audio")
+async def purge_ended_interview_audio(older_than_seconds: float = 0):
+    """Delete the audio files of every interview that ended at least ``older_than_seconds`` ago"""
+    voice_agent = await _get_voice_agent()
+    
+    try:
+        if not voice_agent:
+            raise HTTPException(
+                status_code=500,
+                detail="Voice agent not initialized"
+            )
+        
+        purged = await voice_agent.artifacts.purge_ended(older_than_seconds)
+        
+        return JSONResponse(content={
+            "success": True,
+            "purged_sessions": purged["sessions"],
+            "deleted_files": purged["files"],
+            "message": f"Cleaned up {purged['files']} audio files from {purged['sessions']} interviews"
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error purging audio files: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to purge audio files: {str(e)}"
+        )
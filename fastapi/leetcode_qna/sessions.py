@@ -0,0 +1,333 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Callable, Collection, Tuple, AsyncIterator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class SessionConflictError(Exception):
+    """A session was changed or removed by another process since it was loaded"""
+
+
+class SessionBackend(ABC):
+    """Persistent storage for interview sessions
+
+    Implementations are called from worker threads, never from the event loop.
+    A backend shared by several processes should raise ``SessionConflictError``
+    from ``save`` instead of overwriting a newer copy.
+    """
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def save(self, session: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def touch(self, session_id: str) -> None:
+        """Mark a session as in use without rewriting it"""
+
+    def purge_older_than(self, timestamp: float, keep: Collection[str] = ()) -> List[str]:
+        """Delete sessions not updated since ``timestamp``, except ``keep``; returns their IDs"""
+        return []
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Stores each session as a JSON document in a SQLite table
+
+    Every row carries a version, handed out as ``session["version"]`` by
+    ``load``. ``save`` only overwrites the version it was given and bumps it,
+    so of two processes saving the same loaded copy the second one gets a
+    ``SessionConflictError`` instead of silently undoing the first.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS interview_sessions (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(interview_sessions)")]
+            if "version" not in columns:
+                # Databases created before sessions were versioned
+                self._conn.execute("ALTER TABLE interview_sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+        logger.info(f"SQLite session backend ready at {db_path}")
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, version FROM interview_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if not row:
+            return None
+        session = json.loads(row[0])
+        session["version"] = row[1]
+        return session
+
+    def save(self, session: Dict[str, Any]) -> None:
+        with self._lock:
+            # Read under the lock so back-to-back saves of one copy see each other's version
+            version = session.get("version")
+            data = json.dumps(session)
+            if version is None:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO interview_sessions (id, data, updated_at, version) VALUES (?, ?, ?, 1)",
+                    (session["id"], data, time.time())
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE interview_sessions SET data = ?, updated_at = ?, version = version + 1 "
+                    "WHERE id = ? AND version = ?",
+                    (data, time.time(), session["id"], version)
+                )
+            self._conn.commit()
+            if cursor.rowcount == 0:
+                raise SessionConflictError(f"Session {session['id']} was changed or removed by another process")
+            session["version"] = 1 if version is None else version + 1
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM interview_sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+    def touch(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE interview_sessions SET updated_at = ? WHERE id = ?", (time.time(), session_id)
+            )
+            self._conn.commit()
+
+    def purge_older_than(self, timestamp: float, keep: Collection[str] = ()) -> List[str]:
+        keep = set(keep)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM interview_sessions WHERE updated_at < ?", (timestamp,)
+            ).fetchall()
+            purged = [row[0] for row in rows if row[0] not in keep]
+            self._conn.executemany("DELETE FROM interview_sessions WHERE id = ?", [(session_id,) for session_id in purged])
+            self._conn.commit()
+        return purged
+
+
+class _SessionEntry:
+    __slots__ = ("session", "lock", "last_access")
+
+    def __init__(self, session: Dict[str, Any]):
+        self.session = session
+        self.lock = asyncio.Lock()
+        self.last_access = time.monotonic()
+
+
+class InterviewSessionManager:
+    """Holds many concurrent interview sessions
+
+    Sessions live in a sharded in-memory map (one mutex per shard), each with its
+    own asyncio lock so turns of the same interview are serialized while
+    different interviews proceed independently. Idle sessions are expired after
+    ``ttl_seconds``. When a backend is configured every change is written through
+    to it, and sessions missing from memory (e.g. after a restart) are loaded
+    back on demand.
+
+    With ``read_through`` (several processes sharing one backend) every lookup
+    reloads the session from the backend and marks it as in use there, so no
+    process works on a stale copy, and sessions expire by their shared
+    timestamp only. The in-memory entry then just carries the lock, which
+    serializes turns within this process only; ``locked`` reloads the session
+    once the lock is held. Turns racing in different processes are caught by
+    the backend's versioned saves.
+    """
+
+    def __init__(self, backend: Optional[SessionBackend] = None, shard_count: int = 64,
+                 ttl_seconds: float = 3600, sweep_interval: float = 60, read_through: bool = False):
+        if read_through and backend is None:
+            raise ValueError("read_through needs a session backend")
+        self.backend = backend
+        self.read_through = read_through
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._shards: List[Dict[str, _SessionEntry]] = [{} for _ in range(shard_count)]
+        self._shard_locks = [threading.Lock() for _ in range(shard_count)]
+        self._sweeper: Optional[asyncio.Task] = None
+        self._expiry_listeners: List[Callable[[str], None]] = []
+
+    def _shard_index(self, session_id: str) -> int:
+        return hash(session_id) % len(self._shards)
+
+    def _get_entry(self, session_id: str) -> Optional[_SessionEntry]:
+        index = self._shard_index(session_id)
+        with self._shard_locks[index]:
+            entry = self._shards[index].get(session_id)
+            if entry:
+                entry.last_access = time.monotonic()
+            return entry
+
+    def _put_entry(self, session: Dict[str, Any]) -> _SessionEntry:
+        index = self._shard_index(session["id"])
+        with self._shard_locks[index]:
+            entry = self._shards[index].get(session["id"])
+            if entry is None:
+                entry = _SessionEntry(session)
+                self._shards[index][session["id"]] = entry
+            return entry
+
+    def add_expiry_listener(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(session_id)`` whenever an idle session expires"""
+        self._expiry_listeners.append(listener)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.expire_idle()
+            except Exception as e:
+                logger.error(f"Error expiring idle sessions: {str(e)}")
+
+    async def create(self, session: Dict[str, Any]) -> None:
+        """Register a new session"""
+        self._ensure_sweeper()
+        self._put_entry(session)
+        await self.save(session)
+
+    async def _load_entry(self, session_id: str) -> Optional[Tuple[_SessionEntry, Dict[str, Any]]]:
+        """The entry of a session and the session itself, from a single lookup
+
+        With ``read_through`` the session is a fresh copy from the backend and
+        the entry's copy is left alone: a turn holding the lock may be working
+        on it.
+        """
+        entry = self._get_entry(session_id)
+        if not self.backend or (entry and not self.read_through):
+            return (entry, entry.session) if entry else None
+
+        session = await asyncio.to_thread(self.backend.load, session_id)
+        if session is None:
+            return None
+        self._ensure_sweeper()
+        if self.read_through:
+            await asyncio.to_thread(self.backend.touch, session_id)
+            return self._put_entry(session), session
+        entry = self._put_entry(session)
+        return entry, entry.session
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a session by ID, loading it from the backend if necessary"""
+        found = await self._load_entry(session_id)
+        return found[1] if found else None
+
+    @asynccontextmanager
+    async def locked(self, session_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Hold a session's lock and yield the session, or None if there is no such session
+
+        Turns of the same interview are serialized by this lock. With
+        ``read_through`` the session is loaded only once the lock is held, so
+        a turn that had to wait sees everything the previous one saved.
+        """
+        entry = self._get_entry(session_id) if self.read_through else None
+        if entry is None:
+            found = await self._load_entry(session_id)
+            if not found:
+                yield None
+                return
+            entry, session = found
+        async with entry.lock:
+            if self.read_through:
+                session = await asyncio.to_thread(self.backend.load, session_id)
+                if session is not None:
+                    entry.session = session
+            yield session
+
+    async def save(self, session: Dict[str, Any]) -> None:
+        """Persist the current state of a session"""
+        if self.backend:
+            await asyncio.to_thread(self.backend.save, session)
+
+    async def remove(self, session_id: str) -> None:
+        """Forget a session entirely"""
+        index = self._shard_index(session_id)
+        with self._shard_locks[index]:
+            self._shards[index].pop(session_id, None)
+        if self.backend:
+            await asyncio.to_thread(self.backend.delete, session_id)
+
+    async def expire_idle(self) -> List[str]:
+        """Drop sessions that have been idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired: List[str] = []
+        for index, shard in enumerate(self._shards):
+            with self._shard_locks[index]:
+                stale = [
+                    session_id for session_id, entry in shard.items()
+                    if entry.last_access < cutoff and not entry.lock.locked()
+                ]
+                for session_id in stale:
+                    del shard[session_id]
+            expired.extend(stale)
+
+        if self.read_through:
+            # Another process may still be using these; the shared timestamp decides
+            expired = []
+        if self.backend:
+            for session_id in expired:
+                await asyncio.to_thread(self.backend.delete, session_id)
+            # Sessions that were never loaded back into this process. Stored
+            # timestamps only move on save, so sessions held (and possibly
+            # just read) here are left alone; they expire through the map above
+            held = set()
+            for index, shard in enumerate(self._shards):
+                with self._shard_locks[index]:
+                    held.update(shard)
+            stored = await asyncio.to_thread(
+                self.backend.purge_older_than, time.time() - self.ttl_seconds, held
+            )
+            expired.extend(session_id for session_id in stored if session_id not in expired)
+        for session_id in expired:
+            for listener in self._expiry_listeners:
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    logger.error(f"Session expiry listener failed for {session_id}: {str(e)}")
+        if expired:
+            logger.info(f"Expired {len(expired)} idle interview sessions")
+        return expired
+
+    def active_count(self) -> int:
+        """Number of sessions currently held in memory"""
+        return sum(len(shard) for shard in self._shards)
+
+
+def create_session_manager() -> InterviewSessionManager:
+    """Build the session manager from environment settings"""
+    db_path = os.getenv("LEETCODE_SESSION_DB")
+    backend = SQLiteSessionBackend(db_path) if db_path else None
+    return InterviewSessionManager(
+        backend=backend,
+        shard_count=int(os.getenv("LEETCODE_SESSION_SHARDS", "64")),
+        ttl_seconds=float(os.getenv("LEETCODE_SESSION_TTL_SECONDS", "3600")),
+        read_through=os.getenv("LEETCODE_SESSION_READ_THROUGH", "0") == "1"
+    )
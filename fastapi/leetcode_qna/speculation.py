@@ -0,0 +1,180 @@
+import os
+import time
+import asyncio
+import difflib
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def normalize_words(text: str) -> List[str]:
+    return [word.strip(".,!?;:").lower() for word in text.split() if word.strip(".,!?;:")]
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Word-level similarity of two transcripts (1.0 means identical)"""
+    words_a, words_b = normalize_words(a), normalize_words(b)
+    if not words_a and not words_b:
+        return 1.0
+    return difflib.SequenceMatcher(None, words_a, words_b, autojunk=False).ratio()
+
+
+class _Speculation:
+    __slots__ = ("text", "task", "started", "finished", "prompt_tokens")
+
+    def __init__(self, text: str, task: asyncio.Task, prompt_tokens: int):
+        self.text = text
+        self.task = task
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.prompt_tokens = prompt_tokens
+        task.add_done_callback(self._mark_finished)
+
+    def _mark_finished(self, task: asyncio.Task) -> None:
+        self.finished = time.monotonic()
+
+
+class FeedbackSpeculator:
+    """Starts feedback generation on a partial transcript before the answer is submitted
+
+    ``update`` is called with the transcript so far while the candidate
+    speaks. Once it has not changed for ``stable_seconds`` a speculative
+    ``generate(interview_id, text)`` call starts; a later transcript that
+    drifts below ``similarity`` cancels it. ``take`` is called with the
+    submitted answer and returns the speculative feedback if it was made for
+    the same question from nearly the same text, otherwise None.
+
+    ``generate`` returns ``(question_index, feedback, tokens)``. Tokens spent on
+    discarded speculations are counted as waste; for calls cancelled in flight
+    only the prompt estimate from ``estimate_tokens`` is counted.
+    """
+
+    def __init__(self, generate: Callable[[str, str], Awaitable[Tuple[int, str, int]]],
+                 estimate_tokens: Callable[[str], int], stable_seconds: float = 0.6,
+                 similarity: float = 0.9, min_words: int = 5, enabled: bool = True):
+        self.generate = generate
+        self.estimate_tokens = estimate_tokens
+        self.stable_seconds = stable_seconds
+        self.similarity = similarity
+        self.min_words = min_words
+        self.enabled = enabled
+        self._speculations: Dict[str, _Speculation] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "started": 0, "hits": 0, "misses": 0, "cancelled": 0, "not_speculated": 0,
+            "wasted_tokens": 0, "used_tokens": 0, "saved_ms": 0.0
+        }
+
+    def update(self, interview_id: str, text: str, final: bool = False) -> None:
+        """The transcript so far; ``final`` when the candidate has stopped talking"""
+        if not self.enabled or len(normalize_words(text)) < self.min_words:
+            return
+
+        speculation = self._speculations.get(interview_id)
+        if speculation:
+            if transcript_similarity(speculation.text, text) >= self.similarity:
+                return
+            self._discard(interview_id, "cancelled")
+
+        timer = self._timers.pop(interview_id, None)
+        if timer:
+            timer.cancel()
+        if final:
+            self._start(interview_id, text)
+        else:
+            self._timers[interview_id] = asyncio.create_task(self._start_when_stable(interview_id, text))
+
+    async def _start_when_stable(self, interview_id: str, text: str) -> None:
+        await asyncio.sleep(self.stable_seconds)
+        self._timers.pop(interview_id, None)
+        self._start(interview_id, text)
+
+    def _start(self, interview_id: str, text: str) -> None:
+        task = asyncio.create_task(self.generate(interview_id, text))
+        self._speculations[interview_id] = _Speculation(text, task, self.estimate_tokens(text))
+        self.stats["started"] += 1
+        logger.info(f"Started speculative feedback for {interview_id} on {len(text.split())} words")
+
+    def _discard(self, interview_id: str, outcome: str) -> None:
+        speculation = self._speculations.pop(interview_id, None)
+        if speculation is None:
+            return
+        self.stats[outcome] += 1
+        task = speculation.task
+        if not task.done():
+            task.cancel()
+            self.stats["wasted_tokens"] += speculation.prompt_tokens
+        elif not task.cancelled() and task.exception() is None:
+            self.stats["wasted_tokens"] += task.result()[2]
+
+    async def take(self, interview_id: str, question_index: int, text: str) -> Optional[str]:
+        """Speculative feedback for the submitted answer, or None if it has to be generated"""
+        timer = self._timers.pop(interview_id, None)
+        if timer:
+            timer.cancel()
+        speculation = self._speculations.get(interview_id)
+        if speculation is None:
+            self.stats["not_speculated"] += 1
+            return None
+        if transcript_similarity(speculation.text, text) < self.similarity:
+            self._discard(interview_id, "misses")
+            return None
+
+        # LLM time that was already behind us when the answer came in
+        saved = (speculation.finished or time.monotonic()) - speculation.started
+        try:
+            result_index, feedback, tokens = await asyncio.shield(speculation.task)
+        except asyncio.CancelledError:
+            if not speculation.task.cancelled():
+                raise
+            # Cancelled by a concurrent update; generate normally
+            self._discard(interview_id, "cancelled")
+            return None
+        except Exception as e:
+            logger.warning(f"Speculative feedback for {interview_id} failed: {str(e)}")
+            self._speculations.pop(interview_id, None)
+            self.stats["misses"] += 1
+            return None
+
+        if result_index != question_index:
+            self._discard(interview_id, "misses")
+            return None
+
+        self._speculations.pop(interview_id, None)
+        self.stats["hits"] += 1
+        self.stats["used_tokens"] += tokens
+        self.stats["saved_ms"] += saved * 1000
+        return feedback
+
+    def cancel(self, interview_id: str) -> None:
+        """Drop any pending speculation for an interview"""
+        timer = self._timers.pop(interview_id, None)
+        if timer:
+            timer.cancel()
+        self._discard(interview_id, "cancelled")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and token waste"""
+        decided = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "saved_ms": round(self.stats["saved_ms"], 1),
+            "enabled": self.enabled,
+            "hit_rate": round(self.stats["hits"] / decided, 4) if decided else 0.0,
+            "in_flight": sum(1 for speculation in self._speculations.values() if not speculation.task.done())
+        }
+
+
+def create_feedback_speculator(generate: Callable[[str, str], Awaitable[Tuple[int, str, int]]],
+                               estimate_tokens: Callable[[str], int]) -> FeedbackSpeculator:
+    """Build the feedback speculator from environment settings"""
+    return FeedbackSpeculator(
+        generate,
+        estimate_tokens,
+        stable_seconds=float(os.getenv("LEETCODE_SPECULATION_STABLE_MS", "600")) / 1000,
+        similarity=float(os.getenv("LEETCODE_SPECULATION_SIMILARITY", "0.9")),
+        min_words=int(os.getenv("LEETCODE_SPECULATION_MIN_WORDS", "5")),
+        enabled=os.getenv("LEETCODE_SPECULATIVE_FEEDBACK", "true").lower() in ("1", "true", "yes")
+    )
@@ -0,0 +1,157 @@
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import speech_recognition as sr
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class STTStream(ABC):
+    """Incremental recognizer for one utterance"""
+
+    @abstractmethod
+    def accept(self, pcm: bytes) -> Optional[str]:
+        """Feed 16-bit mono PCM; returns the updated partial transcript, if any"""
+
+    @abstractmethod
+    def result(self) -> str:
+        """Final transcript of everything accepted so far"""
+
+
+class STTBackend(ABC):
+    """Speech-to-text engine
+
+    ``transcribe`` and the stream methods are blocking and are called from
+    worker threads. They return "" when no speech was recognized and raise for
+    engine or service failures.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        """Transcript of one utterance of 16-bit mono PCM"""
+
+    def open_stream(self, sample_rate: int) -> Optional[STTStream]:
+        """Start an incremental recognizer, or None if the engine has no partial results"""
+        return None
+
+
+class GoogleSTTBackend(STTBackend):
+    """Google Web Speech API through speech_recognition (needs network access)"""
+
+    name = "google"
+
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        try:
+            return self.recognizer.recognize_google(sr.AudioData(pcm, sample_rate, 2))
+        except sr.UnknownValueError:
+            return ""
+
+
+class _VoskStream(STTStream):
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.partial = ""
+
+    def accept(self, pcm: bytes) -> Optional[str]:
+        if self.recognizer.AcceptWaveform(pcm):
+            # Vosk found an internal phrase boundary; keep the text as partial
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            self.partial = f"{self.partial} {text}".strip()
+            return self.partial
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return f"{self.partial} {partial}".strip() if partial else None
+
+    def result(self) -> str:
+        text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        return f"{self.partial} {text}".strip()
+
+
+class VoskSTTBackend(STTBackend):
+    """Offline recognition with a local Vosk model on CPU
+
+    Download a model (e.g. vosk-model-small-en-us) and point
+    LEETCODE_VOSK_MODEL at its directory.
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path: str):
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("The vosk package is required for LEETCODE_STT_BACKEND=vosk")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(model_path)
+        logger.info(f"Loaded Vosk model from {model_path}")
+
+    def open_stream(self, sample_rate: int) -> STTStream:
+        return _VoskStream(self._vosk.KaldiRecognizer(self.model, sample_rate))
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        stream = self.open_stream(sample_rate)
+        stream.accept(pcm)
+        return stream.result()
+
+
+class _FakeStream(STTStream):
+    def __init__(self, backend: "FakeSTTBackend", sample_rate: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.samples = 0
+
+    def accept(self, pcm: bytes) -> Optional[str]:
+        self.samples += len(pcm) // 2
+        return self.backend.words_for(self.samples / self.sample_rate, final=False)
+
+    def result(self) -> str:
+        return self.backend.words_for(self.samples / self.sample_rate, final=True)
+
+
+class FakeSTTBackend(STTBackend):
+    """Deterministic backend for tests and local development
+
+    Every utterance is recognized as ``transcript``. Partial results reveal it
+    word by word at ``words_per_second`` of streamed audio.
+    """
+
+    name = "fake"
+
+    def __init__(self, transcript: str = "I would use a hash map to store each number and its index",
+                 words_per_second: float = 2.5):
+        self.transcript = transcript
+        self.words_per_second = words_per_second
+
+    def words_for(self, seconds: float, final: bool) -> str:
+        words = self.transcript.split()
+        if final:
+            return self.transcript
+        return " ".join(words[:int(seconds * self.words_per_second)])
+
+    def open_stream(self, sample_rate: int) -> STTStream:
+        return _FakeStream(self, sample_rate)
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        return self.transcript if pcm else ""
+
+
+def create_stt_backend(recognizer: sr.Recognizer) -> STTBackend:
+    """Select the speech-to-text backend with LEETCODE_STT_BACKEND (google, vosk or fake)"""
+    backend = os.getenv("LEETCODE_STT_BACKEND", "google").lower()
+    if backend == "google":
+        return GoogleSTTBackend(recognizer)
+    if backend == "vosk":
+        return VoskSTTBackend(os.getenv("LEETCODE_VOSK_MODEL", "models/vosk-model-small-en-us"))
+    if backend == "fake":
+        transcript = os.getenv("LEETCODE_FAKE_STT_TEXT")
+        return FakeSTTBackend(transcript) if transcript else FakeSTTBackend()
+    raise ValueError(f"Unknown LEETCODE_STT_BACKEND: {backend}")
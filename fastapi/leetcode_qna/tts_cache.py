@@ -0,0 +1,201 @@
+import os
+import re
+import shutil
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the voice or model weights change so old audio is not reused
+TTS_MODEL_VERSION = os.getenv("TTS_MODEL_VERSION", "chatterbox-default")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-indented prompts map to the same audio"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hard-link ``source`` to ``destination``, copying across filesystems"""
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class TTSCache:
+    """Disk store of synthesized audio with a bounded in-memory LRU index
+
+    Entries are keyed on (normalized text, exaggeration, cfg_weight, model
+    version). Hits are hard-linked to the requested output file, so a cached
+    utterance costs a file-system call instead of seconds of inference.
+    Concurrent misses for the same key wait for a single synthesis. Compressed
+    encodings of an entry are kept next to it (``<key>.ogg``, ``<key>.mp3``)
+    so hits do not run the encoder again; they count towards the size limit
+    and are evicted with the entry.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 2048, max_bytes: int = 512 * 1024 * 1024,
+                 model_version: str = TTS_MODEL_VERSION):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.model_version = model_version
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        # Rebuild the index from disk, least recently written first
+        files = sorted(self.cache_dir.glob("*.wav"), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = self._entry_size(path.stem)
+            self._index[path.stem] = size
+            self._bytes += size
+        self._evict()
+        if self._index:
+            logger.info(f"Loaded {len(self._index)} cached TTS entries from {self.cache_dir}")
+
+    def key(self, text: str, exaggeration: float, cfg_weight: float) -> str:
+        """Cache key for an utterance and its synthesis settings"""
+        material = f"{self.model_version}|{exaggeration:.3f}|{cfg_weight:.3f}|{normalize_text(text)}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def _entry_files(self, key: str) -> List[Path]:
+        # The WAV and its encodings; keys are hex digests, so the pattern is literal
+        return list(self.cache_dir.glob(f"{key}.*"))
+
+    def _entry_size(self, key: str) -> int:
+        return sum(path.stat().st_size for path in self._entry_files(key))
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Return the cached file for ``key``, refreshing its LRU position"""
+        if key not in self._index:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            self._bytes -= self._index.pop(key)
+            return None
+        self._index.move_to_end(key)
+        return path
+
+    def record_hit(self) -> None:
+        """Count a request served from the cache by the caller"""
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        """Count a request the caller had to synthesize"""
+        self.misses += 1
+
+    def store(self, key: str, source: Path) -> None:
+        """Add a freshly synthesized file to the cache"""
+        path = self._path(key)
+        link_or_copy(source, path)
+        size = self._entry_size(key)
+        if key in self._index:
+            self._bytes -= self._index[key]
+        self._index[key] = size
+        self._index.move_to_end(key)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._index and (len(self._index) > self.max_entries or self._bytes > self.max_bytes):
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            for path in self._entry_files(key):
+                path.unlink(missing_ok=True)
+
+    def store_variant(self, key: str, encoded_path: Path) -> None:
+        """Keep a compressed encoding of a cached entry, named by its extension"""
+        if key not in self._index:
+            # Evicted while it was being encoded
+            return
+        link_or_copy(encoded_path, self.cache_dir / f"{key}{encoded_path.suffix}")
+        size = self._entry_size(key)
+        self._bytes += size - self._index[key]
+        self._index[key] = size
+        self._evict()
+
+    def link_variants(self, key: str, output_path: Path, extensions: List[str]) -> bool:
+        """Link the cached encodings of ``key`` next to ``output_path``
+
+        Returns False, linking nothing, unless every extension is cached.
+        """
+        sources = [self.cache_dir / f"{key}{extension}" for extension in extensions]
+        if key not in self._index or not all(source.exists() for source in sources):
+            return False
+        for source in sources:
+            link_or_copy(source, output_path.with_suffix(source.suffix))
+        return True
+
+    async def fetch(self, key: str, output_path: Path,
+                    synthesize: Callable[[Path], Awaitable[Any]]) -> bool:
+        """Materialize the audio for ``key`` at ``output_path``
+
+        Uses the cache when possible, otherwise calls ``synthesize(output_path)``
+        and stores the result. Returns True on a cache hit.
+        """
+        while True:
+            cached = self.lookup(key)
+            if cached is not None:
+                self.record_hit()
+                link_or_copy(cached, output_path)
+                return True
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            # Someone is already synthesizing this utterance; if that fails,
+            # the first waiter to get here retries and the rest wait for it
+            await asyncio.shield(inflight)
+
+        self.record_miss()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            # The output may be a hard link to a cache entry from an earlier
+            # hit; writing through it would overwrite the cached audio
+            output_path.unlink(missing_ok=True)
+            await synthesize(output_path)
+            self.store(key, output_path)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            future.set_result(None)
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size of the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "model_version": self.model_version
+        }
+
+
+def create_tts_cache(audio_dir: Path) -> TTSCache:
+    """Build the TTS cache from environment settings"""
+    return TTSCache(
+        Path(os.getenv("TTS_CACHE_DIR", str(audio_dir / "tts_cache"))),
+        max_entries=int(os.getenv("TTS_CACHE_MAX_ENTRIES", "2048")),
+        max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+    )
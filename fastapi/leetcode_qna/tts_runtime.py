@@ -0,0 +1,95 @@
+import os
+import time
+import logging
+from typing import Dict, Any
+
+import torch
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "Hello, let's get started with the interview."
+
+
+def create_cpu_profile() -> Dict[str, Any]:
+    """CPU inference settings from the environment
+
+    TTS_CPU_THREADS          intra-op threads per synthesis (default: all cores)
+    TTS_CPU_INTEROP_THREADS  inter-op threads (default: 1; the worker runs one job at a time)
+    TTS_CPU_QUANTIZE         dynamically quantize linear layers to int8 ("1" to enable)
+    TTS_CPU_WARMUP           run a warmup synthesis at load ("0" to disable)
+    """
+    return {
+        "threads": int(os.getenv("TTS_CPU_THREADS", str(os.cpu_count() or 1))),
+        "interop_threads": int(os.getenv("TTS_CPU_INTEROP_THREADS", "1")),
+        "quantize": os.getenv("TTS_CPU_QUANTIZE", "0") == "1",
+        "warmup": os.getenv("TTS_CPU_WARMUP", "1") == "1"
+    }
+
+
+def configure_torch_threads(profile: Dict[str, Any]) -> None:
+    """Apply thread counts; call before the model is loaded"""
+    torch.set_num_threads(profile["threads"])
+    try:
+        torch.set_num_interop_threads(profile["interop_threads"])
+    except RuntimeError:
+        # Can only be set once, before any inter-op parallel work has started
+        logger.warning("Inter-op thread count already fixed; keeping the current value")
+    logger.info(f"Torch CPU threads: intra-op {torch.get_num_threads()}, inter-op {torch.get_num_interop_threads()}")
+
+
+def apply_worker_threads(profile: Dict[str, Any]) -> None:
+    """Apply the intra-op thread count on the thread that runs inference"""
+    torch.set_num_threads(profile["threads"])
+
+
+def quantize_linear_layers(model) -> int:
+    """Replace the model's nn.Linear layers with dynamic int8 versions in place
+
+    ChatterboxTTS is a plain object holding several nn.Module parts, so each of
+    them is quantized separately. Returns the number of parts quantized.
+    """
+    quantized = 0
+    for name, part in list(vars(model).items()):
+        if isinstance(part, torch.nn.Module):
+            setattr(model, name, torch.ao.quantization.quantize_dynamic(part, {torch.nn.Linear}, dtype=torch.qint8))
+            quantized += 1
+    logger.info(f"Quantized linear layers of {quantized} TTS model parts to int8")
+    return quantized
+
+
+def freeze_for_sharing(model) -> int:
+    """Put every model part in eval mode with gradients off, before forking workers
+
+    Inference then never writes to the parameters or their autograd fields, so
+    the weight pages stay shared copy-on-write between forked workers. Returns
+    the number of parameter tensors frozen.
+    """
+    frozen = 0
+    for part in vars(model).values():
+        if isinstance(part, torch.nn.Module):
+            part.eval()
+            for parameter in part.parameters():
+                parameter.requires_grad_(False)
+                frozen += 1
+    logger.info(f"Froze {frozen} TTS parameter tensors for sharing")
+    return frozen
+
+
+def warmup(model, exaggeration: float = 0.5, cfg_weight: float = 0.5) -> float:
+    """Run one synthesis so first-request latency excludes lazy initialization"""
+    started = time.monotonic()
+    with torch.inference_mode():
+        model.generate(WARMUP_TEXT, exaggeration=exaggeration, cfg_weight=cfg_weight)
+    elapsed = time.monotonic() - started
+    logger.info(f"TTS warmup finished in {elapsed:.2f}s")
+    return elapsed
+
+
+def optimize_for_cpu(model, profile: Dict[str, Any], exaggeration: float = 0.5, cfg_weight: float = 0.5):
+    """Apply the post-load parts of the CPU profile to a loaded model"""
+    if profile["quantize"]:
+        quantize_linear_layers(model)
+    if profile["warmup"]:
+        warmup(model, exaggeration, cfg_weight)
+    return model
@@ -0,0 +1,69 @@
+import re
+import struct
+import wave
+import logging
+from pathlib import Path
+from typing import List, Any
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sentences shorter than this are merged into the next one; very short
+# utterances sound clipped and cost nearly as much as a full sentence
+MIN_SENTENCE_CHARS = 20
+
+# RIFF/data sizes for a stream whose length is unknown up front
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> List[str]:
+    """Split text into sentences for incremental synthesis"""
+    parts = [part.strip() for part in re.split(r"(?<=[.!?;:])\s+|\n{2,}", text) if part.strip()]
+
+    sentences: List[str] = []
+    pending = ""
+    for part in parts:
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+def streaming_wav_header(sample_rate: int, channels: int = 1) -> bytes:
+    """WAV header for 16-bit PCM of unknown length
+
+    Browsers and most players accept the maximum size placeholder and play the
+    samples as they arrive.
+    """
+    byte_rate = sample_rate * channels * 2
+    return (
+        b"RIFF" + struct.pack("<I", _UNKNOWN_SIZE) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, channels * 2, 16)
+        + b"data" + struct.pack("<I", _UNKNOWN_SIZE)
+    )
+
+
+def to_pcm16(wav: Any) -> bytes:
+    """Convert a model waveform (torch tensor or array, values in [-1, 1]) to PCM16 bytes"""
+    if hasattr(wav, "detach"):
+        wav = wav.detach().cpu().numpy()
+    samples = np.asarray(wav, dtype=np.float32).reshape(-1)
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def write_pcm16_wav(path: Path, chunks: List[bytes], sample_rate: int, channels: int = 1) -> None:
+    """Write the concatenated PCM16 chunks of a stream as a regular WAV file"""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        for chunk in chunks:
+            wav_file.writeframes(chunk)
@@ -0,0 +1,221 @@
+import os
+import time
+import queue
+import itertools
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+import torch
+import torchaudio as ta
+
+from .latency import record_stage
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# Request priorities: lower values are served first
+PRIORITY_LIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class TTSRequest:
+    """A single synthesis job waiting for the TTS worker"""
+
+    __slots__ = ("text", "output_path", "exaggeration", "cfg_weight", "future", "loop", "enqueued_at",
+                 "started_at", "synthesis_seconds", "audio_seconds", "batch_size")
+
+    def __init__(self, text: str, output_path: Optional[str], exaggeration: float, cfg_weight: float,
+                 future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.text = text
+        self.output_path = output_path
+        self.exaggeration = exaggeration
+        self.cfg_weight = cfg_weight
+        self.future = future
+        self.loop = loop
+        self.enqueued_at = time.monotonic()
+        # Filled in by the worker thread
+        self.started_at: Optional[float] = None
+        self.synthesis_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.batch_size = 1
+
+    def record_timings(self) -> None:
+        """Report queue wait and synthesis time to the current turn trace"""
+        if self.started_at is None:
+            return
+        record_stage("tts_queue_wait", self.started_at - self.enqueued_at)
+        record_stage(
+            "tts_synthesis",
+            self.synthesis_seconds,
+            audio_ms=round(self.audio_seconds * 1000, 1),
+            rtf=round(self.synthesis_seconds / self.audio_seconds, 3) if self.audio_seconds else None,
+            batch_size=self.batch_size
+        )
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class TTSWorker:
+    """Runs ChatterboxTTS inference on a dedicated thread
+
+    The worker owns the model and a priority request queue. Callers get awaitable
+    futures, so synthesis never blocks the event loop, and live requests are
+    served before background ones. When the model exposes ``generate_batch``,
+    requests that arrive within ``batch_window`` seconds of each other are
+    grouped (up to ``max_batch``) and synthesized in one forward pass. Without
+    it requests are taken one at a time, so a live request never waits behind
+    more than the synthesis already in progress.
+    """
+
+    def __init__(self, model, max_batch: int = 8, batch_window: float = 0.02,
+                 thread_init: Optional[Callable[[], None]] = None):
+        self.model = model
+        # Grouping without a batched forward pass would only delay later live requests
+        self.batching = hasattr(model, "generate_batch")
+        self.max_batch = max_batch if self.batching else 1
+        self.batch_window = batch_window
+        # Per-thread runtime setup (e.g. torch thread counts), run on the worker thread
+        self.thread_init = thread_init
+        self._requests: "queue.PriorityQueue[Tuple[int, int, TTSRequest]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "batched_requests": 0, "failures": 0}
+
+    def _ensure_started(self) -> None:
+        # Started on first use rather than at construction
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+                self._thread.start()
+
+    async def synthesize(self, text: str, output_path: str, exaggeration: float = 0.5,
+                         cfg_weight: float = 0.5, priority: int = PRIORITY_LIVE) -> str:
+        """Queue a synthesis job and wait for the audio file to be written"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request = TTSRequest(text, output_path, exaggeration, cfg_weight, future, loop)
+        # The sequence number keeps FIFO order within a priority
+        self._requests.put((priority, next(self._sequence), request))
+        result = await future
+        request.record_timings()
+        return result
+
+    async def generate(self, text: str, exaggeration: float = 0.5, cfg_weight: float = 0.5,
+                       priority: int = PRIORITY_LIVE) -> Any:
+        """Queue a synthesis job and return the waveform instead of writing a file"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request = TTSRequest(text, None, exaggeration, cfg_weight, future, loop)
+        self._requests.put((priority, next(self._sequence), request))
+        result = await future
+        request.record_timings()
+        return result
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting for the worker"""
+        return self._requests.qsize()
+
+    def _collect_batch(self) -> List[TTSRequest]:
+        batch = [self._requests.get()[2]]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining)[2])
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        if self.thread_init:
+            self.thread_init()
+        while True:
+            batch = self._collect_batch()
+
+            # Requests can only share a forward pass when their settings match
+            groups: Dict[Tuple[float, float], List[TTSRequest]] = {}
+            for request in batch:
+                groups.setdefault((request.exaggeration, request.cfg_weight), []).append(request)
+
+            for (exaggeration, cfg_weight), group in groups.items():
+                self._process_group(group, exaggeration, cfg_weight)
+
+    def _process_group(self, group: List[TTSRequest], exaggeration: float, cfg_weight: float) -> None:
+        live = [request for request in group if not request.future.cancelled()]
+        if not live:
+            return
+
+        self.stats["requests"] += len(live)
+        self.stats["batches"] += 1
+        if len(live) > 1:
+            self.stats["batched_requests"] += len(live)
+
+        started = time.monotonic()
+        for request in live:
+            request.started_at = started
+        try:
+            wavs = self._generate([request.text for request in live], exaggeration, cfg_weight)
+        except Exception as e:
+            logger.error(f"TTS batch of {len(live)} failed: {str(e)}")
+            self.stats["failures"] += len(live)
+            for request in live:
+                request.loop.call_soon_threadsafe(_resolve, request.future, None, e)
+            return
+
+        elapsed = time.monotonic() - started
+        for request, wav in zip(live, wavs):
+            # Requests in a batch share the forward pass, so each is charged its full duration
+            request.synthesis_seconds = elapsed
+            request.audio_seconds = wav.shape[-1] / self.model.sr
+            request.batch_size = len(live)
+            if request.output_path is None:
+                request.loop.call_soon_threadsafe(_resolve, request.future, wav)
+                continue
+            try:
+                ta.save(request.output_path, wav, self.model.sr)
+                request.loop.call_soon_threadsafe(_resolve, request.future, request.output_path)
+            except Exception as e:
+                logger.error(f"Failed to save TTS audio {request.output_path}: {str(e)}")
+                self.stats["failures"] += 1
+                request.loop.call_soon_threadsafe(_resolve, request.future, None, e)
+
+    def _generate(self, texts: List[str], exaggeration: float, cfg_weight: float) -> List[Any]:
+        # No autograd bookkeeping is needed for synthesis
+        with torch.inference_mode():
+            if len(texts) > 1:
+                return list(self.model.generate_batch(texts, exaggeration=exaggeration, cfg_weight=cfg_weight))
+            return [self.model.generate(texts[0], exaggeration=exaggeration, cfg_weight=cfg_weight)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker counters for health and debugging endpoints"""
+        return {
+            **self.stats,
+            "queue_depth": self.queue_depth(),
+            "max_batch": self.max_batch,
+            "average_batch_size": round(self.stats["requests"] / self.stats["batches"], 2) if self.stats["batches"] else 0
+        }
+
+
+def create_tts_worker(model, thread_init: Optional[Callable[[], None]] = None) -> TTSWorker:
+    """Build the TTS worker from environment settings"""
+    return TTSWorker(
+        model,
+        max_batch=int(os.getenv("TTS_MAX_BATCH", "8")),
+        batch_window=float(os.getenv("TTS_BATCH_WINDOW_MS", "20")) / 1000,
+        thread_init=thread_init
+    )
@@ -0,0 +1,115 @@
+import os
+from collections import deque
+from typing import List, Deque
+
+import numpy as np
+
+
+class EnergyVAD:
+    """Energy-based voice activity detector for a stream of 16-bit mono PCM
+
+    Audio is cut into fixed frames and each frame's RMS is compared to an
+    adaptive noise floor. A segment opens after ``start_frames`` consecutive
+    voiced frames (keeping ``pre_roll_ms`` of audio before the onset) and closes
+    after ``end_silence_ms`` of silence or when it reaches
+    ``max_segment_seconds``. ``feed`` returns the PCM of every segment that
+    closed, so transcription can start as soon as the speaker pauses.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, threshold_ratio: float = 3.0,
+                 min_rms: float = 300.0, start_frames: int = 3, end_silence_ms: int = 700,
+                 pre_roll_ms: int = 300, max_segment_seconds: float = 30.0):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.start_frames = start_frames
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.max_segment_frames = int(max_segment_seconds * 1000 / frame_ms)
+
+        self.noise_floor = min_rms / threshold_ratio
+        self._buffer = bytearray()
+        self._pre_roll: Deque[bytes] = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._segment: List[bytes] = []
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.in_speech = False
+        self.frames_seen = 0
+        self.speech_started_frame = 0
+
+    def _is_voiced(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype="<i2").astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        voiced = rms > max(self.min_rms, self.noise_floor * self.threshold_ratio)
+        if not voiced and not self.in_speech:
+            # Track the background level only while nobody is speaking
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return voiced
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """Add PCM audio; returns the segments that closed"""
+        self._buffer.extend(pcm)
+        closed: List[bytes] = []
+        while len(self._buffer) >= self.frame_bytes:
+            frame = bytes(self._buffer[:self.frame_bytes])
+            del self._buffer[:self.frame_bytes]
+            self.frames_seen += 1
+            segment = self._process_frame(frame)
+            if segment:
+                closed.append(segment)
+        return closed
+
+    def _process_frame(self, frame: bytes) -> bytes:
+        voiced = self._is_voiced(frame)
+
+        if not self.in_speech:
+            self._pre_roll.append(frame)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                self.in_speech = True
+                self.speech_started_frame = self.frames_seen - len(self._pre_roll)
+                self._segment = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._silent_run = 0
+            return b""
+
+        self._segment.append(frame)
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self.end_silence_frames or len(self._segment) >= self.max_segment_frames:
+            return self._close()
+        return b""
+
+    def _close(self) -> bytes:
+        # Drop most of the trailing silence; keep a little so words are not clipped
+        keep = len(self._segment) - max(0, self._silent_run - self.start_frames)
+        segment = b"".join(self._segment[:keep])
+        self._segment = []
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.in_speech = False
+        return segment
+
+    def flush(self) -> bytes:
+        """Close the open segment at end of stream; returns b"" if there is none"""
+        if not self.in_speech:
+            return b""
+        if self._buffer:
+            self._segment.append(bytes(self._buffer))
+            self._buffer.clear()
+        return self._close()
+
+    def offset_ms(self, frame_index: int) -> int:
+        """Stream position of a frame in milliseconds"""
+        return frame_index * self.frame_ms
+
+
+def create_vad(sample_rate: int) -> EnergyVAD:
+    """Build a VAD from environment settings"""
+    return EnergyVAD(
+        sample_rate=sample_rate,
+        threshold_ratio=float(os.getenv("LEETCODE_VAD_THRESHOLD_RATIO", "3.0")),
+        min_rms=float(os.getenv("LEETCODE_VAD_MIN_RMS", "300")),
+        end_silence_ms=int(os.getenv("LEETCODE_VAD_END_SILENCE_MS", "700")),
+        max_segment_seconds=float(os.getenv("LEETCODE_VAD_MAX_SEGMENT_SECONDS", "30"))
+    )
@@ -0,0 +1,179 @@
+"""Pre-fork server: load the heavy parts once, then fork uvicorn workers
+
+    python prefork.py --workers 4 --port 8000
+
+``uvicorn --workers N`` starts every worker from scratch, so each one imports
+LangChain/Manim and loads its own ChatterboxTTS weights. Here the master
+imports the app and the agent modules, loads the TTS model, freezes the
+garbage collector's view of everything allocated so far and only then forks.
+Workers share those pages copy-on-write and accept on one listening socket;
+the master restarts workers that die and forwards SIGINT/SIGTERM to them.
+
+Only the immutable parts are preloaded. Services holding connections,
+threads or event-loop state (LLM clients, session store, TTS worker thread)
+are still built by the service registry inside each worker.
+
+That per-worker state is not shared, and the kernel hands each connection to
+whichever worker accepts it (no sticky routing):
+
+- Interview sessions must live in a shared store. With more than one worker
+  ``LEETCODE_SESSION_DB`` is required and sessions are read through (reloaded
+  from SQLite on every request, never served from a worker's memory). The
+  per-session lock serializes turns within one worker, and the session is
+  reloaded once it is held. Saves are versioned, so of two turns of one
+  interview racing on different workers the second fails with an error
+  instead of overwriting the first.
+- Stream resume is per worker: a reconnect with ``Last-Event-ID`` (answer or
+  report streams) that lands on another worker starts over instead of
+  replaying. The same holds for the artifact registry.
+- The TTS cache directory is shared but each worker keeps its own LRU index,
+  so the size limit applies per worker and one worker may evict a file another
+  still lists; that worker then re-synthesizes it on the next miss.
+"""
+import gc
+import os
+import sys
+import signal
+import socket
+import logging
+import argparse
+from typing import Dict
+
+# Imported first so the startup timings cover everything below
+from common.services import services
+
+import uvicorn
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PREFORK_WORKERS = int(os.getenv("PREFORK_WORKERS", "2"))
+PREFORK_BACKLOG = int(os.getenv("PREFORK_BACKLOG", "2048"))
+
+# Modules whose import cost is paid once in the master
+PRELOAD_MODULES = ["ai_animation.agent", "system_design.agent", "leetcode_qna.agent"]
+
+
+def preload() -> None:
+    """Import the app and the heavy modules, and load the TTS weights"""
+    with services.timed("import app"):
+        import app  # noqa: F401
+    for module in PRELOAD_MODULES:
+        try:
+            with services.timed(f"import {module}"):
+                __import__(module)
+        except Exception as e:
+            logger.error(f"Failed to preload {module}: {str(e)}")
+
+    try:
+        from leetcode_qna.agent import preload_tts_model
+        with services.timed("preload tts model"):
+            preload_tts_model()
+    except Exception as e:
+        logger.error(f"Failed to preload TTS model, workers will load their own: {str(e)}")
+
+    # Move everything allocated so far out of the collector's generations:
+    # collections in the workers then never touch (and copy) these objects
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded in the master; {gc.get_freeze_count()} objects frozen")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(PREFORK_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str) -> None:
+    """Serve the preloaded app on the shared socket; never returns"""
+    # uvicorn installs its own handlers for graceful shutdown
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 0
+    try:
+        from app import app
+        config = uvicorn.Config(app, log_level=log_level, timeout_graceful_shutdown=30)
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException as e:
+        logger.error(f"Worker {os.getpid()} failed: {str(e)}")
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+class PreforkMaster:
+    """Forks and supervises the workers"""
+
+    def __init__(self, sock: socket.socket, workers: int, log_level: str):
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        self.children: Dict[int, int] = {}
+        self.stopping = False
+
+    def spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.sock, self.log_level)
+        self.children[pid] = slot
+        logger.info(f"Started worker {slot} (pid {pid})")
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        for slot in range(self.workers):
+            self.spawn(slot)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = self.children.pop(pid, None)
+            if slot is None:
+                continue
+            if not self.stopping:
+                logger.warning(f"Worker {slot} (pid {pid}) exited with status {status}; restarting")
+                self.spawn(slot)
+        logger.info("All workers stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=PREFORK_WORKERS)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        if not os.getenv("LEETCODE_SESSION_DB"):
+            parser.error("--workers > 1 needs a shared session store; set LEETCODE_SESSION_DB")
+        os.environ["LEETCODE_SESSION_READ_THROUGH"] = "1"
+
+    # Without a setting, split the cores between workers instead of giving each all of them
+    os.environ.setdefault("TTS_CPU_THREADS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+
+    preload()
+    sock = bind_socket(args.host, args.port)
+    logger.info(f"Listening on {args.host}:{args.port} with {args.workers} workers")
+    PreforkMaster(sock, args.workers, args.log_level).run()
+
+
+if __name__ == "__main__":
+    main()
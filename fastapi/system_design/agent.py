@@ -3,15 +3,19 @@ import re
 import json
 import logging
 import uuid
+import time
 import base64
 import zlib
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from pathlib import Path
-from typing import Optional, Dict, Any, Generator
+from typing import Optional, Dict, Any, Generator, List
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from common.streaming import stream_workflow, stream_chain_text, emit, DeltaTracker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,6 +23,79 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Sections of the architecture explanation, in document order.  In sectioned
+# mode each entry becomes its own LLM request sharing the analysis and diagram.
+EXPLANATION_SECTIONS = [
+    {
+        "key": "overview",
+        "title": "Architecture Overview",
+        "guidance": """- High-level architecture pattern used
+                   - Key design decisions and rationale
+                   - System boundaries and responsibilities"""
+    },
+    {
+        "key": "components",
+        "title": "Component Details",
+        "guidance": """- Purpose and responsibility of each major component
+                   - Technology stack recommendations
+                   - Scalability considerations"""
+    },
+    {
+        "key": "data_flow",
+        "title": "Data Flow",
+        "guidance": """- How data moves through the system
+                   - Key integration points
+                   - API design patterns"""
+    },
+    {
+        "key": "non_functional",
+        "title": "Non-Functional Requirements",
+        "guidance": """- Scalability strategies
+                   - Security considerations
+                   - Performance optimizations
+                   - Reliability and fault tolerance"""
+    },
+    {
+        "key": "implementation",
+        "title": "Implementation Recommendations",
+        "guidance": """- Deployment strategies
+                   - Development phases
+                   - Technology choices
+                   - Monitoring and observability"""
+    }
+]
+
+# Diagram views supported by multi-view generation. The component view reuses
+# the main workflow's prompt; the others are generated from these instructions.
+DIAGRAM_VIEWS = {
+    "component": {
+        "title": "Component Diagram"
+    },
+    "sequence": {
+        "title": "Sequence Diagram",
+        "instructions": """- Declare participants with: actor "User" as user, participant "Service" as svc,
+                     database "DB" as db
+                   - Show the primary request flow end to end using -> for calls and --> for responses
+                   - Label every message, and use alt/opt blocks for important failure paths
+                   - Follow the data flow: {data_flow}"""
+    },
+    "deployment": {
+        "title": "Deployment Diagram",
+        "instructions": """- Use node "Name" as alias for hosts, clusters and regions, and cloud "Name" as alias
+                     for managed services
+                   - Place [Component] as alias artifacts inside the nodes that run them
+                   - Use database "Name" as alias for data stores
+                   - Connect them with --> and label the protocols
+                   - Reflect the {recommended_architecture} architecture at {scale} scale"""
+    }
+}
+
+# Per-section timeout (seconds) for sectioned explanation generation, measured
+# from when the section's LLM call starts rather than when it is queued
+SECTION_TIMEOUT_SECONDS = float(os.getenv("SYSTEM_DESIGN_SECTION_TIMEOUT", "45"))
+# How often queued sections are checked for having started
+_SECTION_POLL_SECONDS = 0.25
+
 
 def encode_plantuml(plantuml_text: str) -> str:
     """
@@ -72,6 +149,23 @@ class SystemDesignGenerationSystem:
             temperature=0.7
         )
         
+        # Explanation sections give up after their timeout; the request timeout
+        # makes the abandoned call actually stop and free its pool worker. No
+        # retries, or a timed-out call would hold the worker for another timeout
+        self.section_llm = ChatGoogleGenerativeAI(
+            model="gemini-1.5-flash",
+            google_api_key=api_key,
+            temperature=0.7,
+            timeout=SECTION_TIMEOUT_SECONDS,
+            max_retries=0
+        )
+        
+        # Shared pool for concurrent LLM requests (explanation sections, diagram views)
+        self.llm_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("SYSTEM_DESIGN_LLM_WORKERS", "10")),
+            thread_name_prefix="system-design-llm"
+        )
+        
         logger.info("System Design Generation System initialized")
     
     def _analyze_requirements(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -130,108 +224,7 @@ class SystemDesignGenerationSystem:
             
             logger.info("Generating PlantUML code based on analysis")
             
-            plantuml_prompt = ChatPromptTemplate.from_template(
-                """Based on the following system analysis, generate a comprehensive PlantUML component diagram:
-                
-                Original Request: {prompt}
-                System Analysis: {analysis}
-                
-                Create a PlantUML diagram following these requirements:
-                
-                1. **Syntax Rules:**
-                   - Start with @startuml
-                   - End with @enduml
-                   - Use only valid PlantUML component syntax
-                   - Include a meaningful title
-                
-                2. **Components to Include:**
-                   - User interfaces: actor "User" as user
-                   - Applications: [Web App] as webapp, [Mobile App] as mobile
-                   - Services: [Service Name] as service
-                   - Databases: database "DB Name" as db
-                   - External systems: cloud "Service" as cloud
-                   - APIs: interface "API" as api
-                
-                3. **Architecture Patterns:**
-                   - For {system_type}: Use appropriate layered architecture
-                   - Include {recommended_architecture} patterns
-                   - Show {key_components} as main components
-                   - Implement {patterns} design patterns
-                
-                4. **Relationships:**
-                   - Use --> for dependencies and data flow
-                   - Include meaningful labels for connections
-                   - Show {data_flow} progression
-                
-                5. **Styling:**
-                   - Group related components with packages
-                   - Use consistent naming conventions
-                   - Add colors for different component types
-                
-                Example structure:
-                ```
-                @startuml
-                title {system_type} Architecture
-                
-                !define BLUE #4A90E2
-                !define GREEN #7ED321
-                !define ORANGE #F5A623
-                !define RED #D0021B
-                
-                package "Frontend" {{
-                    actor "Users" as users
-                    [Web Application] as webapp BLUE
-                    [Mobile App] as mobile BLUE
-                }}
-                
-                package "Backend Services" {{
-                    [API Gateway] as gateway GREEN
-                    [Authentication Service] as auth GREEN
-                    [Business Logic Service] as business GREEN
-                }}
-                
-                package "Data Layer" {{
-                    database "Primary DB" as maindb ORANGE
-                    database "Cache" as cache ORANGE
-                }}
-                
-                package "External" {{
-                    cloud "CDN" as cdn RED
-                    cloud "Payment Gateway" as payment RED
-                }}
-                
-                users --> webapp : HTTP requests
-                users --> mobile : mobile access
-                webapp --> gateway : API calls
-                mobile --> gateway : API calls
-                gateway --> auth : authenticate
-                gateway --> business : process requests
-                business --> maindb : data operations
-                business --> cache : cached data
-                webapp --> cdn : static content
-                business --> payment : payments
-                
-                @enduml
-                ```
-                
-                Generate a similar comprehensive diagram for the given system.
-                Provide ONLY the PlantUML code, nothing else.
-                """
-            )
-            
-            chain = plantuml_prompt | self.llm
-            response = chain.invoke({
-                "prompt": prompt,
-                "analysis": json.dumps(analysis, indent=2),
-                "system_type": analysis.get("system_type", "system"),
-                "recommended_architecture": analysis.get("recommended_architecture", "layered"),
-                "key_components": ", ".join(analysis.get("key_components", [])),
-                "patterns": ", ".join(analysis.get("patterns", [])),
-                "data_flow": " -> ".join(analysis.get("data_flow", []))
-            })
-            
-            # Extract and clean PlantUML code
-            plantuml_code = self._extract_plantuml_code(response.content)
+            plantuml_code = self._request_component_plantuml(prompt, analysis)
             
             return {
                 **state,
@@ -247,8 +240,163 @@ class SystemDesignGenerationSystem:
                 "stage": "error"
             }
     
+    def _request_component_plantuml(self, prompt: str, analysis: Dict[str, Any]) -> str:
+        """Ask the LLM for the component diagram of the analysed system"""
+        plantuml_prompt = ChatPromptTemplate.from_template(
+            """Based on the following system analysis, generate a comprehensive PlantUML component diagram:
+            
+            Original Request: {prompt}
+            System Analysis: {analysis}
+            
+            Create a PlantUML diagram following these requirements:
+            
+            1. **Syntax Rules:**
+               - Start with @startuml
+               - End with @enduml
+               - Use only valid PlantUML component syntax
+               - Include a meaningful title
+            
+            2. **Components to Include:**
+               - User interfaces: actor "User" as user
+               - Applications: [Web App] as webapp, [Mobile App] as mobile
+               - Services: [Service Name] as service
+               - Databases: database "DB Name" as db
+               - External systems: cloud "Service" as cloud
+               - APIs: interface "API" as api
+            
+            3. **Architecture Patterns:**
+               - For {system_type}: Use appropriate layered architecture
+               - Include {recommended_architecture} patterns
+               - Show {key_components} as main components
+               - Implement {patterns} design patterns
+            
+            4. **Relationships:**
+               - Use --> for dependencies and data flow
+               - Include meaningful labels for connections
+               - Show {data_flow} progression
+            
+            5. **Styling:**
+               - Group related components with packages
+               - Use consistent naming conventions
+               - Add colors for different component types
+            
+            Example structure:
+            ```
+            @startuml
+            title {system_type} Architecture
+            
+            !define BLUE #4A90E2
+            !define GREEN #7ED321
+            !define ORANGE #F5A623
+            !define RED #D0021B
+            
+            package "Frontend" {{
+                actor "Users" as users
+                [Web Application] as webapp BLUE
+                [Mobile App] as mobile BLUE
+            }}
+            
+            package "Backend Services" {{
+                [API Gateway] as gateway GREEN
+                [Authentication Service] as auth GREEN
+                [Business Logic Service] as business GREEN
+            }}
+            
+            package "Data Layer" {{
+                database "Primary DB" as maindb ORANGE
+                database "Cache" as cache ORANGE
+            }}
+            
+            package "External" {{
+                cloud "CDN" as cdn RED
+                cloud "Payment Gateway" as payment RED
+            }}
+            
+            users --> webapp : HTTP requests
+            users --> mobile : mobile access
+            webapp --> gateway : API calls
+            mobile --> gateway : API calls
+            gateway --> auth : authenticate
+            gateway --> business : process requests
+            business --> maindb : data operations
+            business --> cache : cached data
+            webapp --> cdn : static content
+            business --> payment : payments
+            
+            @enduml
+            ```
+            
+            Generate a similar comprehensive diagram for the given system.
+            Provide ONLY the PlantUML code, nothing else.
+            """
+        )
+        
+        chain = plantuml_prompt | self.llm
+        response = chain.invoke({
+            "prompt": prompt,
+            "analysis": json.dumps(analysis, indent=2),
+            "system_type": analysis.get("system_type", "system"),
+            "recommended_architecture": analysis.get("recommended_architecture", "layered"),
+            "key_components": ", ".join(analysis.get("key_components", [])),
+            "patterns": ", ".join(analysis.get("patterns", [])),
+            "data_flow": " -> ".join(analysis.get("data_flow", []))
+        })
+        
+        # Extract and clean PlantUML code
+        return self._extract_plantuml_code(response.content)
+    
+    def _request_view_plantuml(self, view_type: str, prompt: str, analysis: Dict[str, Any]) -> str:
+        """Ask the LLM for one view of the analysed system"""
+        if view_type == "component":
+            return self._request_component_plantuml(prompt, analysis)
+        
+        view = DIAGRAM_VIEWS[view_type]
+        instructions = view["instructions"].format(
+            data_flow=" -> ".join(analysis.get("data_flow", [])),
+            recommended_architecture=analysis.get("recommended_architecture", "layered"),
+            scale=analysis.get("scale", "medium")
+        )
+        
+        view_prompt = ChatPromptTemplate.from_template(
+            """Based on the following system analysis, generate a PlantUML {view_title}:
+            
+            Original Request: {prompt}
+            System Analysis: {analysis}
+            
+            Create the diagram following these requirements:
+            
+            1. **Syntax Rules:**
+               - Start with @startuml
+               - End with @enduml
+               - Use only valid PlantUML syntax for this diagram type
+               - Include a meaningful title
+            
+            2. **Content:**
+                   {instructions}
+            
+            3. **Consistency:**
+               - Use the same names for the key components: {key_components}
+            
+            Provide ONLY the PlantUML code, nothing else.
+            """
+        )
+        
+        chain = view_prompt | self.llm
+        response = chain.invoke({
+            "view_title": view["title"].lower(),
+            "prompt": prompt,
+            "analysis": json.dumps(analysis, indent=2),
+            "instructions": instructions,
+            "key_components": ", ".join(analysis.get("key_components", []))
+        })
+        
+        return self._extract_plantuml_code(response.content)
+    
     def _generate_explanation(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Third stage: Generate detailed explanation of the architecture"""
+        if state.get("explanation_mode") == "sectioned":
+            return self._generate_explanation_sectioned(state)
+        
         try:
             analysis = state["analysis"]
             plantuml_code = state["plantuml_code"]
@@ -297,14 +445,17 @@ class SystemDesignGenerationSystem:
                 """
             )
             
+            # Stream tokens to the client as they arrive when a consumer is attached
+            tracker = DeltaTracker(state, "explanation", "explanation_streaming")
             chain = explanation_prompt | self.llm
-            response = chain.invoke({
+            response_text = stream_chain_text(chain, {
                 "prompt": prompt,
                 "analysis": json.dumps(analysis, indent=2),
                 "plantuml_code": plantuml_code
-            })
+            }, state, on_text=lambda text: tracker.update(text.lstrip()))
             
-            explanation = response.content.strip()
+            explanation = response_text.strip()
+            tracker.finish(explanation)
             
             return {
                 **state,
@@ -320,28 +471,150 @@ class SystemDesignGenerationSystem:
                 "stage": "error"
             }
     
-    def _create_diagram_url(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Fourth stage: Create PlantUML diagram URL and extract components for D3"""
+    def _generate_explanation_section(self, section: Dict[str, str], prompt: str,
+                                      analysis_json: str, plantuml_code: str) -> str:
+        """Generate a single section of the architecture explanation"""
+        section_prompt = ChatPromptTemplate.from_template(
+            """Based on the system analysis and PlantUML diagram, write the "{title}" section
+            of a comprehensive architecture explanation:
+            
+            Original Request: {prompt}
+            System Analysis: {analysis}
+            PlantUML Code: {plantuml_code}
+            
+            The section must cover:
+                   {guidance}
+            
+            Start with the heading "## {title}" and write only this section; other sections
+            are written separately.
+            Write in a clear, technical style suitable for software architects and engineers.
+            Provide practical insights and best practices.
+            """
+        )
+        
+        chain = section_prompt | self.section_llm
+        response = chain.invoke({
+            "title": section["title"],
+            "guidance": section["guidance"],
+            "prompt": prompt,
+            "analysis": analysis_json,
+            "plantuml_code": plantuml_code
+        })
+        return response.content.strip()
+    
+    def _generate_explanation_sectioned(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Third stage (sectioned mode): generate explanation sections concurrently
+        
+        Every section is requested at once, so the stage takes as long as the slowest
+        section rather than the sum of all of them. Completed sections are emitted in
+        document order through the event sink; a section that fails or exceeds the
+        per-section timeout is replaced by a short placeholder instead of failing the
+        whole workflow. The timeout runs from when a section starts, so time spent
+        queued behind other work in the shared LLM pool does not count against it.
+        """
         try:
+            analysis_json = json.dumps(state["analysis"], indent=2)
             plantuml_code = state["plantuml_code"]
+            prompt = state["user_prompt"]
+            timeout = state.get("section_timeout", SECTION_TIMEOUT_SECONDS)
             
-            logger.info("Creating diagram URL and extracting components")
+            logger.info(f"Generating architecture explanation in {len(EXPLANATION_SECTIONS)} parallel sections")
+            
+            started: Dict[int, float] = {}
             
-            # Generate PlantUML diagram URL using our custom encoder
-            encoded = encode_plantuml(plantuml_code)
-            diagram_url = f"https://www.plantuml.com/plantuml/img/{encoded}"
+            def run_section(index: int, section: Dict[str, str]) -> str:
+                started[index] = time.monotonic()
+                return self._generate_explanation_section(section, prompt, analysis_json, plantuml_code)
             
-            # Extract components and relationships for D3 visualization
-            components = self._extract_d3_components(plantuml_code)
+            futures = {
+                self.llm_executor.submit(run_section, index, section): index
+                for index, section in enumerate(EXPLANATION_SECTIONS)
+            }
             
-            # Generate unique ID for this diagram
-            diagram_id = str(uuid.uuid4())[:8]
+            sections: List[Optional[Dict[str, Any]]] = [None] * len(EXPLANATION_SECTIONS)
+            next_to_emit = 0
+            pending = set(futures)
             
+            while pending:
+                # Degrade gracefully: a section that has run past its timeout is skipped
+                now = time.monotonic()
+                for future in [f for f in pending if futures[f] in started and started[futures[f]] + timeout <= now]:
+                    # The call itself ends at the section LLM's request timeout
+                    pending.discard(future)
+                    index = futures[future]
+                    section = EXPLANATION_SECTIONS[index]
+                    logger.warning(f"Explanation section '{section['key']}' timed out after {timeout}s")
+                    sections[index] = self._section_result(
+                        section, index,
+                        f"## {section['title']}\n\n_This section timed out and was skipped._",
+                        "timeout"
+                    )
+                
+                if pending:
+                    deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+                    wait_for = min(deadlines) - now if deadlines else _SECTION_POLL_SECONDS
+                    if len(deadlines) < len(pending):
+                        # Sections still queued have no deadline yet; check back for them
+                        wait_for = min(wait_for, _SECTION_POLL_SECONDS)
+                    done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = futures[future]
+                        section = EXPLANATION_SECTIONS[index]
+                        try:
+                            sections[index] = self._section_result(section, index, future.result(), "complete")
+                        except Exception as e:
+                            logger.error(f"Explanation section '{section['key']}' failed: {str(e)}")
+                            sections[index] = self._section_result(
+                                section, index,
+                                f"## {section['title']}\n\n_This section could not be generated._",
+                                "failed"
+                            )
+                
+                # Emit every section that is now contiguous with what was already sent
+                while next_to_emit < len(sections) and sections[next_to_emit] is not None:
+                    emit(state, {"type": "section", "section": sections[next_to_emit]})
+                    next_to_emit += 1
+            
+            if all(section["status"] != "complete" for section in sections):
+                raise ValueError("No explanation section could be generated")
+            
+            explanation = "\n\n".join(section["content"] for section in sections)
+            
+            return {
+                **state,
+                "explanation": explanation,
+                "explanation_sections": sections,
+                "stage": "explanation_generated"
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in _generate_explanation_sectioned: {str(e)}")
             return {
                 **state,
-                "diagram_url": diagram_url,
-                "d3_components": components,
-                "diagram_id": diagram_id,
+                "error": f"Failed to generate explanation: {str(e)}",
+                "stage": "error"
+            }
+    
+    def _section_result(self, section: Dict[str, str], index: int, content: str, status: str) -> Dict[str, Any]:
+        """Build the payload describing one explanation section"""
+        return {
+            "index": index,
+            "key": section["key"],
+            "title": section["title"],
+            "content": content,
+            "status": status
+        }
+    
+    def _create_diagram_url(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Fourth stage: Create PlantUML diagram URL and extract components for D3"""
+        try:
+            plantuml_code = state["plantuml_code"]
+            
+            logger.info("Creating diagram URL and extracting components")
+            
+            return {
+                **state,
+                **self._build_diagram(plantuml_code),
                 "stage": "diagram_complete"
             }
             
@@ -353,6 +626,24 @@ class SystemDesignGenerationSystem:
                 "stage": "error"
             }
     
+    def _build_diagram(self, plantuml_code: str) -> Dict[str, Any]:
+        """Create the PlantUML diagram URL and D3 payload for a diagram"""
+        # Generate PlantUML diagram URL using our custom encoder
+        encoded = encode_plantuml(plantuml_code)
+        diagram_url = f"https://www.plantuml.com/plantuml/img/{encoded}"
+        
+        # Extract components and relationships for D3 visualization
+        components = self._extract_d3_components(plantuml_code)
+        
+        # Generate unique ID for this diagram
+        diagram_id = str(uuid.uuid4())[:8]
+        
+        return {
+            "diagram_url": diagram_url,
+            "d3_components": components,
+            "diagram_id": diagram_id
+        }
+    
     def _should_continue_or_end(self, state: Dict[str, Any]) -> str:
         """Decision node: determine next step based on current stage"""
         stage = state.get("stage", "")
@@ -480,9 +771,22 @@ class SystemDesignGenerationSystem:
                         'y': 300
                     })
             
-            # Parse relationships
-            if '-->' in line:
-                match = re.search(r'(\w+)\s+-->\s+(\w+)(?:\s*:\s*(.+))?', line)
+            # Parse sequence participants and deployment nodes
+            if line.startswith('participant ') or line.startswith('node '):
+                match = re.search(r'^(participant|node)\s+"([^"]+)"\s+as\s+(\w+)', line)
+                if match:
+                    nodes.append({
+                        'id': match.group(3),
+                        'label': match.group(2),
+                        'type': match.group(1),
+                        'x': 100 + len(nodes) * 150,
+                        'y': 150 if match.group(1) == 'participant' else 250
+                    })
+            
+            # Parse relationships and sequence messages (->, ->>, --> and -->>,
+            # with or without spaces around the arrow)
+            if '->' in line:
+                match = re.search(r'^(\w+)\s*-{1,2}>>?\s*(\w+)(?:\s*:\s*(.+))?', line)
                 if match:
                     links.append({
                         'source': match.group(1),
@@ -546,8 +850,13 @@ class SystemDesignGenerationSystem:
         compiled_graph = workflow.compile()
         return compiled_graph
     
-    def create_system_design_stream(self, prompt: str) -> Generator[Dict[str, Any], None, None]:
-        """Generate system design with streaming progress updates"""
+    def create_system_design_stream(self, prompt: str, parallel_explanation: bool = False) -> Generator[Dict[str, Any], None, None]:
+        """Generate system design with streaming progress updates
+        
+        With ``parallel_explanation`` the explanation is generated as concurrent
+        per-section requests and each section is streamed as soon as it (and every
+        section before it) is ready.
+        """
         logger.info(f"Starting system design generation for prompt: {prompt}")
         
         workflow = self.build_graph()
@@ -556,13 +865,17 @@ class SystemDesignGenerationSystem:
             "user_prompt": prompt,
             "stage": "starting"
         }
+        if parallel_explanation:
+            initial_state["explanation_mode"] = "sectioned"
         
         try:
             # Stream the execution
-            for state_update in workflow.stream(initial_state, {"recursion_limit": 20}):
-                # Get the actual state dictionary
-                last_node = list(state_update.keys())[-1]
-                current_state = state_update[last_node]
+            for item in stream_workflow(workflow, initial_state, name="system-design"):
+                if "event" in item:
+                    yield self._format_event(item["event"])
+                    continue
+                
+                current_state = item["node"]
                 
                 # Determine progress based on stage
                 stage = current_state.get("stage", "starting")
@@ -589,7 +902,8 @@ class SystemDesignGenerationSystem:
                     "explanation": current_state.get("explanation"),
                     "diagram_url": current_state.get("diagram_url"),
                     "d3_components": current_state.get("d3_components"),
-                    "diagram_id": current_state.get("diagram_id")
+                    "diagram_id": current_state.get("diagram_id"),
+                    "explanation_sections": current_state.get("explanation_sections")
                 }
                 
         except Exception as e:
@@ -602,11 +916,119 @@ class SystemDesignGenerationSystem:
                 "stage_description": "Error occurred during processing"
             }
     
-    def create_system_design(self, prompt: str) -> Dict[str, Any]:
+    def create_multi_view_stream(self, prompt: str, views: List[str]) -> Generator[Dict[str, Any], None, None]:
+        """Generate several diagram views of one design from a single analysis
+        
+        The requirements are analysed once; every requested view is then generated
+        concurrently and streamed back (with its diagram URL and D3 payload) as soon
+        as it finishes, so N views cost one analysis plus N parallel generations.
+        """
+        logger.info(f"Starting multi-view generation ({', '.join(views)}) for prompt: {prompt}")
+        
+        try:
+            state = self._analyze_requirements({"user_prompt": prompt, "stage": "starting"})
+            if state["stage"] == "error":
+                yield {
+                    "status": "error",
+                    "progress": -1,
+                    "stage": "error",
+                    "stage_description": self._get_stage_description("error"),
+                    "error": state.get("error")
+                }
+                return
+            
+            analysis = state["analysis"]
+            yield {
+                "status": "in_progress",
+                "progress": 10,
+                "stage": "requirements_analyzed",
+                "stage_description": self._get_stage_description("requirements_analyzed"),
+                "analysis": analysis
+            }
+            
+            futures = {
+                self.llm_executor.submit(self._request_view_plantuml, view_type, prompt, analysis): view_type
+                for view_type in views
+            }
+            
+            results: Dict[str, Dict[str, Any]] = {}
+            for future in as_completed(futures):
+                view_type = futures[future]
+                try:
+                    plantuml_code = future.result()
+                    view = {
+                        "view_type": view_type,
+                        "title": DIAGRAM_VIEWS[view_type]["title"],
+                        "status": "complete",
+                        "plantuml_code": plantuml_code,
+                        **self._build_diagram(plantuml_code)
+                    }
+                except Exception as e:
+                    logger.error(f"Error generating {view_type} view: {str(e)}")
+                    view = {
+                        "view_type": view_type,
+                        "title": DIAGRAM_VIEWS[view_type]["title"],
+                        "status": "failed",
+                        "error": f"Failed to generate {view_type} view: {str(e)}"
+                    }
+                
+                results[view_type] = view
+                yield {
+                    "status": "in_progress",
+                    "type": "view",
+                    "progress": 10 + int(90 * len(results) / len(views)) - 1,
+                    "stage": "view_generated",
+                    "stage_description": f"{view['title']} ready",
+                    "view": view
+                }
+            
+            failed = all(view["status"] == "failed" for view in results.values())
+            yield {
+                "status": "error" if failed else "complete",
+                "progress": -1 if failed else 100,
+                "stage": "error" if failed else "views_complete",
+                "stage_description": self._get_stage_description("error" if failed else "views_complete"),
+                "error": "No diagram view could be generated" if failed else None,
+                "analysis": analysis,
+                "views": [results[view_type] for view_type in views]
+            }
+            
+        except Exception as e:
+            logger.error(f"Multi-view generation failed: {str(e)}")
+            yield {
+                "status": "error",
+                "progress": -1,
+                "stage": "error",
+                "error": f"Multi-view generation failed: {str(e)}",
+                "stage_description": "Error occurred during processing"
+            }
+    
+    def _format_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn an intermediate node event into a streaming update"""
+        if event["type"] == "section":
+            section = event["section"]
+            return {
+                "status": "in_progress",
+                "type": "section",
+                "progress": 50 + int(25 * (section["index"] + 1) / len(EXPLANATION_SECTIONS)),
+                "stage": "explanation_section",
+                "stage_description": f"Writing {section['title']}...",
+                "section": section
+            }
+        
+        # Token-level "delta" events and the consolidated "final" event per field
+        return {
+            "status": "in_progress",
+            "progress": 50,
+            "stage_description": self._get_stage_description(event["stage"]),
+            **event
+        }
+    
+    def create_system_design(self, prompt: str, parallel_explanation: bool = False) -> Dict[str, Any]:
         """Create system design and return final result (non-streaming)"""
         # Get the final state from the stream
         final_result = None
-        for update in self.create_system_design_stream(prompt):
+        for update in self.create_system_design_stream(prompt, parallel_explanation):
             final_result = update
         
         if final_result and final_result.get("status") == "complete":
@@ -616,7 +1038,8 @@ class SystemDesignGenerationSystem:
                 "explanation": final_result.get("explanation"),
                 "diagram_url": final_result.get("diagram_url"),
                 "d3_components": final_result.get("d3_components"),
-                "diagram_id": final_result.get("diagram_id")
+                "diagram_id": final_result.get("diagram_id"),
+                "explanation_sections": final_result.get("explanation_sections")
             }
         else:
             error_msg = final_result.get("error", "Unknown error") if final_result else "No result received"
@@ -636,6 +1059,10 @@ class SystemDesignGenerationSystem:
             "requirements_analyzed": "Analyzing system requirements and architecture patterns...",
             "plantuml_generated": "Generating PlantUML component diagram...",
             "explanation_generated": "Creating detailed architecture explanation...",
+            "explanation_section": "Writing architecture explanation sections...",
+            "explanation_streaming": "Writing architecture explanation...",
+            "view_generated": "Generating diagram views...",
+            "views_complete": "All diagram views generated successfully!",
             "diagram_complete": "System design generated successfully!",
             "error": "An error occurred during processing"
         }
@@ -1,11 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
-from typing import Optional
-import json
-import asyncio
+from typing import Optional, List
 import logging
-from .agent import SystemDesignGenerationSystem
+from common.stream_runs import StreamRunRegistry, run_event_response, parse_last_event_id
+from common.services import services, FAILED
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,11 +11,26 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/system-design", tags=["System Design"])
 
-# Initialize the system design system
-system_design_system = SystemDesignGenerationSystem()
+# The system design system is built on first use (or during startup warmup)
+def _create_system_design_system():
+    from .agent import SystemDesignGenerationSystem
+    return SystemDesignGenerationSystem()
+
+
+services.register("system_design", _create_system_design_system)
+system_design_runs = StreamRunRegistry("system-design")
+
+
+async def _get_system_design_system():
+    """The system design system, waiting for its initialization if needed"""
+    try:
+        return await services.aget("system_design")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"System design service unavailable: {str(e)}")
 
 class SystemDesignRequest(BaseModel):
     prompt: str
+    parallel_explanation: bool = False
 
 class SystemDesignResponse(BaseModel):
     analysis: Optional[dict] = None
@@ -26,9 +39,19 @@ class SystemDesignResponse(BaseModel):
     diagram_url: Optional[str] = None
     d3_components: dict
     diagram_id: Optional[str] = None
+    explanation_sections: Optional[List[dict]] = None
 
 class StreamingSystemDesignRequest(BaseModel):
     prompt: str
+    parallel_explanation: bool = False
+    # Send only the fields that changed since the previous event
+    delta_events: bool = False
+
+class MultiViewSystemDesignRequest(BaseModel):
+    prompt: str
+    views: List[str] = ["component", "sequence", "deployment"]
+    # Send only the fields that changed since the previous event
+    delta_events: bool = False
 
 @router.post("/generate", response_model=SystemDesignResponse)
 async def generate_system_design(request: SystemDesignRequest):
@@ -36,9 +59,13 @@ async def generate_system_design(request: SystemDesignRequest):
     if not request.prompt or not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required and cannot be empty")
     
+    system_design_system = await _get_system_design_system()
     try:
         logger.info(f"Generating system design for: {request.prompt[:100]}...")
-        result = system_design_system.create_system_design(request.prompt.strip())
+        result = system_design_system.create_system_design(
+            request.prompt.strip(),
+            parallel_explanation=request.parallel_explanation
+        )
         
         return SystemDesignResponse(
             analysis=result["analysis"],
@@ -46,7 +73,8 @@ async def generate_system_design(request: SystemDesignRequest):
             explanation=result["explanation"],
             diagram_url=result["diagram_url"],
             d3_components=result["d3_components"],
-            diagram_id=result["diagram_id"]
+            diagram_id=result["diagram_id"],
+            explanation_sections=result.get("explanation_sections")
         )
         
     except Exception as e:
@@ -59,47 +87,89 @@ async def generate_system_design_stream(request: StreamingSystemDesignRequest):
     if not request.prompt or not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required and cannot be empty")
     
-    async def event_stream():
-        try:
-            logger.info(f"Starting streaming generation for: {request.prompt[:100]}...")
-            for update in system_design_system.create_system_design_stream(request.prompt.strip()):
-                # Format as Server-Sent Events
-                event_data = json.dumps(update)
-                yield f"data: {event_data}\n\n"
-                
-                # Small delay to prevent overwhelming the client
-                await asyncio.sleep(0.1)
-                
-        except Exception as e:
-            logger.error(f"Streaming error: {str(e)}")
-            error_data = json.dumps({
-                "status": "error",
-                "error": f"Error generating system design: {str(e)}",
-                "progress": -1,
-                "stage": "error",
-                "stage_description": "Generation failed"
-            })
-            yield f"data: {error_data}\n\n"
+    system_design_system = await _get_system_design_system()
+    logger.info(f"Starting streaming generation for: {request.prompt[:100]}...")
+    # The pipeline runs independently of this connection; clients that drop can
+    # re-attach with Last-Event-ID without re-triggering it
+    run = system_design_runs.start(
+        lambda: system_design_system.create_system_design_stream(
+            request.prompt.strip(),
+            parallel_explanation=request.parallel_explanation
+        ),
+        delta_events=request.delta_events,
+        error_update=lambda e: {
+            "status": "error",
+            "error": f"Error generating system design: {str(e)}",
+            "progress": -1,
+            "stage": "error",
+            "stage_description": "Generation failed"
+        }
+    )
+    return run_event_response(run)
+
+@router.post("/generate-multi-view-stream")
+async def generate_multi_view_stream(request: MultiViewSystemDesignRequest):
+    """
+    Generate several diagram views (component, sequence, deployment) of one design
     
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "*",
-            "Access-Control-Allow-Methods": "*",
+    The requirements are analysed once and the views are generated in parallel;
+    each view is streamed as a "view" event as soon as it is ready. Resumable via
+    GET /generate-stream/{run_id} like the single-diagram stream.
+    """
+    if not request.prompt or not request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt is required and cannot be empty")
+    
+    system_design_system = await _get_system_design_system()
+    from .agent import DIAGRAM_VIEWS
+    
+    views = list(dict.fromkeys(request.views))
+    unknown = [view for view in views if view not in DIAGRAM_VIEWS]
+    if not views or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Views must be chosen from: {', '.join(DIAGRAM_VIEWS)}"
+        )
+    
+    logger.info(f"Starting multi-view generation ({', '.join(views)}) for: {request.prompt[:100]}...")
+    run = system_design_runs.start(
+        lambda: system_design_system.create_multi_view_stream(request.prompt.strip(), views),
+        delta_events=request.delta_events,
+        error_update=lambda e: {
+            "status": "error",
+            "error": f"Error generating system design views: {str(e)}",
+            "progress": -1,
+            "stage": "error",
+            "stage_description": "Generation failed"
         }
     )
+    return run_event_response(run)
+
+@router.get("/generate-stream/{run_id}")
+async def resume_system_design_stream(
+    run_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Re-attach to a running or recently finished generation stream
+    
+    Replays the events after Last-Event-ID (header, or last_event_id query parameter
+    for clients that cannot set headers) and then continues live. Never restarts
+    the pipeline.
+    """
+    run = system_design_runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Stream not found or expired")
+    
+    return run_event_response(run, parse_last_event_id(last_event_id_header, last_event_id))
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint for the system design service"""
     return {
-        "status": "healthy",
+        "status": "healthy" if services.state("system_design") != FAILED else "unhealthy",
         "service": "System Design Generator (LangGraph)",
+        "state": services.state("system_design"),
         "features": [
             "LangGraph workflow",
             "Streaming progress updates", 
@@ -119,8 +189,9 @@ async def health_check():
         Status information
     """
     return {
-        "status": "healthy",
+        "status": "healthy" if services.state("system_design") != FAILED else "unhealthy",
         "service": "System Design Generator (LangGraph)",
+        "state": services.state("system_design"),
         "features": [
             "LangGraph workflow",
             "Streaming progress updates",
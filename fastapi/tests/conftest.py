@@ -0,0 +1,55 @@
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# The service packages are imported from the app directory, as app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeTTSWorker:
+    """Stands in for the TTS worker: writes the text as the "audio" file"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.texts = []
+
+    async def synthesize(self, text, output_path, exaggeration=0.5, cfg_weight=0.5, priority=0):
+        self.texts.append(text)
+        await asyncio.sleep(self.delay)
+        Path(output_path).write_bytes(text.encode("utf-8"))
+        return output_path
+
+    async def generate(self, text, exaggeration=0.5, cfg_weight=0.5, priority=0):
+        self.texts.append(text)
+        await asyncio.sleep(self.delay)
+        return [0.5] * len(text)
+
+
+@pytest.fixture
+def voice_agent(tmp_path, monkeypatch):
+    """A LeetCodeVoiceAgent without the TTS model, LLM calls or microphone
+
+    Needs the ChatterboxTTS and torch packages to import the agent module.
+    """
+    pytest.importorskip("torch")
+    pytest.importorskip("chatterbox.tts")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_GENERATIVE_AI_API_KEY", "test-key")
+    monkeypatch.setenv("LEETCODE_STT_BACKEND", "fake")
+    from leetcode_qna.agent import LeetCodeVoiceAgent
+
+    agent = LeetCodeVoiceAgent(load_tts=False)
+    agent.tts_worker = FakeTTSWorker()
+
+    async def questions(problem_data, language="Python"):
+        return ["How would you approach this?", "What is the complexity?", "Any edge cases?"]
+
+    async def feedback(question, user_response, context):
+        return f"Feedback on: {user_response}"
+
+    agent.generate_interview_questions = questions
+    agent.generate_feedback = feedback
+    return agent
@@ -0,0 +1,58 @@
+import time
+import asyncio
+
+PROBLEM = {"title": "Two Sum", "difficulty": "Easy"}
+
+
+def test_turn_returns_feedback_and_next_question(voice_agent):
+    async def scenario():
+        started = await voice_agent.start_interview(PROBLEM, "user-1")
+        result = await voice_agent.process_user_response(started["interview_id"], "Use a hash map")
+        session = await voice_agent.sessions.get(started["interview_id"])
+        return started, result, session
+
+    started, result, session = asyncio.run(scenario())
+    interview_id = started["interview_id"]
+    assert result["success"]
+    assert result["feedback"] == "Feedback on: Use a hash map"
+    assert result["next_question"] == "What is the complexity?"
+    assert result["feedback_audio_path"] == f"/leetcode-qna/audio/feedback_{interview_id}_0.wav"
+    assert result["next_question_audio_path"] == f"/leetcode-qna/audio/question_{interview_id}_1.wav"
+    assert session["current_question_index"] == 1
+    assert session["responses"][0]["response"] == "Use a hash map"
+
+
+def test_next_question_audio_is_synthesized_alongside_feedback(voice_agent):
+    async def slow_feedback(question, user_response, context):
+        await asyncio.sleep(0.3)
+        return "Good"
+
+    async def scenario():
+        started = await voice_agent.start_interview(PROBLEM, "user-1")
+        # Nothing prefetched: the turn has to synthesize the next question itself
+        voice_agent.question_prefetcher.cancel(started["interview_id"])
+        voice_agent.tts_worker.delay = 0.3
+        voice_agent.generate_feedback = slow_feedback
+        began = time.monotonic()
+        result = await voice_agent.process_user_response(started["interview_id"], "Sort first")
+        return result, time.monotonic() - began
+
+    result, elapsed = asyncio.run(scenario())
+    assert result["success"]
+    # Feedback (0.3s) then its audio (0.3s); the question audio overlaps the feedback
+    assert elapsed < 0.85
+
+
+def test_failed_feedback_keeps_the_turn_retryable(voice_agent):
+    async def failing_feedback(question, user_response, context):
+        raise RuntimeError("LLM unavailable")
+
+    async def scenario():
+        started = await voice_agent.start_interview(PROBLEM, "user-1")
+        voice_agent.generate_feedback = failing_feedback
+        result = await voice_agent.process_user_response(started["interview_id"], "Brute force")
+        return result, await voice_agent.sessions.get(started["interview_id"])
+
+    result, session = asyncio.run(scenario())
+    assert not result["success"]
+    assert session["current_question_index"] == 0
@@ -0,0 +1,70 @@
+import asyncio
+
+from leetcode_qna.artifacts import ArtifactRegistry
+
+
+def _registry(tmp_path, retention_seconds=60):
+    return ArtifactRegistry(tmp_path, [".mp3", ".ogg"], retention_seconds=retention_seconds)
+
+
+def _write(tmp_path, *names):
+    for name in names:
+        (tmp_path / name).write_bytes(b"audio")
+
+
+def test_delete_session_removes_registered_files_and_variants(tmp_path):
+    _write(tmp_path, "q1.wav", "q1.mp3", "q1.ogg", "q2.wav", "other.wav")
+    registry = _registry(tmp_path)
+    registry.register("a", str(tmp_path / "q1.wav"))
+    registry.register("a", "q1.wav")
+    registry.register("a", "q2.wav")
+
+    assert registry.files("a") == ["q1.wav", "q2.wav"]
+    assert asyncio.run(registry.delete_session("a")) == 4
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["other.wav"]
+    stats = registry.get_stats()
+    assert (stats["registered"], stats["deleted"], stats["sessions"]) == (2, 4, 0)
+
+
+def test_ended_session_is_deleted_after_retention(tmp_path):
+    _write(tmp_path, "q1.wav")
+    registry = _registry(tmp_path, retention_seconds=0.02)
+    registry.register("a", "q1.wav")
+
+    async def scenario():
+        registry.mark_ended("a")
+        assert (tmp_path / "q1.wav").exists()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert not (tmp_path / "q1.wav").exists()
+    assert registry.get_stats()["ended_sessions"] == 0
+
+
+def test_expired_session_is_deleted_immediately(tmp_path):
+    _write(tmp_path, "q1.wav")
+    registry = _registry(tmp_path)
+    registry.register("a", "q1.wav")
+
+    async def scenario():
+        registry.mark_ended("a")
+        registry.expire("a")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert not (tmp_path / "q1.wav").exists()
+    assert registry._timers == {}
+
+
+def test_purge_ended_spares_active_sessions(tmp_path):
+    _write(tmp_path, "ended.wav", "active.wav")
+    registry = _registry(tmp_path)
+    registry.register("ended", "ended.wav")
+    registry.register("active", "active.wav")
+
+    async def scenario():
+        registry.mark_ended("ended")
+        return await registry.purge_ended()
+
+    assert asyncio.run(scenario()) == {"sessions": 1, "files": 1}
+    assert [path.name for path in tmp_path.iterdir()] == ["active.wav"]
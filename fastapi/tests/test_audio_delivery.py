@@ -0,0 +1,91 @@
+import asyncio
+
+from fastapi.responses import FileResponse
+
+from leetcode_qna.audio_delivery import AudioEncoder, audio_url, negotiate_formats, ranged_file_response
+
+PREFERRED = ["opus", "mp3"]
+
+
+def test_negotiate_explicit_request_wins():
+    assert negotiate_formats(PREFERRED, "audio/mpeg", requested="opus") == ["opus", "wav"]
+    assert negotiate_formats(PREFERRED, requested="wav") == ["wav"]
+
+
+def test_negotiate_ranks_by_quality():
+    assert negotiate_formats(PREFERRED, "audio/ogg;q=0.5, audio/mpeg") == ["mp3", "opus", "wav"]
+    assert negotiate_formats(PREFERRED, "audio/mpeg, audio/ogg;q=0") == ["mp3", "wav"]
+
+
+def test_negotiate_wildcards_follow_server_preference():
+    assert negotiate_formats(PREFERRED, None) == ["opus", "mp3", "wav"]
+    assert negotiate_formats(PREFERRED, "audio/*") == ["opus", "mp3", "wav"]
+    assert negotiate_formats(["mp3"], "audio/ogg") == ["wav"]
+
+
+def test_audio_url_uses_the_wav_name():
+    assert audio_url("/tmp/media/leetcode_audio/welcome.1700000000.5.wav") == \
+        "/leetcode-qna/audio/welcome.1700000000.5.wav"
+    assert audio_url(None) is None
+
+
+async def _body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_ranged_response(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(bytes(range(100)))
+
+    response = ranged_file_response(path, "audio/wav", "bytes=10-19")
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == "bytes 10-19/100"
+    assert asyncio.run(_body(response)) == bytes(range(10, 20))
+
+    suffix = ranged_file_response(path, "audio/wav", "bytes=-5")
+    assert suffix.headers["Content-Range"] == "bytes 95-99/100"
+    assert asyncio.run(_body(suffix)) == bytes(range(95, 100))
+
+    open_ended = ranged_file_response(path, "audio/wav", "bytes=90-")
+    assert open_ended.headers["Content-Length"] == "10"
+
+
+def test_unsatisfiable_and_missing_ranges(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"x" * 10)
+
+    response = ranged_file_response(path, "audio/wav", "bytes=20-30")
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */10"
+
+    whole = ranged_file_response(path, "audio/wav", None, headers={"X-Test": "1"})
+    assert isinstance(whole, FileResponse)
+    assert whole.headers["Accept-Ranges"] == "bytes"
+    assert whole.headers["X-Test"] == "1"
+
+
+def _fake_ffmpeg(tmp_path):
+    # Stands in for ffmpeg: copies the input (after -i) to the output (last argument)
+    script = tmp_path / "ffmpeg"
+    script.write_text('#!/bin/sh\nwhile [ "$1" != "-i" ]; do shift; done\ncp "$2" "$(eval echo \\${$#})"\n')
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_encoder_reports_encoded_files_and_drops_the_wav(tmp_path):
+    wav = tmp_path / "tts_1.5.wav"
+    wav.write_bytes(b"RIFF")
+    encoded = []
+
+    async def scenario():
+        encoder = AudioEncoder(["opus", "mp3"], ffmpeg=_fake_ffmpeg(tmp_path))
+        encoder.schedule(str(wav), on_encoded=encoded.append)
+        assert encoder.is_pending(wav)
+        while encoder.is_pending(wav):
+            await asyncio.sleep(0.01)
+        return encoder.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert sorted(path.name for path in encoded) == ["tts_1.5.mp3", "tts_1.5.ogg"]
+    assert stats["encoded"] == 2
+    assert not wav.exists()
@@ -0,0 +1,44 @@
+import asyncio
+
+import numpy as np
+
+from leetcode_qna.audio_ingest import SpeechIngestSession
+
+SAMPLE_RATE = 16000
+
+
+def _silence(ms):
+    return np.zeros(SAMPLE_RATE * ms // 1000, dtype="<i2").tobytes()
+
+
+def _tone(ms):
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (8000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+
+def test_segments_are_transcribed_and_reported_in_order():
+    events = []
+    # The first segment takes longer to transcribe than the second
+    delays = [0.1, 0.0]
+
+    async def transcribe(pcm, sample_rate):
+        await asyncio.sleep(delays.pop(0))
+        return f"{len(pcm) // 320} frames"
+
+    async def send(event):
+        events.append(event)
+
+    async def scenario():
+        session = SpeechIngestSession(transcribe, send, sample_rate=SAMPLE_RATE)
+        await session.start()
+        for chunk in (_silence(300), _tone(600), _silence(900), _tone(300)):
+            await session.push_audio(chunk)
+        return await session.finish()
+
+    text = asyncio.run(scenario())
+    types = [event["type"] for event in events]
+    assert types[0] == "ready"
+    assert types.count("speech_start") == 2
+    transcripts = [event for event in events if event["type"] == "transcript"]
+    assert [event["segment"] for event in transcripts] == [0, 1]
+    assert events[-1] == {"type": "final", "text": text, "segments": 2}
@@ -0,0 +1,73 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from leetcode_qna import audio_preprocess
+from leetcode_qna.audio_preprocess import preprocess_audio, trim_silence
+
+
+def _tone(seconds, sample_rate, amplitude=0.5):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def _wav_bytes(samples, sample_rate, channels=1):
+    frames = np.repeat(samples[:, None], channels, axis=1)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes((frames * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def _speech_with_silence(sample_rate):
+    silence = np.zeros(sample_rate, dtype=np.float32)
+    return np.concatenate([silence, _tone(1.0, sample_rate), silence])
+
+
+def test_stereo_wav_is_downmixed_resampled_and_trimmed():
+    audio = preprocess_audio(_wav_bytes(_speech_with_silence(44100), 44100, channels=2))
+
+    assert (audio.input_sample_rate, audio.input_channels, audio.sample_rate) == (44100, 2, 16000)
+    assert audio.input_seconds == pytest.approx(3.0)
+    # One second of tone plus the padding kept on either side
+    assert audio.output_seconds == pytest.approx(1.0 + 2 * audio_preprocess.TRIM_PADDING_SECONDS, abs=0.05)
+    rms = np.sqrt(np.mean(np.square(np.frombuffer(audio.pcm, dtype="<i2") / 32768.0)))
+    assert 20 * np.log10(rms) == pytest.approx(audio_preprocess.TARGET_RMS_DBFS, abs=3)
+
+
+def test_silent_upload_becomes_empty():
+    assert trim_silence(np.zeros(16000, dtype=np.float32), 16000).size == 0
+    assert preprocess_audio(_wav_bytes(np.zeros(16000, dtype=np.float32), 16000)).pcm == b""
+
+
+def test_aiff_falls_back_to_speech_recognition_without_ffmpeg(monkeypatch, tmp_path):
+    aifc = pytest.importorskip("aifc")
+    pytest.importorskip("speech_recognition")
+    monkeypatch.setattr(audio_preprocess, "_ffmpeg_binary", lambda: None)
+
+    path = str(tmp_path / "answer.aiff")
+    writer = aifc.open(path, "wb")
+    writer.setnchannels(1)
+    writer.setsampwidth(2)
+    writer.setframerate(16000)
+    writer.writeframes((_speech_with_silence(16000) * 32767).astype(">i2").tobytes())
+    writer.close()
+    with open(path, "rb") as f:
+        data = f.read()
+
+    audio = preprocess_audio(data)
+    assert (audio.input_sample_rate, audio.input_seconds) == (16000, pytest.approx(3.0))
+    assert audio.output_seconds == pytest.approx(1.4, abs=0.05)
+
+
+def test_unknown_format_without_ffmpeg_is_rejected(monkeypatch):
+    pytest.importorskip("speech_recognition")
+    monkeypatch.setattr(audio_preprocess, "_ffmpeg_binary", lambda: None)
+
+    with pytest.raises(ValueError, match="install ffmpeg"):
+        preprocess_audio(b"OggS" + bytes(512))
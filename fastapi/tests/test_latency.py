@@ -0,0 +1,69 @@
+import time
+import asyncio
+
+from leetcode_qna.latency import LatencyTracer, RollingHistogram, current_trace, record_stage, trace_stage
+
+
+def test_histogram_percentiles_over_the_window():
+    histogram = RollingHistogram(window=100)
+    for value in range(1, 201):
+        histogram.add(value)
+    summary = histogram.summary()
+    assert summary["count"] == 200
+    assert summary["window"] == 100
+    assert (summary["p50"], summary["p99"], summary["max"]) == (150, 199, 200)
+    assert RollingHistogram(10).summary() == {"count": 0}
+
+
+def test_turn_collects_stages_from_tasks_it_starts():
+    tracer = LatencyTracer()
+
+    async def synthesize():
+        with trace_stage("text_to_speech", cache_hit=False) as stage:
+            await asyncio.sleep(0.01)
+            stage["chars"] = 12
+
+    async def scenario():
+        with tracer.turn("answer", "interview") as trace:
+            with trace_stage("feedback"):
+                await asyncio.sleep(0.01)
+            await asyncio.create_task(synthesize())
+            record_stage("stt", 0.5, rtf=0.2)
+        return trace
+
+    trace = asyncio.run(scenario())
+    assert [stage["stage"] for stage in trace.stages] == ["feedback", "text_to_speech", "stt"]
+    assert trace.stages[1]["chars"] == 12 and trace.stages[1]["cache_hit"] is False
+    snapshot = tracer.snapshot()
+    assert snapshot["turns"]["answer"]["count"] == 1
+    assert snapshot["stages"]["stt"]["p50"] == 500
+    assert snapshot["metrics"]["stt_rtf"]["p50"] == 0.2
+    assert snapshot["recent_turns"][0]["interview_id"] == "interview"
+
+
+def test_nested_turns_share_the_outer_trace():
+    tracer = LatencyTracer()
+    with tracer.turn("answer") as outer:
+        with tracer.turn("end") as inner:
+            assert inner is outer
+    assert current_trace() is None
+    assert list(tracer.snapshot()["turns"]) == ["answer"]
+
+
+def test_stages_outside_a_turn_or_after_it_are_ignored():
+    tracer = LatencyTracer()
+    record_stage("stt", 0.1)
+    with tracer.turn("answer") as trace:
+        pass
+    trace.record("late", 0.1)
+    assert trace.stages == []
+    assert tracer.snapshot()["stages"] == {}
+
+
+def test_slow_turns_are_counted_against_the_budget():
+    tracer = LatencyTracer(budget_ms=10)
+    with tracer.turn("answer"):
+        time.sleep(0.02)
+    with tracer.turn("answer"):
+        pass
+    assert tracer.snapshot()["over_budget"] == 1
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("torch")
+
+from leetcode_qna.latency import LatencyTracer, current_trace
+from leetcode_qna.prefetch import QuestionPrefetcher, READY
+from leetcode_qna.tts_worker import PRIORITY_LIVE, PRIORITY_BACKGROUND
+
+QUESTIONS = ["First?", "Second?", "Third?"]
+FILENAMES = ["q0.wav", "q1.wav", "q2.wav"]
+
+
+class Recorder:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.traces = []
+
+    async def __call__(self, text, filename, priority):
+        self.calls.append((text, priority))
+        self.traces.append(current_trace())
+        await asyncio.sleep(self.delay)
+        if text in self.fail:
+            raise RuntimeError("synthesis failed")
+        return f"/audio/{filename}"
+
+
+def test_questions_are_prefetched_in_order_at_background_priority():
+    synthesize = Recorder()
+
+    async def scenario():
+        prefetcher = QuestionPrefetcher(synthesize)
+        prefetcher.start("i", QUESTIONS, FILENAMES, first_index=1)
+        await prefetcher._interviews["i"].task
+        return prefetcher.readiness("i"), await prefetcher.audio_for("i", 2)
+
+    readiness, path = asyncio.run(scenario())
+    assert synthesize.calls == [("Second?", PRIORITY_BACKGROUND + 1), ("Third?", PRIORITY_BACKGROUND + 2)]
+    assert [item["state"] for item in readiness] == ["pending", READY, READY]
+    assert path == "/audio/q2.wav"
+    assert len(synthesize.calls) == 2
+
+
+def test_question_not_reached_yet_is_synthesized_live():
+    synthesize = Recorder(delay=0.1)
+
+    async def scenario():
+        prefetcher = QuestionPrefetcher(synthesize)
+        prefetcher.start("i", QUESTIONS, FILENAMES)
+        await asyncio.sleep(0)
+        path = await prefetcher.audio_for("i", 2)
+        prefetcher.cancel("i")
+        return path
+
+    assert asyncio.run(scenario()) == "/audio/q2.wav"
+    assert ("Third?", PRIORITY_LIVE) in synthesize.calls
+    assert ("Third?", PRIORITY_BACKGROUND + 2) not in synthesize.calls
+
+
+def test_failed_prefetch_is_retried_live():
+    synthesize = Recorder(fail={"First?"})
+
+    async def scenario():
+        prefetcher = QuestionPrefetcher(synthesize)
+        prefetcher.start("i", QUESTIONS, FILENAMES)
+        await prefetcher._interviews["i"].task
+        synthesize.fail.clear()
+        return await prefetcher.audio_for("i", 0)
+
+    assert asyncio.run(scenario()) == "/audio/q0.wav"
+    assert synthesize.calls[-1] == ("First?", PRIORITY_LIVE)
+
+
+def test_prefetch_is_not_traced_as_part_of_the_turn_that_started_it():
+    synthesize = Recorder()
+    tracer = LatencyTracer()
+
+    async def scenario():
+        prefetcher = QuestionPrefetcher(synthesize)
+        with tracer.turn("start", "i"):
+            prefetcher.start("i", QUESTIONS, FILENAMES)
+        await prefetcher._interviews["i"].task
+
+    asyncio.run(scenario())
+    assert synthesize.traces == [None, None, None]
+
+
+def test_cancel_stops_the_prefetch():
+    synthesize = Recorder(delay=0.2)
+
+    async def scenario():
+        prefetcher = QuestionPrefetcher(synthesize)
+        prefetcher.start("i", QUESTIONS, FILENAMES)
+        await asyncio.sleep(0.05)
+        task = prefetcher._interviews["i"].task
+        prefetcher.cancel("i")
+        await asyncio.gather(task, return_exceptions=True)
+        return task.cancelled(), prefetcher.has("i")
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert len(synthesize.calls) == 1
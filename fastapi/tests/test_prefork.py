@@ -0,0 +1,14 @@
+import sys
+
+import pytest
+
+import prefork
+
+
+def test_several_workers_need_a_shared_session_store(monkeypatch):
+    monkeypatch.delenv("LEETCODE_SESSION_DB", raising=False)
+    monkeypatch.setattr(sys, "argv", ["prefork.py", "--workers", "2"])
+    monkeypatch.setattr(prefork, "preload", lambda: pytest.fail("preloaded without a session store"))
+
+    with pytest.raises(SystemExit):
+        prefork.main()
@@ -0,0 +1,101 @@
+import json
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from leetcode_qna.pregenerate import BundleBuilder, _main, load_question_bundle, read_checkpoint
+from leetcode_qna.question_bank import QuestionBank, question_bank_key
+from leetcode_qna.tts_cache import TTSCache, TTS_MODEL_VERSION
+
+CATALOG = [
+    {"titleSlug": "two-sum", "title": "Two Sum", "difficulty": "Easy"},
+    {"titleSlug": "lru-cache", "title": "LRU Cache", "difficulty": "Medium"},
+]
+
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = []
+
+    async def request_question_set(self, problem_data, language):
+        self.calls.append(problem_data["titleSlug"])
+        return [f"Question {index} on {problem_data['title']} ({len(self.calls)})?" for index in range(4)]
+
+
+def _builder(agent, output):
+    return BundleBuilder(agent, output, sets_per_key=2, concurrency=2, requests_per_minute=0, with_audio=False)
+
+
+def test_bundle_is_written_and_a_rerun_resumes(tmp_path):
+    agent = FakeAgent()
+    asyncio.run(_builder(agent, tmp_path).run(CATALOG[:1], ["Python"]))
+    assert agent.calls == ["two-sum", "two-sum"]
+
+    rerun = _builder(agent, tmp_path)
+    asyncio.run(rerun.run(CATALOG, ["Python"]))
+    assert agent.calls[2:] == ["lru-cache", "lru-cache"]
+    assert rerun.stats["skipped"] == 1
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert sorted(index["entries"]) == ["lru-cache|medium|python", "two-sum|easy|python"]
+    assert len(index["entries"]["two-sum|easy|python"]["sets"]) == 2
+
+
+def test_torn_checkpoint_line_is_ignored(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text('{"key": "a|easy|python", "sets": []}\n{"key": "b|ea')
+    assert list(read_checkpoint(path)) == ["a|easy|python"]
+
+
+def test_bundle_loads_into_the_bank_and_tts_cache(tmp_path):
+    bundle = tmp_path / "bundle"
+    (bundle / "audio").mkdir(parents=True)
+    questions = [f"Question {index} on Two Sum?" for index in range(4)]
+    audio = []
+    for index in range(4):
+        (bundle / "audio" / f"{index}.wav").write_bytes(b"RIFF")
+        audio.append(f"audio/{index}.wav")
+    key = question_bank_key(CATALOG[0], "Python")
+    (bundle / "index.json").write_text(json.dumps({
+        "tts_model_version": TTS_MODEL_VERSION,
+        "entries": {key: {"title": "Two Sum", "language": "Python", "sets": [{"questions": questions, "audio": audio}]}}
+    }))
+
+    bank = QuestionBank(FakeAgent().request_question_set)
+    cache = TTSCache(tmp_path / "cache")
+    loaded = load_question_bundle(bundle, bank, cache, 0.5, 0.5)
+
+    assert loaded == {"sets": 1, "audio": 4}
+    assert cache.lookup(cache.key(questions[2], 0.5, 0.5)) is not None
+    assert asyncio.run(bank.get_questions(CATALOG[0], "Python")) == questions
+
+
+def test_audio_from_another_model_is_not_imported(tmp_path):
+    (tmp_path / "index.json").write_text(json.dumps({"tts_model_version": "other", "entries": {}}))
+    cache = SimpleNamespace(model_version=TTS_MODEL_VERSION)
+    assert load_question_bundle(tmp_path, QuestionBank(FakeAgent().request_question_set), cache, 0.5, 0.5) == \
+        {"sets": 0, "audio": 0}
+
+
+def test_no_audio_run_does_not_load_the_tts_model(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("chatterbox.tts")
+    from leetcode_qna import agent as agent_module
+
+    created = []
+
+    class Agent(FakeAgent):
+        def __init__(self, load_tts=True):
+            super().__init__()
+            created.append(load_tts)
+
+    monkeypatch.setattr(agent_module, "LeetCodeVoiceAgent", Agent)
+    catalog = tmp_path / "catalog.jsonl"
+    catalog.write_text("\n".join(json.dumps(problem) for problem in CATALOG))
+    args = SimpleNamespace(catalog=str(catalog), output=str(tmp_path / "bundle"), languages=["Python"],
+                           sets=1, concurrency=2, requests_per_minute=0, no_audio=True)
+    asyncio.run(_main(args))
+
+    assert created == [False]
+    assert (tmp_path / "bundle" / "index.json").exists()
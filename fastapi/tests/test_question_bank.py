@@ -0,0 +1,98 @@
+import asyncio
+
+from leetcode_qna.question_bank import QuestionBank, question_bank_key, validate_question_set
+
+PROBLEM = {"titleSlug": "two-sum", "title": "Two Sum", "difficulty": "Easy"}
+
+
+def _questions(tag):
+    return [f"Question {index} about the problem ({tag})?" for index in range(5)]
+
+
+class Generator:
+    def __init__(self, delay=0.0, results=None):
+        self.delay = delay
+        self.calls = 0
+        self.results = results
+
+    async def __call__(self, problem_data, language):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.results is not None:
+            return self.results.pop(0) if self.results else None
+        return _questions(self.calls)
+
+
+def test_key_and_validation():
+    assert question_bank_key(PROBLEM, "Python") == "two-sum|easy|python"
+    untitled = question_bank_key({"title": "Two Sum", "content": "..."}, "Java")
+    assert untitled.endswith("|medium|java") and len(untitled.split("|")[0]) == 16
+
+    assert validate_question_set(["  What   is the complexity?  "] * 5) is None
+    assert validate_question_set(_questions("a")) == _questions("a")
+    assert validate_question_set(_questions("a")[:3]) is None
+    assert validate_question_set("not a list") is None
+
+
+def test_concurrent_cold_misses_share_one_generation():
+    generate = Generator(delay=0.05)
+
+    async def scenario():
+        bank = QuestionBank(generate, sets_per_key=1)
+        return await asyncio.gather(*[bank.get_questions(PROBLEM, "Python") for _ in range(3)]), bank
+
+    results, bank = asyncio.run(scenario())
+    assert generate.calls == 1
+    assert results[0] == results[1] == results[2] == _questions(1)
+    assert bank.get_stats()["misses"] == 3
+
+
+def test_bank_refills_in_the_background_and_serves_hits():
+    generate = Generator()
+
+    async def scenario():
+        bank = QuestionBank(generate, sets_per_key=3)
+        await bank.get_questions(PROBLEM, "Python")
+        await asyncio.gather(*bank._refills.values())
+        questions = await bank.get_questions(PROBLEM, "Python")
+        return bank.get_stats(), questions
+
+    stats, questions = asyncio.run(scenario())
+    assert stats["sets"] == 3
+    assert stats["hits"] == 1
+    assert questions in [_questions(index) for index in (1, 2, 3)]
+
+
+def test_worn_out_sets_are_retired_but_the_last_one_is_kept():
+    async def scenario():
+        bank = QuestionBank(Generator(results=[]), sets_per_key=2, max_uses=1)
+        key = question_bank_key(PROBLEM, "Python")
+        bank.add_set(key, _questions("a"))
+        bank.add_set(key, _questions("b"))
+        for _ in range(3):
+            await bank.get_questions(PROBLEM, "Python")
+        return len(bank._sets[key])
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_bank_survives_a_restart(tmp_path):
+    path = tmp_path / "bank.json"
+
+    async def scenario():
+        await QuestionBank(Generator(), path=path, sets_per_key=1).get_questions(PROBLEM, "Python")
+        generate = Generator()
+        questions = await QuestionBank(generate, path=path, sets_per_key=1).get_questions(PROBLEM, "Python")
+        return questions, generate.calls
+
+    assert asyncio.run(scenario()) == (_questions(1), 0)
+
+
+def test_invalid_generation_is_rejected():
+    async def scenario():
+        bank = QuestionBank(Generator(results=[["too short"]]), sets_per_key=1)
+        return await bank.get_questions(PROBLEM, "Python"), bank.get_stats()
+
+    questions, stats = asyncio.run(scenario())
+    assert questions is None
+    assert stats["rejected"] == 1
@@ -0,0 +1,97 @@
+import json
+import asyncio
+from types import SimpleNamespace
+
+from leetcode_qna.reports import JSONSectionScanner, ReportJobManager
+
+
+def _feed_in_chunks(text, size):
+    scanner = JSONSectionScanner()
+    sections = []
+    for start in range(0, len(text), size):
+        sections += scanner.feed(text[start:start + size])
+    return sections
+
+
+REPORT = '```json\n{"overall_score": 7, "strengths": ["clear, concise {answers}"], ' \
+         '"feedback": {"communication": "good \\"pace\\""}, "summary": "ok"}\n```'
+
+
+def test_sections_complete_in_order_whatever_the_chunking():
+    expected = [
+        ("overall_score", 7),
+        ("strengths", ["clear, concise {answers}"]),
+        ("feedback", {"communication": 'good "pace"'}),
+        ("summary", "ok"),
+    ]
+    for size in (1, 3, 17, len(REPORT)):
+        assert _feed_in_chunks(REPORT, size) == expected
+
+
+def test_member_is_emitted_as_soon_as_it_is_complete():
+    scanner = JSONSectionScanner()
+    assert scanner.feed('{"score": 9, "notes": "still') == [("score", 9)]
+    assert scanner.feed(' writing"') == []
+    assert scanner.feed("}") == [("notes", "still writing")]
+
+
+def test_invalid_members_are_skipped():
+    assert _feed_in_chunks('{"a": nope, "b": 2}', 4) == [("b", 2)]
+
+
+def test_report_job_streams_sections_and_completes():
+    async def generate(on_section):
+        await on_section("overall_score", 8)
+        return {"overall_score": 8}
+
+    async def scenario():
+        manager = ReportJobManager()
+        job = manager.start("interview", generate)
+        await job.task
+        frames = [frame async for frame in job.run.subscribe()]
+        return manager.get(job.report_id), frames
+
+    job, frames = asyncio.run(scenario())
+    assert job.status == "completed"
+    assert job.sections == {"overall_score": 8}
+    assert job.to_dict()["performance_report"] == {"overall_score": 8}
+    assert [json.loads(frame.split("data: ", 1)[1])["type"] for frame in frames] == ["section", "complete"]
+
+
+def test_failed_report_job_records_the_error():
+    async def generate(on_section):
+        raise RuntimeError("LLM unavailable")
+
+    async def scenario():
+        manager = ReportJobManager()
+        job = manager.start("interview", generate)
+        await job.task
+        return job, manager.active_count()
+
+    job, active = asyncio.run(scenario())
+    assert (job.status, job.error, active) == ("failed", "LLM unavailable", 0)
+
+
+class FakeReportLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def astream(self, messages):
+        self.calls += 1
+        for chunk in ('{"overall_score": 7, ', '"summary": "solid"}'):
+            yield SimpleNamespace(content=chunk)
+
+
+def test_ending_an_interview_twice_returns_the_same_report(voice_agent):
+    voice_agent.llm = FakeReportLLM()
+
+    async def scenario():
+        started = await voice_agent.start_interview({"title": "Two Sum", "difficulty": "Easy"}, "user-1")
+        first = await voice_agent.end_interview(started["interview_id"])
+        second = await voice_agent.end_interview(started["interview_id"], wait_for_report=True)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second["report_id"] == first["report_id"]
+    assert second["performance_report"]["overall_score"] == 7
+    assert voice_agent.llm.calls == 1
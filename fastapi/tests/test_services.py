@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+
+from common.services import FAILED, READY, REGISTERED, ServiceRegistry
+
+
+def test_service_is_built_once_on_first_use():
+    registry = ServiceRegistry()
+    builds = []
+    registry.register("agent", lambda: builds.append(threading.current_thread().name) or "agent instance")
+
+    assert registry.state("agent") == REGISTERED
+    assert registry.peek("agent") is None
+
+    async def scenario():
+        return await asyncio.gather(registry.aget("agent"), registry.aget("agent"))
+
+    assert asyncio.run(scenario()) == ["agent instance", "agent instance"]
+    # Built on a worker thread, not the event loop
+    assert builds == ["init-agent"]
+    assert registry.state("agent") == READY
+    assert registry.peek("agent") == "agent instance"
+    assert registry.is_ready()
+
+
+def test_failed_build_stays_failed_and_is_reported():
+    registry = ServiceRegistry()
+
+    def broken():
+        raise RuntimeError("missing API key")
+
+    registry.register("agent", broken)
+
+    with pytest.raises(RuntimeError, match="missing API key"):
+        registry.get("agent")
+    with pytest.raises(RuntimeError):
+        asyncio.run(registry.aget("agent"))
+
+    assert registry.state("agent") == FAILED
+    assert not registry.is_ready()
+    assert registry.snapshot()["services"]["agent"]["error"] == "missing API key"
+
+
+def test_warmup_builds_every_service_and_reports_timings():
+    registry = ServiceRegistry()
+    registry.register("first", lambda: 1)
+    registry.register("second", lambda: 2)
+
+    with registry.timed("import first"):
+        pass
+    registry.start_warmup()
+    assert [registry.get(name) for name in ("first", "second")] == [1, 2]
+
+    snapshot = registry.snapshot()
+    assert snapshot["ready"] and snapshot["startup_ms"] is not None
+    assert [step["step"] for step in snapshot["imports"]] == ["import first"]
+    assert all(service["build_ms"] is not None for service in snapshot["services"].values())
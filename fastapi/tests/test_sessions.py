@@ -0,0 +1,166 @@
+import json
+import time
+import asyncio
+import sqlite3
+
+import pytest
+
+from leetcode_qna.sessions import (
+    InterviewSessionManager, SessionBackend, SessionConflictError, SQLiteSessionBackend
+)
+
+
+def _session(session_id):
+    return {"id": session_id, "status": "active", "turns": []}
+
+
+def test_idle_sessions_expire_and_notify_listeners():
+    expired = []
+
+    async def scenario():
+        manager = InterviewSessionManager(ttl_seconds=0.05)
+        manager.add_expiry_listener(expired.append)
+        await manager.create(_session("idle"))
+        await manager.create(_session("busy"))
+        await asyncio.sleep(0.1)
+        await manager.get("busy")
+        await manager.expire_idle()
+        return await manager.get("idle"), await manager.get("busy")
+
+    idle, busy = asyncio.run(scenario())
+    assert idle is None
+    assert busy is not None
+    assert expired == ["idle"]
+
+
+def test_locked_sessions_do_not_expire():
+    async def scenario():
+        manager = InterviewSessionManager(ttl_seconds=0.01)
+        await manager.create(_session("s"))
+        async with manager.locked("s"):
+            await asyncio.sleep(0.05)
+            return await manager.expire_idle()
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_sessions_are_loaded_back_from_the_backend(tmp_path):
+    db = str(tmp_path / "sessions.db")
+
+    async def scenario():
+        await InterviewSessionManager(SQLiteSessionBackend(db)).create(_session("s"))
+        restarted = InterviewSessionManager(SQLiteSessionBackend(db))
+        return await restarted.get("s")
+
+    assert asyncio.run(scenario())["status"] == "active"
+
+
+def test_backend_purge_spares_sessions_held_in_memory(tmp_path):
+    db = str(tmp_path / "sessions.db")
+
+    async def scenario():
+        backend = SQLiteSessionBackend(db)
+        await InterviewSessionManager(backend).create(_session("stored"))
+        manager = InterviewSessionManager(backend, ttl_seconds=0.05)
+        await manager.create(_session("held"))
+        await asyncio.sleep(0.1)
+        await manager.get("held")
+        expired = await manager.expire_idle()
+        return expired, backend.load("stored"), backend.load("held")
+
+    expired, stored, held = asyncio.run(scenario())
+    assert expired == ["stored"]
+    assert stored is None
+    assert held is not None
+
+
+def test_incomplete_backend_fails_when_created():
+    class LoadOnlyBackend(SessionBackend):
+        def load(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnlyBackend()
+
+
+def test_read_through_sees_other_processes_and_keeps_shared_sessions(tmp_path):
+    db = str(tmp_path / "sessions.db")
+
+    async def scenario():
+        first = InterviewSessionManager(SQLiteSessionBackend(db), ttl_seconds=0.2, read_through=True)
+        second = InterviewSessionManager(SQLiteSessionBackend(db), ttl_seconds=0.2, read_through=True)
+        await first.create(_session("s"))
+        session = await second.get("s")
+        session["turns"].append("answer")
+        await second.save(session)
+        seen = (await first.get("s"))["turns"]
+
+        # Only the second manager keeps using it; the first must not delete it
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            await second.get("s")
+            assert await first.expire_idle() == []
+            await asyncio.sleep(0.05)
+        return seen, await second.get("s")
+
+    seen, session = asyncio.run(scenario())
+    assert seen == ["answer"]
+    assert session is not None
+
+
+def test_overlapping_turns_on_a_read_through_manager_both_survive(tmp_path):
+    async def scenario():
+        manager = InterviewSessionManager(SQLiteSessionBackend(str(tmp_path / "sessions.db")), read_through=True)
+        await manager.create(_session("s"))
+
+        async def turn(name):
+            async with manager.locked("s") as session:
+                await asyncio.sleep(0.02)
+                session["turns"].append(name)
+                await manager.save(session)
+
+        await asyncio.gather(turn("A"), turn("B"))
+        return await manager.get("s")
+
+    assert asyncio.run(scenario())["turns"] == ["A", "B"]
+
+
+def test_locked_unknown_session_yields_none():
+    async def scenario():
+        async with InterviewSessionManager().locked("missing") as session:
+            return session
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_saving_a_stale_copy_is_rejected(tmp_path):
+    db = str(tmp_path / "sessions.db")
+    first, second = SQLiteSessionBackend(db), SQLiteSessionBackend(db)
+    first.save(_session("s"))
+
+    mine, theirs = first.load("s"), second.load("s")
+    theirs["turns"].append("theirs")
+    second.save(theirs)
+    mine["turns"].append("mine")
+
+    with pytest.raises(SessionConflictError):
+        first.save(mine)
+    assert first.load("s")["turns"] == ["theirs"]
+    # The same copy can be saved again and again
+    second.save(theirs)
+    assert second.load("s")["version"] == 3
+
+
+def test_unversioned_databases_are_migrated(tmp_path):
+    db = str(tmp_path / "sessions.db")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE interview_sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)")
+    conn.execute("INSERT INTO interview_sessions VALUES ('s', ?, 0)", (json.dumps(_session("s")),))
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteSessionBackend(db)
+    session = backend.load("s")
+    assert session["version"] == 0
+    backend.save(session)
+    assert backend.load("s")["version"] == 1
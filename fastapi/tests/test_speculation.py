@@ -0,0 +1,103 @@
+import asyncio
+
+from leetcode_qna.speculation import FeedbackSpeculator, transcript_similarity
+
+ANSWER = "I would use a hash map to store each number and its index"
+
+
+class Generator:
+    def __init__(self, question_index=0, delay=0.0):
+        self.question_index = question_index
+        self.delay = delay
+        self.texts = []
+
+    async def __call__(self, interview_id, text):
+        self.texts.append(text)
+        await asyncio.sleep(self.delay)
+        return self.question_index, f"Feedback on: {text}", 100
+
+
+def _speculator(generate, **options):
+    return FeedbackSpeculator(generate, lambda text: 50, stable_seconds=0.02, **options)
+
+
+def test_similarity_ignores_case_and_punctuation():
+    assert transcript_similarity("Use a Hash map.", "use a hash map") == 1.0
+    assert transcript_similarity("", "") == 1.0
+    assert transcript_similarity(ANSWER, "Sort the array first") < 0.5
+
+
+def test_stable_transcript_is_used_for_the_submitted_answer():
+    generate = Generator()
+
+    async def scenario():
+        speculator = _speculator(generate)
+        speculator.update("i", ANSWER)
+        await asyncio.sleep(0.05)
+        return await speculator.take("i", 0, ANSWER + "."), speculator.get_stats()
+
+    feedback, stats = asyncio.run(scenario())
+    assert feedback == f"Feedback on: {ANSWER}"
+    assert (stats["hits"], stats["used_tokens"], stats["wasted_tokens"]) == (1, 100, 0)
+
+
+def test_transcript_still_changing_does_not_speculate():
+    generate = Generator()
+
+    async def scenario():
+        speculator = _speculator(generate)
+        words = ANSWER.split()
+        for count in range(5, len(words) + 1):
+            speculator.update("i", " ".join(words[:count]))
+            await asyncio.sleep(0.005)
+        return await speculator.take("i", 0, ANSWER)
+
+    assert asyncio.run(scenario()) is None
+    assert generate.texts == []
+
+
+def test_different_answer_discards_the_speculation():
+    generate = Generator()
+
+    async def scenario():
+        speculator = _speculator(generate)
+        speculator.update("i", ANSWER, final=True)
+        await asyncio.sleep(0.01)
+        return await speculator.take("i", 0, "Actually I would sort the array and use two pointers"), speculator
+
+    feedback, speculator = asyncio.run(scenario())
+    assert feedback is None
+    stats = speculator.get_stats()
+    assert (stats["misses"], stats["wasted_tokens"]) == (1, 100)
+
+
+def test_feedback_for_another_question_is_not_used():
+    async def scenario():
+        speculator = _speculator(Generator(question_index=1))
+        speculator.update("i", ANSWER, final=True)
+        return await speculator.take("i", 0, ANSWER)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_cancel_counts_the_prompt_as_waste():
+    async def scenario():
+        speculator = _speculator(Generator(delay=1))
+        speculator.update("i", ANSWER, final=True)
+        await asyncio.sleep(0)
+        speculator.cancel("i")
+        return speculator.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["cancelled"], stats["wasted_tokens"], stats["in_flight"]) == (1, 50, 0)
+
+
+def test_short_or_disabled_transcripts_are_ignored():
+    async def scenario():
+        generate = Generator()
+        _speculator(generate).update("i", "hash map", final=True)
+        _speculator(generate, enabled=False).update("i", ANSWER, final=True)
+        await asyncio.sleep(0)
+        return generate.texts
+
+    assert asyncio.run(scenario()) == []
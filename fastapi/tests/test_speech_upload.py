@@ -0,0 +1,78 @@
+import io
+import wave
+import asyncio
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from leetcode_qna import route
+from leetcode_qna.stt import FakeSTTBackend
+
+
+class FakeVoiceAgent:
+    def __init__(self):
+        self.uploads = []
+
+    async def speech_to_text_from_bytes(self, data):
+        self.uploads.append(data)
+        return "use a sliding window"
+
+
+def _client(monkeypatch, agent):
+    async def get_voice_agent():
+        return agent
+
+    monkeypatch.setattr(route, "_get_voice_agent", get_voice_agent)
+    app = FastAPI()
+    app.include_router(route.router)
+    return TestClient(app)
+
+
+def test_upload_is_transcribed_from_memory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    agent = FakeVoiceAgent()
+    client = _client(monkeypatch, agent)
+
+    response = client.post("/leetcode-qna/speech-to-text", files={"audio_file": ("answer.wav", b"RIFF" + bytes(64))})
+
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "text": "use a sliding window"}
+    assert agent.uploads == [b"RIFF" + bytes(64)]
+    # Nothing is written next to the audio files on the way through
+    assert list(tmp_path.rglob("*")) == []
+
+
+def test_upload_over_the_cap_is_rejected(monkeypatch):
+    monkeypatch.setattr(route, "MAX_STT_UPLOAD_BYTES", 16)
+    agent = FakeVoiceAgent()
+    client = _client(monkeypatch, agent)
+
+    response = client.post("/leetcode-qna/speech-to-text", files={"audio_file": ("answer.wav", bytes(17))})
+
+    assert response.status_code == 413
+    assert agent.uploads == []
+
+
+def test_upload_without_an_agent_fails(monkeypatch):
+    client = _client(monkeypatch, None)
+
+    response = client.post("/leetcode-qna/speech-to-text", files={"audio_file": ("answer.wav", bytes(8))})
+
+    assert response.status_code == 500
+
+
+def test_agent_transcribes_wav_bytes(voice_agent):
+    sample_rate = 16000
+    t = np.arange(sample_rate) / sample_rate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(tone.tobytes())
+
+    text = asyncio.run(voice_agent.speech_to_text_from_bytes(buffer.getvalue()))
+
+    assert text == FakeSTTBackend().transcript
@@ -0,0 +1,39 @@
+from common.sse import DeltaEncoder, format_sse
+
+
+def test_patch_contains_only_changed_fields():
+    encoder = DeltaEncoder()
+    first = encoder.encode({"status": "analyzing", "analysis": "graph problem"})
+    second = encoder.encode({"status": "coding", "analysis": "graph problem"})
+
+    assert first == {"seq": 1, "type": "patch", "changed": {"status": "analyzing", "analysis": "graph problem"}}
+    assert second == {"seq": 2, "type": "patch", "changed": {"status": "coding"}}
+
+
+def test_none_removes_a_field():
+    encoder = DeltaEncoder()
+    encoder.encode({"status": "coding", "error": "retrying"})
+    event = encoder.encode({"error": None})
+
+    assert event["removed"] == ["error"]
+    assert "error" not in encoder.snapshot()["state"]
+
+
+def test_final_content_is_not_repeated_by_the_next_patch():
+    encoder = DeltaEncoder()
+    encoder.encode({"type": "delta", "field": "code", "delta": "def f"})
+    assert encoder.snapshot()["partial"] == {"code": "def f"}
+
+    final = encoder.encode({"type": "final", "field": "code", "content": "def f(): pass"})
+    patch = encoder.encode({"code": "def f(): pass", "status": "done"})
+
+    assert final["seq"] == 2
+    assert patch["changed"] == {"status": "done"}
+    snapshot = encoder.snapshot()
+    assert snapshot["state"] == {"code": "def f(): pass", "status": "done"}
+    assert "partial" not in snapshot
+
+
+def test_format_sse_with_and_without_id():
+    assert format_sse({"a": 1}) == 'data: {"a":1}\n\n'
+    assert format_sse({"a": 1}, 7) == 'id: 7\ndata: {"a":1}\n\n'
@@ -0,0 +1,101 @@
+import json
+import time
+import asyncio
+
+from common.stream_runs import StreamRun, StreamRunRegistry, parse_last_event_id
+
+
+def _events(frames):
+    parsed = []
+    for frame in frames:
+        lines = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        parsed.append((int(lines["id"]), json.loads(lines["data"])))
+    return parsed
+
+
+async def _collect(run, last_event_id=None):
+    return [frame async for frame in run.subscribe(last_event_id)]
+
+
+def test_replay_after_last_event_id():
+    async def scenario():
+        run = StreamRun("run")
+        for step in range(4):
+            await run.publish({"step": step})
+        await run.finish()
+        return await _collect(run), await _collect(run, 2)
+
+    everything, resumed = asyncio.run(scenario())
+    assert [event_id for event_id, _ in _events(everything)] == [1, 2, 3, 4]
+    assert _events(resumed) == [(3, {"step": 2}), (4, {"step": 3})]
+
+
+def test_evicted_frames_are_replaced_by_a_snapshot():
+    async def scenario():
+        run = StreamRun("run", max_events=2)
+        for step in range(5):
+            await run.publish({"step": step, f"field{step}": step})
+        await run.finish()
+        return await _collect(run, 1)
+
+    (event_id, snapshot), = _events(asyncio.run(scenario()))
+    assert event_id == 5
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["state"]["step"] == 4
+    assert snapshot["state"]["field0"] == 0
+
+
+def test_subscriber_follows_the_run_live():
+    async def scenario():
+        run = StreamRun("run")
+        subscriber = asyncio.create_task(_collect(run))
+        await asyncio.sleep(0)
+        await run.publish({"step": 0})
+        await run.publish({"step": 1})
+        await run.finish()
+        return await asyncio.wait_for(subscriber, 1)
+
+    assert [data for _, data in _events(asyncio.run(scenario()))] == [{"step": 0}, {"step": 1}]
+
+
+def test_registry_runs_pipeline_and_reports_errors():
+    def updates():
+        yield {"step": 0}
+        raise RuntimeError("model unavailable")
+
+    async def scenario():
+        registry = StreamRunRegistry("test")
+        run = registry.start(updates, error_update=lambda e: {"type": "error", "error": str(e)})
+        await run.task
+        return registry.get(run.run_id), await _collect(run)
+
+    run, frames = asyncio.run(scenario())
+    assert run is not None
+    assert [data for _, data in _events(frames)] == [{"step": 0}, {"type": "error", "error": "model unavailable"}]
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id("12") == 12
+    assert parse_last_event_id("abc") is None
+    assert parse_last_event_id(None, 5) == 5
+
+
+def test_stalled_runs_are_abandoned():
+    def updates():
+        yield {"step": 0}
+        time.sleep(0.3)
+        yield {"step": 1}
+
+    async def scenario():
+        registry = StreamRunRegistry("test", retention_seconds=0.05)
+        run = registry.start(updates, error_update=lambda e: {"type": "error", "error": str(e)})
+        await asyncio.sleep(0.15)
+        assert registry.get(run.run_id) is None
+        try:
+            await run.task
+        except asyncio.CancelledError:
+            pass
+        return await _collect(run)
+
+    frames = [data for _, data in _events(asyncio.run(scenario()))]
+    assert frames == [{"step": 0}, {"type": "error", "error": "The run stopped making progress"}]
@@ -0,0 +1,43 @@
+import pytest
+import speech_recognition as sr
+
+from leetcode_qna.stt import FakeSTTBackend, STTBackend, create_stt_backend
+
+SAMPLE_RATE = 16000
+
+
+def test_create_fake_backend_from_env(monkeypatch):
+    monkeypatch.setenv("LEETCODE_STT_BACKEND", "fake")
+    monkeypatch.setenv("LEETCODE_FAKE_STT_TEXT", "two pointers from both ends")
+    backend = create_stt_backend(sr.Recognizer())
+    assert isinstance(backend, FakeSTTBackend)
+    assert backend.transcribe(b"\x00\x00" * SAMPLE_RATE, SAMPLE_RATE) == "two pointers from both ends"
+
+
+def test_fake_transcribe_without_audio_is_empty():
+    assert FakeSTTBackend().transcribe(b"", SAMPLE_RATE) == ""
+
+
+def test_fake_stream_reveals_words_with_audio():
+    backend = FakeSTTBackend("one two three four five", words_per_second=2)
+    stream = backend.open_stream(SAMPLE_RATE)
+    one_second = b"\x00\x00" * SAMPLE_RATE
+
+    assert stream.accept(one_second) == "one two"
+    assert stream.accept(one_second) == "one two three four"
+    assert stream.result() == "one two three four five"
+
+
+def test_incomplete_backend_fails_when_created():
+    class StreamOnlyBackend(STTBackend):
+        def open_stream(self, sample_rate):
+            return None
+
+    with pytest.raises(TypeError):
+        StreamOnlyBackend()
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("LEETCODE_STT_BACKEND", "whisper")
+    with pytest.raises(ValueError):
+        create_stt_backend(sr.Recognizer())
@@ -0,0 +1,88 @@
+import time
+import threading
+
+import pytest
+
+from system_design import agent as system_design_agent
+from system_design.agent import EXPLANATION_SECTIONS, SystemDesignGenerationSystem
+
+
+@pytest.fixture
+def system(monkeypatch):
+    monkeypatch.setenv("GOOGLE_GENERATIVE_AI_API_KEY", "test-key")
+    system = SystemDesignGenerationSystem()
+    yield system
+    system.llm_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _state(events, **extra):
+    return {
+        "user_prompt": "Design a URL shortener",
+        "analysis": {"system_type": "web"},
+        "plantuml_code": "@startuml\n@enduml",
+        "event_sink": events.append,
+        **extra
+    }
+
+
+def _section_events(events):
+    return [event["section"] for event in events if event.get("type") == "section"]
+
+
+def test_section_llm_does_not_retry(system):
+    assert system.section_llm.max_retries == 0
+
+
+def test_sections_are_emitted_in_document_order(system, monkeypatch):
+    last_key = EXPLANATION_SECTIONS[-1]["key"]
+
+    def generate(section, prompt, analysis_json, plantuml_code):
+        # The first section finishes last; nothing may be emitted ahead of it
+        time.sleep(0.2 if section is EXPLANATION_SECTIONS[0] else 0.01)
+        if section["key"] == last_key:
+            raise RuntimeError("quota exceeded")
+        return f"## {section['title']}\n\ntext"
+
+    monkeypatch.setattr(system, "_generate_explanation_section", generate)
+    events = []
+    result = system._generate_explanation_sectioned(_state(events))
+
+    emitted = _section_events(events)
+    assert [section["index"] for section in emitted] == list(range(len(EXPLANATION_SECTIONS)))
+    assert [section["status"] for section in emitted[:-1]] == ["complete"] * (len(EXPLANATION_SECTIONS) - 1)
+    assert emitted[-1]["status"] == "failed"
+    assert result["stage"] == "explanation_generated"
+    assert result["explanation"].startswith(f"## {EXPLANATION_SECTIONS[0]['title']}")
+
+
+def test_timeout_counts_from_when_a_section_starts(system, monkeypatch):
+    # One pool worker: sections run one after another, each well within the
+    # timeout, so none may time out even though the whole stage takes longer
+    system.llm_executor.shutdown(wait=True)
+    system.llm_executor = system_design_agent.ThreadPoolExecutor(max_workers=1)
+    hang = threading.Event()
+
+    def generate(section, prompt, analysis_json, plantuml_code):
+        if section["key"] == EXPLANATION_SECTIONS[1]["key"]:
+            hang.wait(1)
+        else:
+            time.sleep(0.1)
+        return "text"
+
+    monkeypatch.setattr(system, "_generate_explanation_section", generate)
+    events = []
+    result = system._generate_explanation_sectioned(_state(events, section_timeout=0.4))
+    hang.set()
+
+    statuses = [section["status"] for section in result["explanation_sections"]]
+    assert statuses[1] == "timeout"
+    assert statuses.count("complete") == len(EXPLANATION_SECTIONS) - 1
+
+
+def test_all_sections_failing_is_an_error(system, monkeypatch):
+    def generate(section, prompt, analysis_json, plantuml_code):
+        raise RuntimeError("unavailable")
+
+    monkeypatch.setattr(system, "_generate_explanation_section", generate)
+    result = system._generate_explanation_sectioned(_state([]))
+    assert result["stage"] == "error"
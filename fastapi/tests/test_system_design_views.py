@@ -0,0 +1,62 @@
+import pytest
+
+from system_design.agent import SystemDesignGenerationSystem
+
+SEQUENCE = """@startuml
+participant "Client" as client
+participant "API" as api
+database "Store" as db
+client -> api : POST /urls
+api->>db: insert
+db -->> api : ok
+api-->client
+api --> db
+@enduml"""
+
+
+@pytest.fixture
+def system(monkeypatch):
+    monkeypatch.setenv("GOOGLE_GENERATIVE_AI_API_KEY", "test-key")
+    system = SystemDesignGenerationSystem()
+    yield system
+    system.llm_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_every_arrow_style_becomes_a_link(system):
+    components = system._extract_d3_components(SEQUENCE)
+
+    assert [node["id"] for node in components["nodes"]] == ["client", "api", "db"]
+    assert [(link["source"], link["target"], link["label"]) for link in components["links"]] == [
+        ("client", "api", "POST /urls"),
+        ("api", "db", "insert"),
+        ("db", "api", "ok"),
+        ("api", "client", ""),
+        ("api", "db", ""),
+    ]
+
+
+def test_multi_view_analyses_once_and_streams_each_view(system, monkeypatch):
+    analyses = []
+
+    def analyze(state):
+        analyses.append(state["user_prompt"])
+        return {**state, "analysis": {"system_type": "web"}, "stage": "requirements_analyzed"}
+
+    def request_view(view_type, prompt, analysis):
+        if view_type == "deployment":
+            raise RuntimeError("bad diagram")
+        return SEQUENCE
+
+    monkeypatch.setattr(system, "_analyze_requirements", analyze)
+    monkeypatch.setattr(system, "_request_view_plantuml", request_view)
+    events = list(system.create_multi_view_stream("Design a URL shortener", ["sequence", "deployment"]))
+
+    assert analyses == ["Design a URL shortener"]
+    views = {event["view"]["view_type"]: event["view"] for event in events if event.get("type") == "view"}
+    assert views["sequence"]["status"] == "complete"
+    assert len(views["sequence"]["d3_components"]["links"]) == 5
+    assert views["deployment"]["status"] == "failed"
+
+    final = events[-1]
+    assert final["status"] == "complete"
+    assert [view["view_type"] for view in final["views"]] == ["sequence", "deployment"]
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from leetcode_qna.tts_cache import TTSCache
+
+
+def _synthesizer(calls, audio=b"RIFF audio", fail=False, delay=0.0):
+    async def synthesize(path):
+        calls.append(path)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("synthesis failed")
+        path.write_bytes(audio)
+    return synthesize
+
+
+def test_miss_then_hit(tmp_path):
+    cache = TTSCache(tmp_path / "cache")
+    key = cache.key("Hello  there", 0.5, 0.5)
+    assert key == cache.key(" Hello\n there", 0.5, 0.5)
+    calls = []
+
+    async def scenario():
+        first = await cache.fetch(key, tmp_path / "a.wav", _synthesizer(calls))
+        second = await cache.fetch(key, tmp_path / "b.wav", _synthesizer(calls))
+        return first, second
+
+    assert asyncio.run(scenario()) == (False, True)
+    assert len(calls) == 1
+    assert (tmp_path / "b.wav").read_bytes() == b"RIFF audio"
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_concurrent_misses_share_one_synthesis(tmp_path):
+    cache = TTSCache(tmp_path / "cache")
+    key = cache.key("two sum", 0.5, 0.5)
+    calls = []
+
+    async def scenario():
+        synthesize = _synthesizer(calls, delay=0.05)
+        return await asyncio.gather(*[cache.fetch(key, tmp_path / f"{i}.wav", synthesize) for i in range(3)])
+
+    assert sorted(asyncio.run(scenario())) == [False, True, True]
+    assert len(calls) == 1
+
+
+def test_waiter_retries_when_the_synthesis_fails(tmp_path):
+    cache = TTSCache(tmp_path / "cache")
+    key = cache.key("graphs", 0.5, 0.5)
+    calls = []
+
+    async def scenario():
+        failing = asyncio.create_task(cache.fetch(key, tmp_path / "a.wav", _synthesizer(calls, fail=True, delay=0.05)))
+        waiting = asyncio.create_task(cache.fetch(key, tmp_path / "b.wav", _synthesizer(calls)))
+        with pytest.raises(RuntimeError):
+            await failing
+        return await waiting
+
+    assert asyncio.run(scenario()) is False
+    assert len(calls) == 2
+    assert cache.lookup(key) is not None
+
+
+def test_rewriting_an_output_keeps_the_cached_audio(tmp_path):
+    cache = TTSCache(tmp_path / "cache")
+    output = tmp_path / "out.wav"
+    first, second = cache.key("first", 0.5, 0.5), cache.key("second", 0.5, 0.5)
+
+    async def scenario():
+        await cache.fetch(first, output, _synthesizer([], audio=b"first"))
+        await cache.fetch(first, output, _synthesizer([]))
+        await cache.fetch(second, output, _synthesizer([], audio=b"second"))
+
+    asyncio.run(scenario())
+    assert cache.lookup(first).read_bytes() == b"first"
+    assert output.read_bytes() == b"second"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TTSCache(tmp_path / "cache", max_entries=2)
+    keys = [cache.key(text, 0.5, 0.5) for text in ("a", "b", "c")]
+
+    async def scenario():
+        for index, key in enumerate(keys):
+            await cache.fetch(key, tmp_path / f"{index}.wav", _synthesizer([]))
+
+    asyncio.run(scenario())
+    assert cache.lookup(keys[0]) is None
+    assert cache.lookup(keys[2]) is not None
+    assert TTSCache(tmp_path / "cache", max_entries=2).get_stats()["entries"] == 2
+
+
+def test_encodings_are_cached_with_their_entry(tmp_path):
+    cache = TTSCache(tmp_path / "cache")
+    key = cache.key("hello", 0.5, 0.5)
+    first = tmp_path / "tts_1.5.wav"
+    asyncio.run(cache.fetch(key, first, _synthesizer([], audio=b"w" * 10)))
+    assert not cache.link_variants(key, tmp_path / "tts_2.5.wav", [".ogg"])
+
+    encoded = first.with_suffix(".ogg")
+    encoded.write_bytes(b"o" * 4)
+    cache.store_variant(key, encoded)
+    assert cache.get_stats()["bytes"] == 14
+
+    second = tmp_path / "tts_2.5.wav"
+    assert cache.link_variants(key, second, [".ogg"])
+    assert (tmp_path / "tts_2.5.ogg").read_bytes() == b"o" * 4
+    assert not cache.link_variants(key, second, [".ogg", ".mp3"])
+
+    # Reloaded from disk, the entry's size still includes the encoding
+    assert TTSCache(tmp_path / "cache").get_stats()["bytes"] == 14
+
+
+def test_evicting_an_entry_removes_its_encodings(tmp_path):
+    cache = TTSCache(tmp_path / "cache", max_entries=1)
+    first, second = cache.key("first", 0.5, 0.5), cache.key("second", 0.5, 0.5)
+    asyncio.run(cache.fetch(first, tmp_path / "a.wav", _synthesizer([])))
+    (tmp_path / "a.mp3").write_bytes(b"mp3")
+    cache.store_variant(first, tmp_path / "a.mp3")
+
+    asyncio.run(cache.fetch(second, tmp_path / "b.wav", _synthesizer([])))
+    assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == [f"{second}.wav"]
+    cache.store_variant(first, tmp_path / "a.mp3")
+    assert not (tmp_path / "cache" / f"{first}.mp3").exists()
@@ -0,0 +1,62 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from leetcode_qna import tts_runtime
+
+
+class FakeTTS:
+    """Holds its parts as attributes, like ChatterboxTTS"""
+
+    def __init__(self):
+        self.t3 = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU())
+        self.s3gen = torch.nn.Sequential(torch.nn.Linear(8, 4))
+        self.sr = 24000
+        self.calls = []
+
+    def generate(self, text, exaggeration=0.5, cfg_weight=0.5):
+        self.calls.append(text)
+        return torch.zeros(1, 10)
+
+
+def test_cpu_profile_from_env(monkeypatch):
+    monkeypatch.setenv("TTS_CPU_THREADS", "3")
+    monkeypatch.setenv("TTS_CPU_QUANTIZE", "1")
+    monkeypatch.setenv("TTS_CPU_WARMUP", "0")
+    monkeypatch.delenv("TTS_CPU_INTEROP_THREADS", raising=False)
+    assert tts_runtime.create_cpu_profile() == {
+        "threads": 3, "interop_threads": 1, "quantize": True, "warmup": False
+    }
+
+
+def test_configure_threads():
+    previous = torch.get_num_threads()
+    try:
+        tts_runtime.configure_torch_threads({"threads": 2, "interop_threads": 1})
+        assert torch.get_num_threads() == 2
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_quantize_replaces_linear_layers_of_every_part():
+    model = FakeTTS()
+    assert tts_runtime.quantize_linear_layers(model) == 2
+    assert not isinstance(model.t3[0], torch.nn.Linear)
+    assert not isinstance(model.s3gen[0], torch.nn.Linear)
+    assert model.sr == 24000
+
+
+def test_freeze_for_sharing():
+    model = FakeTTS()
+    model.t3.train()
+    assert tts_runtime.freeze_for_sharing(model) == 4
+    assert not model.t3.training
+    assert not any(parameter.requires_grad for parameter in model.t3.parameters())
+
+
+def test_optimize_for_cpu_warms_up_once():
+    model = FakeTTS()
+    profile = {"threads": 1, "interop_threads": 1, "quantize": False, "warmup": True}
+    assert tts_runtime.optimize_for_cpu(model, profile) is model
+    assert model.calls == [tts_runtime.WARMUP_TEXT]
+    assert isinstance(model.t3[0], torch.nn.Linear)
@@ -0,0 +1,62 @@
+import wave
+import asyncio
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+
+from leetcode_qna.tts_stream import split_sentences, streaming_wav_header, to_pcm16, write_pcm16_wav
+
+
+def test_split_sentences_merges_short_fragments():
+    text = "Good. Now think about the edge cases carefully! What happens with an empty array? Ok."
+    assert split_sentences(text) == [
+        "Good. Now think about the edge cases carefully!",
+        "What happens with an empty array? Ok.",
+    ]
+    assert split_sentences("Yes.") == ["Yes."]
+
+
+def test_streaming_header_describes_pcm16():
+    header = streaming_wav_header(24000)
+    assert len(header) == 44
+    assert header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+    assert struct.unpack("<I", header[24:28])[0] == 24000
+    assert struct.unpack("<H", header[34:36])[0] == 16
+
+
+def test_pcm16_round_trip(tmp_path):
+    pcm = to_pcm16(np.array([[0.0, 0.5, -2.0]]))
+    assert np.frombuffer(pcm, dtype="<i2").tolist() == [0, 16383, -32767]
+
+    path = tmp_path / "out.wav"
+    write_pcm16_wav(path, [pcm, pcm], 24000)
+    with wave.open(str(path)) as wav_file:
+        assert wav_file.getframerate() == 24000
+        assert wav_file.getnframes() == 6
+
+
+def _stream(voice_agent, text, filename):
+    path, chunks = voice_agent.stream_text_to_speech(text, filename)
+
+    async def collect():
+        return b"".join([chunk async for chunk in chunks])
+
+    return path, asyncio.run(collect())
+
+
+def test_streamed_audio_is_cached_and_replayed(voice_agent):
+    voice_agent.tts_model = SimpleNamespace(sr=24000)
+    text = "The first sentence is long enough. And here is the second one."
+
+    path, streamed = _stream(voice_agent, text, "first.wav")
+    assert streamed[:4] == b"RIFF"
+    assert len(voice_agent.tts_worker.texts) == 2
+
+    replay_path, replayed = _stream(voice_agent, text, "second.wav")
+    # A hit replays the complete file and synthesizes nothing
+    assert len(voice_agent.tts_worker.texts) == 2
+    with open(replay_path, "rb") as audio_file:
+        assert replayed == audio_file.read()
+    stats = voice_agent.tts_cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from leetcode_qna.vad import EnergyVAD
+
+SAMPLE_RATE = 16000
+
+
+def _silence(ms):
+    return np.zeros(SAMPLE_RATE * ms // 1000, dtype="<i2").tobytes()
+
+
+def _tone(ms, amplitude=8000):
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+
+def test_segment_closes_after_trailing_silence():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300, pre_roll_ms=90)
+    assert vad.feed(_silence(600)) == []
+    assert vad.feed(_tone(900)) == []
+    assert vad.in_speech
+
+    segments = vad.feed(_silence(600))
+    assert len(segments) == 1
+    assert not vad.in_speech
+    # The speech plus pre-roll and a little trailing silence, not the whole input
+    seconds = len(segments[0]) / 2 / SAMPLE_RATE
+    assert 0.9 <= seconds < 1.3
+
+
+def test_silence_never_opens_a_segment():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE)
+    assert vad.feed(_silence(2000)) == []
+    assert vad.flush() == b""
+
+
+def test_flush_returns_the_open_segment():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE)
+    vad.feed(_tone(500))
+    assert vad.in_speech
+    assert len(vad.flush()) > 0
+    assert not vad.in_speech
+
+
+def test_long_speech_is_split_at_max_segment_length():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE, max_segment_seconds=1.0)
+    segments = vad.feed(_tone(2500))
+    assert len(segments) == 2
+    assert all(len(segment) / 2 / SAMPLE_RATE <= 1.0 for segment in segments)